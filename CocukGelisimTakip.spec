@@ -1,38 +1,72 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Açılış süresi için: LMS tabloları lms_data.bin olarak pakete eklenir
+# (growth_data modülleri gerekmez). CGT_ONEDIR=1 ile tek dosya yerine
+# klasör çıktısı üretilir; her açılışta geçici dizine çıkarma yapılmaz.
+import os
 
+ONEDIR = os.environ.get("CGT_ONEDIR") == "1"
+# Boya göre kilo tabloları (setup_lms_data.py --wfh) kuruluysa onlar da eklenir
+DATAS = [('lms_data.bin', '.')] + ([('lms_wfh.bin', '.')] if os.path.exists('lms_wfh.bin') else [])
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=DATAS,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['growth_data', 'growth_data_extended', 'numpy', 'batch_engine', 'http_service'],
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='CocukGelisimTakip',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if ONEDIR:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='CocukGelisimTakip',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name='CocukGelisimTakip',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='CocukGelisimTakip',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
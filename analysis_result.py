@@ -0,0 +1,124 @@
+# Analiz sonuç nesneleri
+# perform_analysis her çağrıda iç içe sözlükler ve biçimlendirilmiş yaş
+# metni üretir. Buradaki sınıflar yalnızca sayıları tutar (__slots__,
+# değiştirilemez; önbellekten kopyalanmadan paylaşılabilir);
+# yaş metni, uyarı ve BMI yorumu gibi Türkçe etiketler ancak okunduklarında
+# üretilir. to_dict() eski sözlük biçimini verir.
+
+# bmi_kategori kodları -> perform_analysis "yorum" metinleri (-1: veri yok)
+BMI_CATEGORIES = (
+    "Zayıf (Underweight)",
+    "Sağlıklı (Healthy)",
+    "Fazla Kilolu (Overweight)",
+    "Obez (Obese)",
+)
+AGE_WARNING = "Bu program 0-19 yaş arası çocuklar içindir."
+
+
+def format_yas(year, month):
+    return f"{int(year)} Yıl {int(month)} Ay"
+
+
+def bmi_category(bmi_p):
+    """Category code 0-3 for a BMI percentile, -1 if it is NaN."""
+    if bmi_p < 5: return 0
+    if bmi_p < 85: return 1
+    if bmi_p < 95: return 2
+    if bmi_p >= 95: return 3
+    return -1
+
+
+class _Frozen:
+    # dataclasses/typing açılışta ~15 ms tutuyordu; alanlar __slots__ sırasıyla
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} değiştirilemez")
+
+    __delattr__ = __setattr__
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({args})"
+
+
+class Measurement(_Frozen):
+    __slots__ = ("val", "z", "p")
+
+    def __init__(self, val, z, p):
+        object.__setattr__(self, "val", val)
+        object.__setattr__(self, "z", z)
+        object.__setattr__(self, "p", p)
+
+    def to_dict(self):
+        return {"val": self.val, "z": self.z, "p": self.p}
+
+
+class AnalysisResult(_Frozen):
+    # kilo_boy: boya göre kilo (0-5 yaş)
+    __slots__ = ("yas_gun", "boy", "kilo", "bmi", "bmi_kategori", "kilo_boy", "error")
+
+    def __init__(self, yas_gun=None, boy=None, kilo=None, bmi=None, bmi_kategori=-1,
+                 kilo_boy=None, error=None):
+        setattr_ = object.__setattr__
+        setattr_(self, "yas_gun", yas_gun)
+        setattr_(self, "boy", boy)
+        setattr_(self, "kilo", kilo)
+        setattr_(self, "bmi", bmi)
+        setattr_(self, "bmi_kategori", bmi_kategori)
+        setattr_(self, "kilo_boy", kilo_boy)
+        setattr_(self, "error", error)
+
+    @classmethod
+    def failed(cls, message):
+        return cls(error=message)
+
+    @property
+    def yas_ay_total(self):
+        return self.yas_gun / 30.4375
+
+    @property
+    def yas_yil(self):
+        return self.yas_gun / 365.25
+
+    @property
+    def yas_str(self):
+        return format_yas(self.yas_yil, self.yas_ay_total % 12)
+
+    @property
+    def warning(self):
+        return AGE_WARNING if self.yas_yil > 19 else None
+
+    @property
+    def bmi_yorum(self):
+        # perform_analysis NaN persentil için "Normal" döndürürdü
+        return BMI_CATEGORIES[self.bmi_kategori] if self.bmi_kategori >= 0 else "Normal"
+
+    def to_dict(self):
+        """The nested dict returned by AnalysisService.perform_analysis."""
+        if self.error is not None:
+            return {"error": self.error}
+        bmi = {}
+        if self.bmi is not None:
+            bmi = self.bmi.to_dict()
+            bmi["yorum"] = self.bmi_yorum
+        return {
+            "yas_str": self.yas_str,
+            "yas_ay_total": self.yas_ay_total,
+            "warning": self.warning,
+            "bmi": bmi,
+            "kilo": self.kilo.to_dict() if self.kilo is not None else {},
+            "boy": self.boy.to_dict() if self.boy is not None else {},
+            "kilo_boy": self.kilo_boy.to_dict() if self.kilo_boy is not None else {},
+        }
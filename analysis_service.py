@@ -1,12 +1,20 @@
 import math
-import growth_data
-import growth_data_extended
+import time
+import lms_tables
+import bmi_cutoffs
 from datetime import datetime
+from analysis_result import AnalysisResult, Measurement, bmi_category, format_yas
 
 class AnalysisService:
+    # İsteğe bağlı önbellekler (enable_cache ile açılır)
+    _result_cache = None
+    _lms_cache = None
+    # İsteğe bağlı ölçüm (enable_instrumentation ile açılır)
+    instrumentation = None
+
     @staticmethod
     def format_yas(year, month):
-        return f"{int(year)} Yıl {int(month)} Ay"
+        return format_yas(year, month)
 
     @staticmethod
     def calculate_lms(value, l, m, s):
@@ -24,98 +32,262 @@ class AnalysisService:
         percentile = 0.5 * (1 + math.erf(z / math.sqrt(2))) * 100
         return z, percentile
 
+    @staticmethod
+    def calculate_value(z, l, m, s):
+        """
+        Inverse LMS: measurement value for a given Z-score.
+        X = M * (1 + L * S * Z) ** (1 / L)  if L != 0
+        X = M * exp(S * Z)                  if L == 0
+        """
+        if l == 0:
+            return m * math.exp(s * z)
+        return m * (1 + l * s * z) ** (1 / l)
+
     @staticmethod
     def get_lms_params(gender, metric, months):
         try:
-            # growth_data.LMS_DATA keys are integers (months)
-            data_source = growth_data.LMS_DATA[gender][metric]
-            
-            # 10-19 yaş kilo verisi kontrolü
-            if metric == 'kilo' and months > 120:
-                if gender in growth_data_extended.LMS_DATA_EXTENDED:
-                    # Genişletilmiş veriye geçiş yapıyoruz ama interpolasyon için 120. ayı da kapsayabiliriz
-                    data_source = growth_data_extended.LMS_DATA_EXTENDED[gender][metric]
-            
-            data = data_source
-            keys = sorted(data.keys())
-            
-            # Clamp
-            if months <= keys[0]: months = keys[0]
-            if months >= keys[-1]: months = keys[-1]
-            
-            # Interpolation
-            for i in range(len(keys)-1):
-                if keys[i] <= months <= keys[i+1]:
-                    t1, t2 = keys[i], keys[i+1]
-                    vals1 = data[t1]
-                    vals2 = data[t2]
-                    
-                    ratio = (months - t1) / (t2 - t1)
-                    l = vals1[0] + (vals2[0] - vals1[0]) * ratio
-                    m = vals1[1] + (vals2[1] - vals1[1]) * ratio
-                    s = vals1[2] + (vals2[2] - vals1[2]) * ratio
-                    return l, m, s
-            return data[months] # Fallback
+            # Tablolar import sırasında lms_tables içinde bir kez hazırlanır
+            return lms_tables.lookup(gender, metric, months)
         except KeyError:
              return None
 
+    @staticmethod
+    def enable_daily_tables(path=None):
+        """
+        Use day-indexed WHO tables (lms_daily.bin) for 0-5 year olds.
+        Ages outside the daily tables keep using the monthly tables.
+        """
+        lms_tables.enable_daily(path)
+        AnalysisService.clear_cache()
+
+    @staticmethod
+    def disable_daily_tables():
+        lms_tables.disable_daily()
+        AnalysisService.clear_cache()
+
+    @staticmethod
+    def set_wfh_tables(path=None):
+        """Use another weight-for-length/height file (default lms_wfh.bin)."""
+        lms_tables.set_wfh_path(path)
+        AnalysisService.clear_cache()
+
+    @staticmethod
+    def set_interpolation(mode):
+        """
+        'linear' (default) or 'cubic': monotone cubic interpolation of the
+        monthly L, M, S tables. Daily tables are indexed directly either way.
+        """
+        lms_tables.set_interpolation(mode)
+        AnalysisService.clear_cache()
+
+    @staticmethod
+    def enable_cache(maxsize=10000, lms_maxsize=4096):
+        """
+        Memoize perform_analysis results (keyed on age in days, height,
+        weight and gender) and interpolated (L, M, S) per
+        (gender, metric, age in days), both with LRU eviction.
+        """
+        from memo_cache import LRUCache  # isteğe bağlı: açılışta yüklenmez
+        AnalysisService._result_cache = LRUCache(maxsize) if maxsize else None
+        AnalysisService._lms_cache = LRUCache(lms_maxsize) if lms_maxsize else None
+
+    @staticmethod
+    def disable_cache():
+        AnalysisService._result_cache = None
+        AnalysisService._lms_cache = None
+
+    @staticmethod
+    def clear_cache():
+        for cache in (AnalysisService._result_cache, AnalysisService._lms_cache):
+            if cache is not None:
+                cache.clear()
+
+    @staticmethod
+    def cache_stats():
+        return {
+            "results": AnalysisService._result_cache.stats() if AnalysisService._result_cache else None,
+            "lms": AnalysisService._lms_cache.stats() if AnalysisService._lms_cache else None,
+        }
+
+    @staticmethod
+    def enable_instrumentation():
+        """Start collecting per-stage timings, call and error counts."""
+        from instrumentation import Instrumentation  # isteğe bağlı: açılışta yüklenmez
+        AnalysisService.instrumentation = Instrumentation()
+        return AnalysisService.instrumentation
+
+    @staticmethod
+    def disable_instrumentation():
+        AnalysisService.instrumentation = None
+
+    @staticmethod
+    def get_lms_params_for_age(gender, metric, yas_gun, months):
+        cache = AnalysisService._lms_cache
+        if cache is not None:
+            key = (gender, metric, yas_gun)
+            lms = cache.get(key)
+            if lms is None:
+                lms = AnalysisService._lookup_lms(gender, metric, yas_gun, months)
+                cache.put(key, lms)
+            return lms
+        return AnalysisService._lookup_lms(gender, metric, yas_gun, months)
+
+    @staticmethod
+    def _lookup_lms(gender, metric, yas_gun, months):
+        if lms_tables.daily_enabled():
+            lms = lms_tables.get_daily_params(gender, metric, yas_gun)
+            if lms is not None:
+                return lms
+        return AnalysisService.get_lms_params(gender, metric, months)
+
+    @staticmethod
+    def growth_velocity(visits):
+        """
+        Single pass over one child's visits (sorted by date). Each visit is a
+        dict with yas_gun, boy, kilo and optionally boy_z / kilo_z / bmi_z.
+        Returns one entry per interval with cm/yıl, kg/yıl and Z deltas.
+        """
+        velocities = []
+        prev = None
+        for visit in visits:
+            if prev is not None:
+                gun = visit["yas_gun"] - prev["yas_gun"]
+                yil = gun / 365.25
+                entry = {"gun": gun}
+                entry["boy_hiz"] = (visit["boy"] - prev["boy"]) / yil if gun > 0 else None
+                entry["kilo_hiz"] = (visit["kilo"] - prev["kilo"]) / yil if gun > 0 else None
+                for key in ("boy_z", "kilo_z", "bmi_z"):
+                    a, b = prev.get(key), visit.get(key)
+                    entry[key + "_delta"] = b - a if a is not None and b is not None else None
+                velocities.append(entry)
+            prev = visit
+        return velocities
+
     @staticmethod
     def perform_analysis(gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet):
+        """Nested-dict adapter over analyze()."""
+        return AnalysisService.analyze(gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet).to_dict()
+
+    @staticmethod
+    def perform_analysis_days(yas_gun, boy, kilo, cinsiyet):
+        """Nested-dict adapter over analyze_days()."""
+        return AnalysisService.analyze_days(yas_gun, boy, kilo, cinsiyet).to_dict()
+
+    @staticmethod
+    def analyze(gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet):
+        """Analyze one visit; returns an AnalysisResult (error set on bad input)."""
+        instr = AnalysisService.instrumentation
+        t = t_start = None
+        if instr is not None:
+            instr.count("perform_analysis")
+            t = t_start = time.perf_counter()
         try:
-            if boy <= 0 or kilo <= 0: return {"error": "Boy ve kilo pozitif olmalı."}
+            if boy <= 0 or kilo <= 0:
+                if instr is not None: instr.error("GecersizOlcum")
+                return AnalysisResult.failed("Boy ve kilo pozitif olmalı.")
             
             dogum_tarihi = datetime(yil, ay, gun)
             kontrol_tarihi = datetime(k_yil, k_ay, k_gun)
             
             if kontrol_tarihi < dogum_tarihi:
-                 return {"error": "Kontrol tarihi doğum tarihinden önce olamaz."}
+                 if instr is not None: instr.error("TarihSirasi")
+                 return AnalysisResult.failed("Kontrol tarihi doğum tarihinden önce olamaz.")
 
             yas_gun = (kontrol_tarihi - dogum_tarihi).days
+        except Exception as e:
+            if instr is not None: instr.error(type(e).__name__)
+            return AnalysisResult.failed(str(e))
+        return AnalysisService._analyze_age(yas_gun, boy, kilo, cinsiyet, instr, t, t_start)
+
+    @staticmethod
+    def analyze_days(yas_gun, boy, kilo, cinsiyet):
+        """
+        analyze() for a precomputed age in days (e.g. from date ordinals);
+        skips datetime construction. Same results and warnings.
+        """
+        instr = AnalysisService.instrumentation
+        t = t_start = None
+        if instr is not None:
+            instr.count("perform_analysis_days")
+            t = t_start = time.perf_counter()
+        if boy <= 0 or kilo <= 0:
+            if instr is not None: instr.error("GecersizOlcum")
+            return AnalysisResult.failed("Boy ve kilo pozitif olmalı.")
+        if yas_gun < 0:
+            if instr is not None: instr.error("TarihSirasi")
+            return AnalysisResult.failed("Kontrol tarihi doğum tarihinden önce olamaz.")
+        return AnalysisService._analyze_age(int(yas_gun), boy, kilo, cinsiyet, instr, t, t_start)
+
+    @staticmethod
+    def classify_bmi(yas_gun, boy, kilo, cinsiyet):
+        """
+        Category-only fast mode: BMI category code 0-3 (BMI_CATEGORIES)
+        from precomputed P5/P85/P95 cutoffs, without Z or percentile.
+        Returns -1 for invalid input or an unknown gender.
+        """
+        if boy <= 0 or kilo <= 0 or yas_gun < 0:
+            return -1
+        try:
+            return bmi_cutoffs.classify(kilo / ((boy / 100) ** 2), cinsiyet, yas_gun / 30.4375)
+        except KeyError:
+            return -1
+
+    @staticmethod
+    def _analyze_age(yas_gun, boy, kilo, cinsiyet, instr, t, t_start):
+        try:
+            # Sonuç nesneleri değiştirilmediği için önbellekten doğrudan paylaşılır
+            cache = AnalysisService._result_cache
+            if cache is not None:
+                cache_key = (yas_gun, float(boy), float(kilo), cinsiyet)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    if instr is not None: instr.count("cache_hit")
+                    return cached
+
             yas_ay_total = yas_gun / 30.4375 
-            yas_yil = yas_gun / 365.25
-            yas_str = AnalysisService.format_yas(yas_yil, yas_ay_total % 12)
-            
-            warning = None
-            if yas_yil > 19:
-                warning = "Bu program 0-19 yaş arası çocuklar içindir."
-            
-            results = {
-                "yas_str": yas_str,
-                "yas_ay_total": yas_ay_total,
-                "warning": warning,
-                "bmi": {},
-                "kilo": {},
-                "boy": {}
-            }
+            boy_m = kilo_m = bmi_m = None
+            kategori = -1
+            if instr is not None: t = instr.lap("tarih", t)
 
             # --- Boy ---
-            lms_boy = AnalysisService.get_lms_params(cinsiyet, 'boy', yas_ay_total)
+            lms_boy = AnalysisService.get_lms_params_for_age(cinsiyet, 'boy', yas_gun, yas_ay_total)
+            if instr is not None: t = instr.lap("lms_boy", t)
             if lms_boy:
-                boy_z, boy_p = AnalysisService.calculate_lms(boy, *lms_boy)
-                results["boy"] = {"val": boy, "z": boy_z, "p": boy_p}
+                boy_m = Measurement(boy, *AnalysisService.calculate_lms(boy, *lms_boy))
+                if instr is not None: t = instr.lap("z_boy", t)
             
             # --- Kilo ---
             # WHO allows Weight up to 10y (120m). 
             # Extended with CPEG/CDC data up to 19y (228m).
-            lms_kilo = AnalysisService.get_lms_params(cinsiyet, 'kilo', yas_ay_total)
+            lms_kilo = AnalysisService.get_lms_params_for_age(cinsiyet, 'kilo', yas_gun, yas_ay_total)
+            if instr is not None: t = instr.lap("lms_kilo", t)
             if lms_kilo and yas_ay_total <= 229: 
-                kilo_z, kilo_p = AnalysisService.calculate_lms(kilo, *lms_kilo)
-                results["kilo"] = {"val": kilo, "z": kilo_z, "p": kilo_p}
+                kilo_m = Measurement(kilo, *AnalysisService.calculate_lms(kilo, *lms_kilo))
+                if instr is not None: t = instr.lap("z_kilo", t)
 
             # --- BMI ---
             bmi = kilo / ((boy / 100) ** 2)
-            lms_bmi = AnalysisService.get_lms_params(cinsiyet, 'bmi', yas_ay_total)
+            lms_bmi = AnalysisService.get_lms_params_for_age(cinsiyet, 'bmi', yas_gun, yas_ay_total)
+            if instr is not None: t = instr.lap("lms_bmi", t)
             if lms_bmi:
-                bmi_z, bmi_p = AnalysisService.calculate_lms(bmi, *lms_bmi)
-                bmi_yorum = "Normal"
-                if bmi_p < 5: bmi_yorum = "Zayıf (Underweight)"
-                elif 5 <= bmi_p < 85: bmi_yorum = "Sağlıklı (Healthy)"
-                elif 85 <= bmi_p < 95: bmi_yorum = "Fazla Kilolu (Overweight)"
-                elif bmi_p >= 95: bmi_yorum = "Obez (Obese)"
-                
-                results["bmi"] = {"val": bmi, "z": bmi_z, "p": bmi_p, "yorum": bmi_yorum}
+                bmi_m = Measurement(bmi, *AnalysisService.calculate_lms(bmi, *lms_bmi))
+                if instr is not None: t = instr.lap("z_bmi", t)
+                kategori = bmi_category(bmi_m.p)
+                if instr is not None: t = instr.lap("siniflama", t)
+
+            # --- Boya göre kilo (0-5 yaş, veri kuruluysa) ---
+            kilo_boy_m = None
+            lms_kilo_boy = lms_tables.get_wfh_params(cinsiyet, yas_ay_total, boy)
+            if lms_kilo_boy:
+                kilo_boy_m = Measurement(kilo, *AnalysisService.calculate_lms(kilo, *lms_kilo_boy))
+                if instr is not None: t = instr.lap("kilo_boy", t)
 
-            return results
+            result = AnalysisResult(yas_gun, boy_m, kilo_m, bmi_m, kategori, kilo_boy_m)
+            if cache is not None:
+                cache.put(cache_key, result)
+            if instr is not None: instr.lap("toplam", t_start)
+            return result
 
         except Exception as e:
-            return {"error": str(e)}
+            if instr is not None: instr.error(type(e).__name__)
+            return AnalysisResult.failed(str(e))
@@ -0,0 +1,407 @@
+# Komut satırından toplu analiz
+# Kayıtlar (doğum tarihi, kontrol tarihi, boy, kilo, cinsiyet) CSV veya
+# JSONL olarak dosyadan ya da stdin'den okunur, üreteç zinciriyle satır
+# satır AnalysisService'ten geçirilir ve sonuçlar anında yazılır. Böylece
+# çok büyük dosyalarda bile bellek kullanımı sabit kalır.
+#
+# Kullanım:
+#   python batch_cli.py tarama.csv -o sonuc.csv --rejects hatali.jsonl
+#   cat tarama.jsonl | python batch_cli.py --format jsonl > sonuc.jsonl
+#   python batch_cli.py il_tarama.csv -o sonuc.csv --workers 32
+#   python batch_cli.py aylik.csv -o sonuc.csv --cache sonuc_onbellek.db
+
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+import lms_tables
+import plausibility
+import result_cache
+from analysis_service import AnalysisService
+from instrumentation import profile
+
+INPUT_FIELDS = ("dogum_tarihi", "kontrol_tarihi", "boy", "kilo", "cinsiyet")
+OUTPUT_FIELDS = (
+    "id", "yas_ay_total", "yas_str", "uyari",
+    "boy_z", "boy_p", "kilo_z", "kilo_p",
+    "bmi", "bmi_z", "bmi_p", "bmi_yorum",
+    "kilo_boy_z", "kilo_boy_p", "bayrak",
+)
+CACHED_FIELDS = OUTPUT_FIELDS[1:]
+NAN = float("nan")
+NOT_OBJECT = "Kayıt bir JSON nesnesi olmalı."
+GENDER_ALIASES = {
+    "erkek": "erkek", "e": "erkek", "m": "erkek", "male": "erkek",
+    "kiz": "kiz", "kız": "kiz", "k": "kiz", "f": "kiz", "female": "kiz",
+}
+
+
+def parse_date(text):
+    """Parse YYYY-MM-DD or GG.AA.YYYY / GG/AA/YYYY into (day, month, year)."""
+    text = str(text).strip()
+    if "-" in text:
+        y, m, d = text.split("-")
+    else:
+        d, m, y = text.replace("/", ".").split(".")
+    d, m, y = int(d), int(m), int(y)
+    date(y, m, d)  # Geçersiz tarihleri burada yakala
+    return d, m, y
+
+
+def parse_number(record, field):
+    """Finite float from a field ("12,5" accepted); ValueError for nan/inf."""
+    value = float(str(record[field]).replace(",", "."))
+    if not math.isfinite(value):
+        raise ValueError(f"Geçersiz sayı ({field}): {record[field]}")
+    return value
+
+
+def parse_record(record):
+    """Convert a raw record dict into perform_analysis arguments."""
+    missing = [f for f in INPUT_FIELDS if record.get(f) in (None, "")]
+    if missing:
+        raise ValueError("Eksik alan: " + ", ".join(missing))
+    gun, ay, yil = parse_date(record["dogum_tarihi"])
+    k_gun, k_ay, k_yil = parse_date(record["kontrol_tarihi"])
+    boy = parse_number(record, "boy")
+    kilo = parse_number(record, "kilo")
+    cinsiyet = GENDER_ALIASES.get(str(record["cinsiyet"]).strip().lower())
+    if cinsiyet is None:
+        raise ValueError(f"Bilinmeyen cinsiyet: {record['cinsiyet']}")
+    return gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet
+
+
+def read_records(stream, fmt):
+    """Yield (row_no, record) pairs from a CSV or JSONL text stream."""
+    if fmt == "jsonl":
+        for row_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = {"_ham": line, "_hata": f"JSON hatası: {e}"}
+            yield row_no, record
+    else:
+        sample = stream.readline()
+        delimiter = ";" if sample.count(";") > sample.count(",") else ","
+        header = next(csv.reader([sample], delimiter=delimiter))
+        reader = csv.DictReader(stream, fieldnames=[h.strip() for h in header], delimiter=delimiter)
+        for row_no, record in enumerate(reader, 1):
+            yield row_no, record
+
+
+def flatten_analysis(record, result, boy_value, kilo_value):
+    """
+    Flat output row (OUTPUT_FIELDS) for an AnalysisResult. Input flags come
+    from the parsed boy_value / kilo_value, as in the vectorized engine
+    (the kilo Measurement is missing above 229 months).
+    """
+    boy, kilo, bmi, kilo_boy = result.boy, result.kilo, result.bmi, result.kilo_boy
+    return {
+        "id": record.get("id", ""),
+        "yas_ay_total": result.yas_ay_total,
+        "yas_str": result.yas_str,
+        "uyari": result.warning or "",
+        "boy_z": boy.z if boy else "",
+        "boy_p": boy.p if boy else "",
+        "kilo_z": kilo.z if kilo else "",
+        "kilo_p": kilo.p if kilo else "",
+        "bmi": bmi.val if bmi else "",
+        "bmi_z": bmi.z if bmi else "",
+        "bmi_p": bmi.p if bmi else "",
+        "bmi_yorum": result.bmi_yorum if bmi else "",
+        "kilo_boy_z": kilo_boy.z if kilo_boy else "",
+        "kilo_boy_p": kilo_boy.p if kilo_boy else "",
+        "bayrak": row_flags(boy_value, kilo_value,
+                            boy.z if boy else NAN, kilo.z if kilo else NAN,
+                            bmi.z if bmi else NAN, kilo_boy.z if kilo_boy else NAN),
+    }
+
+
+def row_flags(boy, kilo, boy_z, kilo_z, bmi_z, kilo_boy_z):
+    """plausibility bit mask for one analyzed row (NaN: value missing)."""
+    return int(plausibility.input_flags(boy, kilo)
+               | plausibility.zscore_flags(boy_z, kilo_z, bmi_z, kilo_boy_z))
+
+
+def parse_columns(records):
+    """
+    Parse raw records into column lists for the vectorized engine. Returns
+    (indices, yas_gun, cinsiyet, boy, kilo) for the valid records and an
+    {index: error} dict for the rest; same checks as analyze_record.
+    """
+    idx, days, genders, boy, kilo = [], [], [], [], []
+    errors = {}
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors[i] = NOT_OBJECT
+            continue
+        if "_hata" in record:
+            errors[i] = record["_hata"]
+            continue
+        try:
+            gun, ay, yil, k_gun, k_ay, k_yil, b, k, cinsiyet = parse_record(record)
+        except (ValueError, TypeError) as e:
+            errors[i] = str(e)
+            continue
+        if b <= 0 or k <= 0:
+            errors[i] = "Boy ve kilo pozitif olmalı."
+            continue
+        yas_gun = date(k_yil, k_ay, k_gun).toordinal() - date(yil, ay, gun).toordinal()
+        if yas_gun < 0:
+            errors[i] = "Kontrol tarihi doğum tarihinden önce olamaz."
+            continue
+        idx.append(i)
+        days.append(yas_gun)
+        genders.append(cinsiyet)
+        boy.append(b)
+        kilo.append(k)
+    return (idx, days, genders, boy, kilo), errors
+
+
+def analyze_record(record):
+    """Return (output_row, None) on success or (None, error_message)."""
+    if not isinstance(record, dict):
+        return None, NOT_OBJECT
+    if "_hata" in record:
+        return None, record["_hata"]
+    try:
+        args = parse_record(record)
+    except (ValueError, TypeError) as e:
+        return None, str(e)
+    result = AnalysisService.analyze(*args)
+    if result.error is not None:
+        return None, result.error
+    return flatten_analysis(record, result, args[6], args[7]), None
+
+
+def analyze_records(records):
+    """Yield (row_no, record, output_row, error) for each input record."""
+    for row_no, record in records:
+        row, error = analyze_record(record)
+        yield row_no, record, row, error
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker():
+    # Her işçi süreci tüm yaş ve boya göre kilo tablolarını başlangıçta bir kez
+    # açar; ilk kayıtlar tablo yükleme süresini taşımaz.
+    lms_tables.preload()
+
+
+def _analyze_chunk(chunk):
+    return [(row_no, record) + analyze_record(record) for row_no, record in chunk]
+
+
+def analyze_records_parallel(records, workers, chunk_size=2000):
+    """
+    Same output as analyze_records, computed in a process pool.
+    Records are sharded into chunks; at most 2 * workers chunks are in
+    flight so memory stays bounded, and results are yielded in input order.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for chunk in chunked(records, chunk_size):
+            pending.append(executor.submit(_analyze_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def record_key(args):
+    """result_cache key of parsed perform_analysis arguments."""
+    gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet = args
+    yas_gun = date(k_yil, k_ay, k_gun).toordinal() - date(yil, ay, gun).toordinal()
+    return result_cache.row_key(yas_gun, boy, kilo, cinsiyet)
+
+
+def analyze_records_cached(records, cache, workers=1, chunk_size=2000):
+    """
+    Same output as analyze_records, reusing results stored in `cache`
+    (result_cache.ResultCache). Only rows whose normalized input is not
+    cached are analyzed (in a process pool when workers > 1) and stored.
+    """
+    if workers <= 1:
+        yield from _cached_results(records, cache, None, chunk_size)
+        return
+    # Tek havuz tüm çalışma boyunca kullanılır; her parçada yeniden başlatılmaz
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        yield from _cached_results(records, cache, executor, chunk_size * workers, chunk_size)
+
+
+def _cached_results(records, cache, executor, lookup_size, chunk_size=2000):
+    for chunk in chunked(records, lookup_size):
+        keyed = []
+        for row_no, record in chunk:
+            key = error = None
+            if not isinstance(record, dict):
+                error = NOT_OBJECT
+            elif "_hata" in record:
+                error = record["_hata"]
+            else:
+                try:
+                    key = record_key(parse_record(record))
+                except (ValueError, TypeError) as e:
+                    error = str(e)
+            keyed.append((row_no, record, key, error))
+
+        stored = cache.get_many({key for _, _, key, _ in keyed if key is not None})
+        pending = {}
+        for row_no, record, key, _ in keyed:
+            if key is not None and key not in stored and key not in pending:
+                pending[key] = (row_no, record)
+        if pending:
+            if executor is not None:
+                futures = [executor.submit(_analyze_chunk, part)
+                           for part in chunked(pending.values(), chunk_size)]
+                results = (item for future in futures for item in future.result())
+            else:
+                results = analyze_records(pending.values())
+            new = {}
+            for key, (_, _, row, error) in zip(pending, results):
+                # id kayda aittir, sonuca değil; önbellekte tutulmaz.
+                # Başarılı satır: OUTPUT_FIELDS[1:] sırasıyla değerler, hata: metin
+                new[key] = error if error is not None else tuple(row[f] for f in CACHED_FIELDS)
+            cache.put_many(new.items())
+            stored.update(new)
+
+        for row_no, record, key, error in keyed:
+            if key is not None:
+                value = stored[key]
+                if isinstance(value, tuple):
+                    row = {"id": record.get("id", "")}
+                    row.update(zip(CACHED_FIELDS, value))
+                    yield row_no, record, row, None
+                    continue
+                error = value
+            yield row_no, record, None, error
+
+
+class ResultWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def run(results, out_writer, reject_stream):
+    """Consume analyzed rows, write them incrementally; return (ok, rejected)."""
+    ok = rejected = 0
+    for row_no, record, row, error in results:
+        if error is None:
+            out_writer.write(row)
+            ok += 1
+        else:
+            rejected += 1
+            if reject_stream is not None:
+                reject_stream.write(json.dumps(
+                    {"satir": row_no, "hata": error, "kayit": record}, ensure_ascii=False) + "\n")
+    return ok, rejected
+
+
+def detect_format(path, explicit):
+    if explicit:
+        return explicit
+    if path and path != "-" and path.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Çocuk gelişim toplu analiz (CSV/JSONL)")
+    parser.add_argument("input", nargs="?", default="-", help="Girdi dosyası (varsayılan: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Girdi biçimi (varsayılan: uzantıdan)")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="Çıktı biçimi (varsayılan: girdi biçimi)")
+    parser.add_argument("--rejects", default="rejects.jsonl", help="Hatalı satırların yazılacağı JSONL dosyası")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel işçi süreç sayısı (varsayılan: 1)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="İşçilere gönderilen parça boyutu")
+    parser.add_argument("--cache", help="Sonuç önbelleği (SQLite); değişmeyen satırlar yeniden hesaplanmaz")
+    parser.add_argument("--cache-size", type=int, default=result_cache.DEFAULT_MAX_ENTRIES,
+                        help="Önbellekte tutulacak en fazla sonuç sayısı")
+    parser.add_argument("--metrics", help="Aşama süreleri / hata sayaçlarının yazılacağı dosya (.json veya .prom)")
+    parser.add_argument("--profile", help="cProfile çıktısı (yalnızca tek süreçli çalışmada)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    in_fmt = detect_format(args.input, args.format)
+    out_fmt = args.output_format or in_fmt
+    if not args.output_format and args.output.lower().endswith((".csv", ".jsonl", ".ndjson")):
+        out_fmt = detect_format(args.output, None)
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    reject_stream = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+
+    instr = AnalysisService.enable_instrumentation() if args.metrics else None
+    cache = None
+    if args.cache:
+        cache = result_cache.ResultCache(args.cache, args.cache_size,
+                                         result_cache.reference_version(",".join(OUTPUT_FIELDS)))
+    start = time.perf_counter()
+    try:
+        records = read_records(in_stream, in_fmt)
+        if cache is not None:
+            results = analyze_records_cached(records, cache, args.workers, args.chunk_size)
+        elif args.workers > 1:
+            results = analyze_records_parallel(records, args.workers, args.chunk_size)
+        else:
+            results = analyze_records(records)
+        if args.profile and args.workers <= 1:
+            with profile(output=args.profile):
+                ok, rejected = run(results, ResultWriter(out_stream, out_fmt), reject_stream)
+        else:
+            ok, rejected = run(results, ResultWriter(out_stream, out_fmt), reject_stream)
+    finally:
+        for stream in (in_stream, out_stream, reject_stream):
+            if stream not in (None, sys.stdin, sys.stdout):
+                stream.close()
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    total = ok + rejected
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"{total} satır işlendi ({ok} başarılı, {rejected} hatalı) "
+          f"{elapsed:.2f} sn, {rate:.0f} satır/sn", file=sys.stderr)
+    if cache is not None:
+        note = " (referans verisi değişti, önbellek yenilendi)" if cache.invalidated else ""
+        print(f"Önbellek: {cache.hits} isabet, {cache.misses} yeni hesap, "
+              f"{cache.evictions} silinen kayıt{note}", file=sys.stderr)
+    if instr is not None:
+        # Paralel çalışmada aşama süreleri işçi süreçlerde kalır; sayaçlar yalnızca bu süreçtendir
+        instr.count("satir_basarili", ok)
+        instr.count("satir_hatali", rejected)
+        instr.write_snapshot(args.metrics, "text" if args.metrics.endswith(".prom") else "json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
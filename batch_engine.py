@@ -0,0 +1,511 @@
+# Toplu (vektörel) analiz motoru
+# AnalysisService ile aynı LMS tablolarını ve formülleri NumPy dizileri
+# üzerinde uygular. Tarama verisi gibi büyük girdiler için satır satır
+# perform_analysis çağırmak yerine kullanılır.
+
+from dataclasses import dataclass, fields
+from statistics import NormalDist
+from typing import Optional
+import numpy as np
+import lms_store
+import lms_tables
+import bmi_cutoffs
+import plausibility
+from analysis_result import BMI_CATEGORIES, format_yas
+
+GENDERS = ('erkek', 'kiz')
+METRICS = ('boy', 'kilo', 'bmi')
+
+
+# Cephes ndtr/erf/erfc rasyonel yaklaşım katsayıları (çift duyarlık)
+_ERF_T = (9.60497373987051638749E0, 9.00260197203842689217E1, 2.23200534594684319226E3,
+          7.00332514112805075473E3, 5.55923013010394962768E4)
+_ERF_U = (1.0, 3.35617141647503099647E1, 5.21357949780152679795E2, 4.59432382970980127987E3,
+          2.26290000613890934246E4, 4.92673942608635921086E4)
+_ERFC_P = (2.46196981473530512524E-10, 5.64189564831068821977E-1, 7.46321056442269912687E0,
+           4.86371970985681366614E1, 1.96520832956077098242E2, 5.26445194995477358631E2,
+           9.34528527171957607540E2, 1.02755188689515710272E3, 5.57535335369399327526E2)
+_ERFC_Q = (1.0, 1.32281951154744992508E1, 8.67072140885989742329E1, 3.54937778887819891062E2,
+           9.75708501743205489753E2, 1.82390916687909736289E3, 2.24633760818710981792E3,
+           1.65666309194161350182E3, 5.57535340817727675546E2)
+_ERFC_R = (5.64189583547755073984E-1, 1.27536670759978104416E0, 5.01905042251180477414E0,
+           6.16021097993053585195E0, 7.40974269950448939160E0, 2.97886665372100240670E0)
+_ERFC_S = (1.0, 2.26052863220117276590E0, 9.39603524938001434673E0, 1.20489539808096656605E1,
+           1.70814450747565897222E1, 9.60896809063285878198E0, 3.36907645100081516050E0)
+_SQRTH = 0.7071067811865476
+
+# Büyüme eğrisi çizimlerinde kullanılan varsayılan persentil ve SD setleri
+DEFAULT_CENTILES = (3, 10, 25, 50, 75, 90, 97)
+DEFAULT_SDS = (-3, -2, -1, 0, 1, 2, 3)
+CURVE_MONTHS = (0, 228)
+
+# Tarih sıra sayıları date.toordinal() ile aynıdır; 1970-01-01 = 719163
+_EPOCH_ORDINAL = 719163
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+_ARRAY_TABLES = {}
+_CURVE_CACHE = {}
+
+
+class ArrayTable:
+    __slots__ = ("keys", "l", "m", "s", "uniform", "table", "cubic")
+
+    def __init__(self, table):
+        # mmap üzerindeki memoryview'lar kopyalanmadan diziye sarılır
+        self.keys = np.asarray(table.keys, dtype=np.float64)
+        self.l = np.asarray(table.l, dtype=np.float64)
+        self.m = np.asarray(table.m, dtype=np.float64)
+        self.s = np.asarray(table.s, dtype=np.float64)
+        self.uniform = bool(getattr(table, "uniform", False))
+        self.table = table
+        self.cubic = None
+
+    def segments(self, months):
+        """Vectorized LmsTable.segment (months already clamped)."""
+        keys = self.keys
+        if self.uniform:
+            # Ardışık tamsayı anahtarlar: arama yerine doğrudan indeks
+            # (searchsorted(..., 'left') - 1 ile aynı aralık)
+            i = np.ceil(months - keys[0]).astype(np.intp) - 1
+        else:
+            i = np.searchsorted(keys, months, side='left') - 1
+        np.clip(i, 0, len(keys) - 2, out=i)
+        return i
+
+    def lookup(self, months):
+        """Vectorized lms_tables.LmsTable.lookup with the same interval rules."""
+        keys = self.keys
+        months = np.clip(months, keys[0], keys[-1])
+        if len(keys) == 1:
+            return self._constant(months.shape)
+        i = self.segments(months)
+        t1 = keys[i]
+        ratio = (months - t1) / (keys[i + 1] - t1)
+        l1, m1, s1 = self.l[i], self.m[i], self.s[i]
+        l = l1 + (self.l[i + 1] - l1) * ratio
+        m = m1 + (self.m[i + 1] - m1) * ratio
+        s = s1 + (self.s[i + 1] - s1) * ratio
+        return l, m, s
+
+    def lookup_cubic(self, months):
+        """Vectorized LmsTable.lookup_cubic using the table's coefficients."""
+        keys = self.keys
+        months = np.clip(months, keys[0], keys[-1])
+        if len(keys) == 1:
+            return self._constant(months.shape)
+        if self.cubic is None:
+            self.cubic = [np.asarray(col, dtype=np.float64)
+                          for coeffs in self.table.cubic_coefficients() for col in coeffs]
+        i = self.segments(months)
+        t = months - keys[i]
+        result = []
+        for k, y in enumerate((self.l, self.m, self.s)):
+            b, c, d = self.cubic[3 * k:3 * k + 3]
+            result.append(y[i] + t * (b[i] + t * (c[i] + t * d[i])))
+        return tuple(result)
+
+    def _constant(self, shape):
+        return (np.full(shape, self.l[0]), np.full(shape, self.m[0]),
+                np.full(shape, self.s[0]))
+
+
+def _polevl(x, coeffs):
+    result = np.zeros_like(x)
+    for c in coeffs:
+        result = result * x + c
+    return result
+
+
+def array_table(table):
+    key = id(table)
+    cached = _ARRAY_TABLES.get(key)
+    if cached is None:
+        cached = _ARRAY_TABLES[key] = ArrayTable(table)
+    return cached
+
+
+def gender_codes(cinsiyet):
+    """Map 'erkek'/'kiz' strings (or 0/1 codes) to an int8 array, -1 if unknown."""
+    arr = np.asarray(cinsiyet)
+    if arr.dtype.kind in 'iu':
+        return np.where((arr == 0) | (arr == 1), arr, -1).astype(np.int8)
+    codes = np.full(arr.shape, -1, dtype=np.int8)
+    for code, name in enumerate(GENDERS):
+        codes[arr == name] = code
+    return codes
+
+
+def date_ordinals(values):
+    """
+    Vectorized date.toordinal() for an array of dates, without building a
+    date object per row. Accepts integer ordinals, datetime64 values or
+    fixed-width strings (YYYY-MM-DD, GG.AA.YYYY, GG/AA/YYYY). Returns
+    (ordinals, valid); invalid or unparseable rows get ordinal 0.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iu':
+        ordinals = arr.astype(np.int64)
+        valid = ordinals > 0
+        return np.where(valid, ordinals, 0), valid
+    if arr.dtype.kind == 'M':
+        valid = ~np.isnat(arr)
+        days = arr.astype('datetime64[D]').astype(np.int64) + _EPOCH_ORDINAL
+        return np.where(valid, days, 0), valid
+
+    text = np.char.strip(arr.astype(str))
+    raw = np.char.encode(text, 'ascii', 'replace').astype('S10')
+    b = raw.view(np.uint8).reshape(raw.shape + (10,)).astype(np.int64)
+    digit = (b >= 48) & (b <= 57)
+    d = b - 48
+    length_ok = np.char.str_len(text) == 10
+
+    iso = length_ok & (b[..., 4] == 45) & (b[..., 7] == 45) & digit[..., [0, 1, 2, 3, 5, 6, 8, 9]].all(axis=-1)
+    sep = b[..., 2]
+    dotted = (length_ok & ((sep == 46) | (sep == 47)) & (b[..., 5] == sep)
+              & digit[..., [0, 1, 3, 4, 6, 7, 8, 9]].all(axis=-1))
+
+    year = np.where(iso, d[..., 0] * 1000 + d[..., 1] * 100 + d[..., 2] * 10 + d[..., 3],
+                    d[..., 6] * 1000 + d[..., 7] * 100 + d[..., 8] * 10 + d[..., 9])
+    month = np.where(iso, d[..., 5] * 10 + d[..., 6], d[..., 3] * 10 + d[..., 4])
+    day = np.where(iso, d[..., 8] * 10 + d[..., 9], d[..., 0] * 10 + d[..., 1])
+
+    month_ok = (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    dim = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + ((month == 2) & leap)
+    valid = (iso | dotted) & (year >= 1) & month_ok & (day >= 1) & (day <= dim)
+
+    year = np.where(valid, year, 1970)
+    month = np.where(valid, month, 1)
+    day = np.where(valid, day, 1)
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    ordinals = months.astype('datetime64[D]').astype(np.int64) + day - 1 + _EPOCH_ORDINAL
+    return np.where(valid, ordinals, 0), valid
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """
+    Columnar output of BatchAnalysisService: one array per field, no
+    per-row objects. res["boy_z"] style access is kept for dict callers;
+    yas_str() / bmi_yorum() build display labels for single rows on demand.
+    """
+    yas_ay_total: np.ndarray
+    gecerli: np.ndarray
+    boy_z: np.ndarray
+    boy_p: np.ndarray
+    kilo_z: np.ndarray
+    kilo_p: np.ndarray
+    bmi: np.ndarray
+    bmi_z: np.ndarray
+    bmi_p: np.ndarray
+    bmi_kategori: np.ndarray
+    kilo_boy_z: Optional[np.ndarray] = None
+    kilo_boy_p: Optional[np.ndarray] = None
+    bayrak: Optional[np.ndarray] = None  # plausibility bit maskeleri
+    yas_gun: Optional[np.ndarray] = None
+    uyari: Optional[np.ndarray] = None
+    tarih_gecerli: Optional[np.ndarray] = None
+
+    def __len__(self):
+        return len(self.yas_ay_total)
+
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if isinstance(key, str) else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return isinstance(key, str) and getattr(self, key, None) is not None
+
+    def keys(self):
+        return [f.name for f in fields(self) if getattr(self, f.name) is not None]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def yas_str(self, i):
+        yas_ay = self.yas_ay_total[i]
+        yas_gun = self.yas_gun[i] if self.yas_gun is not None else yas_ay * 30.4375
+        return format_yas(yas_gun / 365.25, yas_ay % 12)
+
+    def bmi_yorum(self, i):
+        kategori = self.bmi_kategori[i]
+        return BMI_CATEGORIES[kategori] if kategori >= 0 else ""
+
+
+class BatchAnalysisService:
+    @staticmethod
+    def norm_cdf(z):
+        """Standard normal CDF, vectorized (Cephes ndtr rational approximations)."""
+        x = np.asarray(z, dtype=np.float64) * _SQRTH
+        a = np.abs(x)
+        with np.errstate(over='ignore', under='ignore', invalid='ignore'):
+            # |x| < 1/sqrt(2): 0.5 + 0.5 * erf(x)
+            x2 = x * x
+            central = 0.5 + 0.5 * x * _polevl(x2, _ERF_T) / _polevl(x2, _ERF_U)
+            # Kuyruklar: 0.5 * erfc(|x|)
+            near = a < 8.0
+            p = np.where(near, _polevl(a, _ERFC_P), _polevl(a, _ERFC_R))
+            q = np.where(near, _polevl(a, _ERFC_Q), _polevl(a, _ERFC_S))
+            tail = 0.5 * np.exp(-a * a) * p / q
+        tail = np.where(x > 0, 1.0 - tail, tail)
+        return np.where(a < _SQRTH, central, tail)
+
+    @staticmethod
+    def calculate_lms(values, l, m, s):
+        """Vectorized AnalysisService.calculate_lms; returns (z, percentile) arrays."""
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = values / m
+            l_zero = l == 0
+            safe_l = np.where(l_zero, 1.0, l)
+            z = np.where(l_zero, np.log(ratio) / s, (ratio ** safe_l - 1) / (safe_l * s))
+        return z, BatchAnalysisService.norm_cdf(z) * 100
+
+    @staticmethod
+    def calculate_value(z, l, m, s):
+        """Vectorized inverse LMS (AnalysisService.calculate_value)."""
+        z = np.asarray(z, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            l_zero = l == 0
+            safe_l = np.where(l_zero, 1.0, l)
+            power = m * (1 + safe_l * s * z) ** (1 / safe_l)
+            return np.where(l_zero, m * np.exp(s * z), power)
+
+    @staticmethod
+    def centile_curves(gender, metric, centiles=DEFAULT_CENTILES, months=CURVE_MONTHS):
+        """
+        Measurement curves for percentiles (e.g. P3..P97) over a monthly grid.
+        Returns {"months": array, centile: array, ...}; cached per
+        (gender, metric, centile set, month range), arrays are read-only.
+        """
+        z_values = [NormalDist().inv_cdf(c / 100) for c in centiles]
+        return BatchAnalysisService._curves(gender, metric, tuple(centiles), tuple(z_values), months)
+
+    @staticmethod
+    def sd_curves(gender, metric, sds=DEFAULT_SDS, months=CURVE_MONTHS):
+        """Like centile_curves but keyed by Z-score (SD lines -3..+3)."""
+        return BatchAnalysisService._curves(gender, metric, tuple(sds), tuple(float(z) for z in sds), months)
+
+    @staticmethod
+    def _curves(gender, metric, labels, z_values, months):
+        key = (gender, metric, labels, months, lms_tables.get_interpolation())
+        cached = _CURVE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        grid = np.arange(months[0], months[1] + 1, dtype=np.float64)
+        l, m, s = BatchAnalysisService.get_lms_params(np.full(grid.shape, gender), metric, grid)
+        if np.isnan(m).all():
+            raise KeyError((gender, metric))
+        values = BatchAnalysisService.calculate_value(np.asarray(z_values)[:, None], l, m, s)
+        curves = {"months": grid}
+        for label, row in zip(labels, values):
+            curves[label] = row
+        for arr in curves.values():
+            arr.flags.writeable = False
+        _CURVE_CACHE[key] = curves
+        return curves
+
+    @staticmethod
+    def get_lms_params(genders, metric, months, days=None):
+        """
+        Vectorized get_lms_params (current lms_tables interpolation mode);
+        rows with an unknown gender or metric get NaN. With `days` given and
+        daily tables enabled, covered ages use the day-indexed tables like
+        AnalysisService.get_lms_params_for_age.
+        """
+        months = np.asarray(months, dtype=np.float64)
+        daily = days is not None and lms_tables.daily_enabled()
+        if daily:
+            days = np.asarray(days, dtype=np.int64)
+        cubic = lms_tables.get_interpolation() == "cubic"
+        codes = gender_codes(genders)
+        l = np.full(months.shape, np.nan)
+        m = np.full(months.shape, np.nan)
+        s = np.full(months.shape, np.nan)
+        for code, gender in enumerate(GENDERS):
+            rows = codes == code
+            if not rows.any():
+                continue
+            try:
+                table = array_table(lms_tables.get_table(gender, metric))
+            except KeyError:
+                continue
+            if cubic:
+                l[rows], m[rows], s[rows] = table.lookup_cubic(months[rows])
+            else:
+                l[rows], m[rows], s[rows] = table.lookup(months[rows])
+            if daily:
+                day_table = lms_tables.get_daily_table(gender, metric)
+                if day_table is None:
+                    continue
+                rows &= (days >= 0) & (days <= day_table.last)
+                if rows.any():
+                    # Günlük tablolar kapatılınca bırakılır: id ile önbelleğe alınmaz
+                    i = days[rows]
+                    l[rows] = np.asarray(day_table.l, dtype=np.float64)[i]
+                    m[rows] = np.asarray(day_table.m, dtype=np.float64)[i]
+                    s[rows] = np.asarray(day_table.s, dtype=np.float64)[i]
+        return l, m, s
+
+    @staticmethod
+    def input_flags(boy, kilo):
+        """uint16 plausibility.input_flags masks for raw height/weight arrays."""
+        return np.asarray(plausibility.input_flags(
+            np.asarray(boy, dtype=np.float64), np.asarray(kilo, dtype=np.float64)), dtype=np.uint16)
+
+    @staticmethod
+    def zscore_flags(boy_z, kilo_z, bmi_z, kilo_boy_z=None):
+        """uint16 plausibility.zscore_flags masks (WHO |Z| rules)."""
+        return np.asarray(plausibility.zscore_flags(boy_z, kilo_z, bmi_z, kilo_boy_z), dtype=np.uint16)
+
+    @staticmethod
+    def bmi_categories(bmi_p):
+        """Category codes 0-3 (see BMI_CATEGORIES) from percentiles, -1 for NaN."""
+        return np.select(
+            [bmi_p < 5, bmi_p < 85, bmi_p < 95, bmi_p >= 95],
+            [0, 1, 2, 3],
+            default=-1,
+        ).astype(np.int8)
+
+    @staticmethod
+    def get_wfh_params(genders, months, boy):
+        """
+        Vectorized lms_tables.get_wfh_params: weight-for-length (< 24 months)
+        or weight-for-height (24-60 months) L, M, S indexed by height in
+        0.1 cm steps. NaN outside the tables or when the data is missing.
+        """
+        months = np.asarray(months, dtype=np.float64)
+        mm = np.asarray(boy, dtype=np.float64) * 10
+        codes = gender_codes(genders)
+        l = np.full(months.shape, np.nan)
+        m = np.full(months.shape, np.nan)
+        s = np.full(months.shape, np.nan)
+        with np.errstate(invalid='ignore'):
+            length = (months >= 0) & (months < lms_tables.WFL_MAX_MONTHS)
+            height = (months >= lms_tables.WFL_MAX_MONTHS) & (months <= lms_tables.WFH_MAX_MONTHS)
+        for source, by_age in ((lms_store.SOURCE_WFL, length), (lms_store.SOURCE_WFH, height)):
+            for code, gender in enumerate(GENDERS):
+                rows = by_age & (codes == code)
+                if not rows.any():
+                    continue
+                table = lms_tables.get_wfh_table(source, gender)
+                if table is None:
+                    continue
+                rows &= (mm >= table.first) & (mm <= table.last)
+                if rows.any():
+                    l[rows], m[rows], s[rows] = array_table(table).lookup(mm[rows])
+        return l, m, s
+
+    @staticmethod
+    def bmi_cutoffs(genders, months):
+        """Interpolated (P5, P85, P95) BMI cutoff arrays; NaN for unknown genders."""
+        months = np.asarray(months, dtype=np.float64)
+        codes = gender_codes(genders)
+        cutoffs = [np.full(months.shape, np.nan) for _ in bmi_cutoffs.CUTOFF_CENTILES]
+        for code, gender in enumerate(GENDERS):
+            rows = codes == code
+            if rows.any():
+                values = array_table(bmi_cutoffs.cutoff_table(gender)).lookup(months[rows])
+                for out, value in zip(cutoffs, values):
+                    out[rows] = value
+        return tuple(cutoffs)
+
+    @staticmethod
+    def bmi_category_only(yas_ay, cinsiyet, boy, kilo):
+        """
+        Category-only fast mode: bmi_kategori codes by comparing BMI with
+        the precomputed cutoffs (no Z / percentile). Invalid rows get -1.
+        """
+        yas_ay = np.asarray(yas_ay, dtype=np.float64)
+        boy = np.asarray(boy, dtype=np.float64)
+        kilo = np.asarray(kilo, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bmi = kilo / ((boy / 100) ** 2)
+        bmi = np.where((boy > 0) & (kilo > 0) & (yas_ay >= 0), bmi, np.nan)
+        p5, p85, p95 = BatchAnalysisService.bmi_cutoffs(cinsiyet, yas_ay)
+        return np.select([bmi < p5, bmi < p85, bmi < p95, bmi >= p95], [0, 1, 2, 3], default=-1).astype(np.int8)
+
+    @staticmethod
+    def analyze(yas_ay, cinsiyet, boy, kilo, yas_gun=None):
+        """
+        Batch equivalent of perform_analysis for precomputed ages in months.
+        Returns a BatchResult of equally sized arrays; invalid rows (non-positive
+        height/weight, unknown gender) carry NaN and gecerli=False. bayrak
+        holds plausibility flags (input checks + WHO Z-score rules) per row.
+        yas_gun (whole days) selects the daily tables when they are enabled.
+        """
+        yas_ay = np.asarray(yas_ay, dtype=np.float64)
+        boy = np.asarray(boy, dtype=np.float64)
+        kilo = np.asarray(kilo, dtype=np.float64)
+        codes = gender_codes(cinsiyet)
+        bayrak = BatchAnalysisService.input_flags(boy, kilo)
+
+        gecerli = (boy > 0) & (kilo > 0) & (codes >= 0) & (yas_ay >= 0)
+        boy = np.where(gecerli, boy, np.nan)
+        kilo = np.where(gecerli, kilo, np.nan)
+
+        boy_z, boy_p = BatchAnalysisService.calculate_lms(
+            boy, *BatchAnalysisService.get_lms_params(codes, 'boy', yas_ay, yas_gun))
+
+        kilo_z, kilo_p = BatchAnalysisService.calculate_lms(
+            kilo, *BatchAnalysisService.get_lms_params(codes, 'kilo', yas_ay, yas_gun))
+        kilo_range = yas_ay <= 229
+        kilo_z = np.where(kilo_range, kilo_z, np.nan)
+        kilo_p = np.where(kilo_range, kilo_p, np.nan)
+
+        bmi = kilo / ((boy / 100) ** 2)
+        bmi_z, bmi_p = BatchAnalysisService.calculate_lms(
+            bmi, *BatchAnalysisService.get_lms_params(codes, 'bmi', yas_ay, yas_gun))
+
+        kilo_boy_z, kilo_boy_p = BatchAnalysisService.calculate_lms(
+            kilo, *BatchAnalysisService.get_wfh_params(codes, yas_ay, boy))
+        bayrak |= BatchAnalysisService.zscore_flags(boy_z, kilo_z, bmi_z, kilo_boy_z)
+
+        return BatchResult(
+            yas_ay_total=yas_ay,
+            gecerli=gecerli,
+            boy_z=boy_z,
+            boy_p=boy_p,
+            kilo_z=kilo_z,
+            kilo_p=kilo_p,
+            bmi=bmi,
+            bmi_z=bmi_z,
+            bmi_p=bmi_p,
+            bmi_kategori=BatchAnalysisService.bmi_categories(bmi_p),
+            kilo_boy_z=kilo_boy_z,
+            kilo_boy_p=kilo_boy_p,
+            bayrak=bayrak,
+        )
+
+    @staticmethod
+    def analyze_days(yas_gun, cinsiyet, boy, kilo):
+        """
+        analyze() for ages in whole days, with perform_analysis age
+        semantics: yas_ay_total = days / 30.4375 and uyari set when
+        days / 365.25 > 19. Negative ages are invalid rows.
+        """
+        yas_gun = np.asarray(yas_gun, dtype=np.int64)
+        res = BatchAnalysisService.analyze(yas_gun / 30.4375, cinsiyet, boy, kilo, yas_gun)
+        res.yas_gun = yas_gun
+        res.uyari = (yas_gun / 365.25) > 19
+        return res
+
+    @staticmethod
+    def analyze_dates(dogum, kontrol, cinsiyet, boy, kilo):
+        """
+        analyze_days() from birth and visit dates (see date_ordinals).
+        tarih_gecerli is False for unparseable dates and for visits before
+        birth; such rows are also gecerli=False.
+        """
+        dogum, dogum_ok = date_ordinals(dogum)
+        kontrol, kontrol_ok = date_ordinals(kontrol)
+        yas_gun = kontrol - dogum
+        tarih_gecerli = dogum_ok & kontrol_ok & (yas_gun >= 0)
+        res = BatchAnalysisService.analyze_days(np.where(tarih_gecerli, yas_gun, -1), cinsiyet, boy, kilo)
+        res.tarih_gecerli = tarih_gecerli
+        return res
@@ -0,0 +1,191 @@
+# Analiz sıcak yolları için performans ölçümü
+# Sabit tohumlu sentetik veri kümeleri (varsayılan 1k / 100k / 1M satır)
+# üzerinde LMS sorgusu, Z hesabı, uçtan uca perform_analysis, veri
+# modüllerinin import süresi ile toplu ve paralel yollar ölçülür.
+# Sonuçlar JSON olarak yazılır; --compare ile kayıtlı bir taban çizgisine
+# göre belirlenen yüzdeden fazla yavaşlama varsa çıkış kodu 1 olur.
+#
+# Kullanım:
+#   python benchmarks/bench_analysis.py --output baseline.json
+#   python benchmarks/bench_analysis.py --compare baseline.json --threshold 10
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from analysis_service import AnalysisService
+import batch_cli
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+SEED = 20070101
+
+
+def make_dataset(n, seed=SEED):
+    """Deterministic synthetic children: (ages in months, days, genders, heights, weights)."""
+    rng = random.Random(seed + n)
+    days = [rng.randint(0, 228 * 30) for _ in range(n)]
+    ages = [d / 30.4375 for d in days]
+    genders = [rng.choice(('erkek', 'kiz')) for _ in range(n)]
+    heights = [round(rng.uniform(45, 185), 1) for _ in range(n)]
+    weights = [round(rng.uniform(2.5, 90), 1) for _ in range(n)]
+    return ages, days, genders, heights, weights
+
+
+def timed(func, rows):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_s": rows / seconds if seconds > 0 else float("inf")}
+
+
+def bench_get_lms_params(data):
+    ages, _, genders, _, _ = data
+    def run():
+        get = AnalysisService.get_lms_params
+        for age, g in zip(ages, genders):
+            get(g, 'boy', age)
+    return run
+
+
+def bench_calculate_lms(data):
+    ages, _, genders, heights, _ = data
+    params = [AnalysisService.get_lms_params(g, 'boy', a) for a, g in zip(ages, genders)]
+    def run():
+        calc = AnalysisService.calculate_lms
+        for h, (l, m, s) in zip(heights, params):
+            calc(h, l, m, s)
+    return run
+
+
+def bench_perform_analysis(data):
+    _, days, genders, heights, weights = data
+    from datetime import date, timedelta
+    birth = date(2000, 1, 1)
+    controls = [birth + timedelta(days=d) for d in days]
+    def run():
+        perform = AnalysisService.perform_analysis
+        for c, g, h, w in zip(controls, genders, heights, weights):
+            perform(1, 1, 2000, c.day, c.month, c.year, h, w, g)
+    return run
+
+
+def bench_batch(data):
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+    ages, _, genders, heights, weights = data
+    arrays = (np.asarray(ages), np.asarray(genders), np.asarray(heights), np.asarray(weights))
+    return lambda: BatchAnalysisService.analyze(*arrays)
+
+
+def bench_parallel(data, workers):
+    _, days, genders, heights, weights = data
+    from datetime import date, timedelta
+    birth = date(2000, 1, 1)
+    records = [
+        (i, {"dogum_tarihi": "2000-01-01", "kontrol_tarihi": (birth + timedelta(days=d)).isoformat(),
+             "boy": h, "kilo": w, "cinsiyet": g})
+        for i, (d, g, h, w) in enumerate(zip(days, genders, heights, weights))
+    ]
+    def run():
+        for _ in batch_cli.analyze_records_parallel(records, workers):
+            pass
+    return run
+
+
+def bench_import(module, repeat=5):
+    """Best-of-N import time of a module in a fresh interpreter."""
+    code = ("import time, sys; sys.path.insert(0, %r); t = time.perf_counter(); import %s; "
+            "print(time.perf_counter() - t)") % (ROOT, module)
+    best = min(float(subprocess.check_output([sys.executable, "-c", code])) for _ in range(repeat))
+    return {"rows": 1, "seconds": best, "rows_per_s": 1 / best}
+
+
+def run_all(sizes, max_scalar_rows, workers):
+    results = {}
+    for module in ("growth_data", "growth_data_extended", "analysis_service"):
+        results[f"import:{module}"] = bench_import(module)
+
+    for n in sizes:
+        data = make_dataset(n)
+        scalar_ok = n <= max_scalar_rows
+        if scalar_ok:
+            results[f"get_lms_params@{n}"] = timed(bench_get_lms_params(data), n)
+            results[f"calculate_lms@{n}"] = timed(bench_calculate_lms(data), n)
+            results[f"perform_analysis@{n}"] = timed(bench_perform_analysis(data), n)
+        try:
+            results[f"batch@{n}"] = timed(bench_batch(data), n)
+        except ImportError:
+            pass
+        if scalar_ok and workers > 1:
+            results[f"parallel{workers}@{n}"] = timed(bench_parallel(data, workers), n)
+        print(f"{n} satır tamamlandı", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return names of benchmarks whose throughput dropped more than threshold %."""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        limit = base["rows_per_s"] * (1 - threshold / 100)
+        status = "OK"
+        if current["rows_per_s"] < limit:
+            status = "YAVAŞLAMA"
+            regressions.append(name)
+        change = (current["rows_per_s"] / base["rows_per_s"] - 1) * 100
+        print(f"{status:10} {name:32} {current['rows_per_s']:14.0f}/s ({change:+.1f}%)")
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Analiz performans ölçümü")
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=list(DEFAULT_SIZES),
+                        help="Virgülle ayrılmış satır sayıları (varsayılan: 1000,100000,1000000)")
+    parser.add_argument("--max-scalar-rows", type=int, default=100000,
+                        help="Satır satır ölçümlerin çalıştırılacağı en büyük veri kümesi")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Paralel yol için işçi sayısı")
+    parser.add_argument("--output", default="bench_results.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", help="Karşılaştırılacak taban çizgisi JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=10.0, help="İzin verilen en fazla yavaşlama (%%)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run_all(args.sizes, args.max_scalar_rows, args.workers)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    for name, r in results.items():
+        print(f"{name:32} {r['seconds']:10.4f} sn {r['rows_per_s']:14.0f}/s")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} ölçümde %{args.threshold:g} üzeri yavaşlama", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# Açılış süresi ölçümü
+# Uygulamayı (python main.py veya paketlenmiş exe) --startup-time ile
+# birkaç kez başlatır. Her çalıştırmada süreç başlatılmasından pencerenin
+# çizilmesine ve referans verisinin yüklenmesine kadar geçen süre ölçülür;
+# böylece tek dosyalı exe'nin geçici dizine açılma süresi de dahil olur.
+# Sonuç JSON olarak yazılır (klinik dizüstü bilgisayarlarında takip için).
+# --headless pencere açmadan yalnızca arka plan veri yüklemesini
+# (main.load_reference_data) ölçer; ekranı olmayan makinelerde kullanılır.
+#
+# Kullanım:
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --headless --runs 20
+#   python benchmarks/bench_startup.py --exe dist\CocukGelisimTakip.exe --runs 10
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# --headless: pencere yok; veri yüklemesi bitince duvar saati yazılır
+HEADLESS_CODE = ("import json, sys, time; sys.path.insert(0, {root!r}); from main import load_reference_data; "
+                 "load_reference_data(); open(sys.argv[2], 'w').write(json.dumps({{'veri_wall': time.time()}}))")
+
+
+def measure_once(command, timeout):
+    """Launch once; return (window seconds or None, data seconds) from process start."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        start = time.time()
+        subprocess.run(command + ["--startup-time", path], timeout=timeout, check=True)
+        with open(path, encoding="utf-8") as f:
+            marks = json.load(f)
+    finally:
+        os.remove(path)
+    window = marks["pencere_wall"] - start if "pencere_wall" in marks else None
+    return window, marks["veri_wall"] - start
+
+
+def summarize(values):
+    return {"min": min(values), "median": statistics.median(values), "max": max(values)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Uygulama açılış süresi ölçümü")
+    parser.add_argument("--exe", help="Paketlenmiş uygulama (varsayılan: python main.py)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Pencere açmadan yalnızca veri yüklemesini ölç")
+    parser.add_argument("--runs", type=int, default=5, help="Çalıştırma sayısı")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Çalıştırma başına zaman aşımı (sn)")
+    parser.add_argument("--output", default="startup_results.json", help="Sonuç JSON dosyası")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.headless:
+        command = [sys.executable, "-c", HEADLESS_CODE.format(root=ROOT)]
+    else:
+        command = [args.exe] if args.exe else [sys.executable, os.path.join(ROOT, "main.py")]
+    window, data = [], []
+    for i in range(args.runs):
+        w, d = measure_once(command, args.timeout)
+        data.append(d)
+        if w is None:
+            print(f"{i + 1}. çalıştırma: veri {d:.3f} sn", file=sys.stderr)
+            continue
+        window.append(w)
+        print(f"{i + 1}. çalıştırma: pencere {w:.3f} sn, veri {d:.3f} sn", file=sys.stderr)
+    report = {
+        "meta": {
+            "command": command,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        # İlk çalıştırma çoğunlukla soğuk açılıştır (disk önbelleği boş)
+        "ilk": {"pencere_s": window[0] if window else None, "veri_s": data[0]},
+        "pencere_s": summarize(window) if window else None,
+        "veri_s": summarize(data),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# BMI sınıflama eşikleri
+# Yalnızca kategori gereken taramalarda her satır için Z ve persentil
+# hesaplamak yerine, BMI tablosunun her ay anahtarı için P5/P85/P95'e
+# karşılık gelen BMI değerleri ters LMS ile bir kez hesaplanır. Sınıflama
+# bu eşiklerin aynı kurallarla interpole edilmiş değerleriyle bir
+# karşılaştırmadır. Eşikler aylık tablodan üretilir (günlük tablolar
+# kullanılmaz); tam eşik üzerindeki değerlerde ay arası interpolasyon
+# farkı nedeniyle perform_analysis'ten ayrılabilir.
+
+import math
+import lms_store
+import lms_tables
+from lms_tables import LmsTable
+
+CUTOFF_CENTILES = (5, 85, 95)
+# Standart normal dağılımın P5/P85/P95 değerleri; statistics modülü açılışta
+# pahalı olduğu için sabit yazıldı (test_bmi_cutoffs karşılaştırır)
+CUTOFF_Z = (-1.6448536269514722, 1.0364333894937898, 1.6448536269514722)
+
+_cutoff_tables = {}
+
+
+def _inverse_lms(z, l, m, s):
+    # AnalysisService.calculate_value ile aynı formül (döngüsel import olmasın)
+    if l == 0:
+        return m * math.exp(s * z)
+    return m * (1 + l * s * z) ** (1 / l)
+
+
+class CutoffTable(LmsTable):
+    """
+    LmsTable whose three columns hold the BMI values at P5, P85 and P95
+    instead of L, M, S; lookup() returns them for any age in months.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_lms(cls, table):
+        columns = [[], [], []]
+        for l, m, s in zip(table.l, table.m, table.s):
+            for column, z in zip(columns, CUTOFF_Z):
+                column.append(_inverse_lms(z, l, m, s))
+        return cls(list(table.keys), *columns, uniform=table.uniform)
+
+
+def cutoff_table(gender):
+    """Cached CutoffTable for a gender; raises KeyError if unknown."""
+    table = _cutoff_tables.get(gender)
+    if table is None:
+        lms = lms_tables.load_table(lms_store.SOURCE_WHO, gender, 'bmi')
+        table = _cutoff_tables[gender] = CutoffTable.from_lms(lms)
+    return table
+
+
+def bmi_cutoffs(gender, months):
+    """(P5, P85, P95) BMI values for gender at age in months."""
+    return cutoff_table(gender).lookup(months)
+
+
+def classify(bmi, gender, months):
+    """BMI category code 0-3 (analysis_result.BMI_CATEGORIES), -1 if NaN."""
+    p5, p85, p95 = cutoff_table(gender).lookup(months)
+    if bmi < p5: return 0
+    if bmi < p85: return 1
+    if bmi < p95: return 2
+    if bmi >= p95: return 3
+    return -1
@@ -1,5 +1,11 @@
 @echo off
+rem Kullanim: build.bat          -> tek dosya (dist\CocukGelisimTakip.exe)
+rem           build.bat hizli    -> klasor (dist\CocukGelisimTakip\), daha hizli acilis
 echo Building Child Growth Analyzer...
-python -m PyInstaller --noconfirm --onefile --windowed --name "CocukGelisimTakip" --clean "main.py"
-echo Build Finished! Exe file is in the dist folder.
+python lms_store.py
+if /I "%1"=="hizli" (set CGT_ONEDIR=1) else (set CGT_ONEDIR=)
+python -m PyInstaller --noconfirm --clean "CocukGelisimTakip.spec"
+set CGT_ONEDIR=
+echo Build Finished! Output is in the dist folder.
+echo Acilis suresi: python benchmarks\bench_startup.py --exe dist\CocukGelisimTakip.exe
 pause
@@ -0,0 +1,95 @@
+# Toplu içe aktarma modeli
+# Bir sınıfın / okulun CSV (veya JSONL) dosyasını AnalysisService'ten
+# geçirir ve sonuçları arayüzdeki sanal tablonun ihtiyaç duyduğu biçimde
+# tutar: sıralama yalnızca satır indeksleri üzerinde yapılır, ekran
+# metinleri de sadece görünen satırlar için (page) üretilir.
+
+import batch_cli
+import plausibility
+
+# (sütun anahtarı, başlık, sayısal mı)
+COLUMNS = (
+    ("satir", "Satır", True),
+    ("id", "No", False),
+    ("cinsiyet", "Cinsiyet", False),
+    ("yas_str", "Yaş", False),
+    ("boy_z", "Boy Z", True),
+    ("boy_p", "Boy P", True),
+    ("kilo_z", "Kilo Z", True),
+    ("kilo_p", "Kilo P", True),
+    ("bmi_z", "BMI Z", True),
+    ("bmi_p", "BMI P", True),
+    ("bmi_yorum", "BMI Durumu", False),
+    ("kilo_boy_z", "Kilo/Boy Z", True),
+    ("kontrol", "Kontrol", False),
+    ("hata", "Hata", False),
+)
+SORTABLE = {key for key, _, numeric in COLUMNS if numeric}
+PROGRESS_EVERY = 50
+
+
+class BulkResults:
+    def __init__(self, rows):
+        self.rows = rows
+        self.order = list(range(len(rows)))
+        self.errors = sum(1 for r in rows if r["hata"])
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_records(cls, records, task=None):
+        """
+        Analyze (row_no, record) pairs. `task` (gui_worker.Task) receives
+        progress reports and can cancel the run between rows.
+        """
+        records = list(records)
+        total = len(records)
+        rows = []
+        for i, (row_no, record) in enumerate(records):
+            if task is not None and i % PROGRESS_EVERY == 0:
+                task.check()
+                task.report(i, total)
+            row, error = batch_cli.analyze_record(record)
+            if not isinstance(record, dict):
+                record = {}
+            entry = {"satir": row_no, "cinsiyet": record.get("cinsiyet", ""), "hata": error or ""}
+            if row is not None:
+                entry.update(row)
+                entry["kontrol"] = "; ".join(plausibility.describe(row["bayrak"]))
+            else:
+                entry["id"] = record.get("id", "")
+            rows.append(entry)
+        if task is not None:
+            task.report(total, total)
+        return cls(rows)
+
+    @classmethod
+    def load(cls, path, task=None):
+        fmt = batch_cli.detect_format(path, None)
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            return cls.from_records(batch_cli.read_records(f, fmt), task)
+
+    def sort(self, column, reverse=False):
+        """Sort the view by a numeric column; rows without a value go last."""
+        if column not in SORTABLE:
+            raise KeyError(column)
+        rows = self.rows
+        present = [i for i in range(len(rows)) if rows[i].get(column) not in (None, "")]
+        missing = [i for i in range(len(rows)) if rows[i].get(column) in (None, "")]
+        present.sort(key=lambda i: rows[i][column], reverse=reverse)
+        self.order = present + missing
+
+    def page(self, start, count):
+        """Display tuples for the rows visible at [start, start + count)."""
+        out = []
+        for i in self.order[start:start + count]:
+            row = self.rows[i]
+            values = []
+            for key, _, numeric in COLUMNS:
+                value = row.get(key, "")
+                if numeric and key != "satir" and value not in (None, ""):
+                    value = f"{value:.2f}"
+                values.append(value)
+            out.append(tuple(values))
+        return out
@@ -0,0 +1,335 @@
+# Kohort (okul / ilçe) istatistikleri
+# Toplu analiz sonuçlarından tek geçişte, sabit bellekle özet çıkarır:
+# bodurluk (boy Z < -2) ve BMI kategorisi (zayıf, fazla kilolu, obez)
+# yaygınlıkları ile her Z skoru için ortalama, SD ve yaklaşık çeyreklikler.
+# Gruplar (cinsiyet, yaş bandı, isteğe bağlı grup sütunu) üçlüsüdür.
+#
+# Birikimler tamsayıdır: Z değerleri 2^-16 çözünürlükte sabit noktalı
+# toplanır, dağılım 0.01 genişlikli sabit bir histogramda sayılır. Bu
+# sayede paralel işçilerin kısmi sonuçları merge() ile sıradan bağımsız
+# ve birebir aynı sonucu verecek şekilde birleşir.
+#
+# Kullanım:
+#   python cohort_stats.py tarama.csv --group okul -o ozet.csv --workers 4
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import batch_cli
+from batch_engine import BatchAnalysisService, gender_codes, GENDERS
+
+# Yaş bantları (ay, alt sınırlar); son bant açık uçludur
+AGE_BANDS = (0, 24, 60, 120, 180, 229)
+AGE_BAND_LABELS = ("0-2", "2-5", "5-10", "10-15", "15-19", "19+")
+Z_METRICS = ("boy_z", "kilo_z", "bmi_z")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+SCALE = 1 << 16          # sabit nokta çarpanı
+Z_CLIP = 64.0            # birikimlerde taşma olmasın diye (|Z| > 64 anlamsız)
+BIN_WIDTH = 0.01
+Z_RANGE = 8.0            # histogram [-8, 8); dışı taşma kovalarında
+N_BINS = int(round(2 * Z_RANGE / BIN_WIDTH)) + 2
+MAX_ROWS_PER_ADD = 1 << 18  # int64 kare toplamı bu satır sayısında taşmaz
+
+# BMI kategori kodları (analysis_result.BMI_CATEGORIES) -> sayaç adları
+BMI_COUNTS = ("zayif", "saglikli", "fazla_kilolu", "obez")
+
+
+class ZAccumulator:
+    """Count, fixed-point sum / sum of squares, min, max and histogram of one Z metric."""
+    __slots__ = ("n", "sum_q", "sumsq_q", "min", "max", "hist")
+
+    def __init__(self):
+        self.n = 0
+        self.sum_q = 0
+        self.sumsq_q = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.hist = np.zeros(N_BINS, dtype=np.int64)
+
+    def add(self, z):
+        z = z[np.isfinite(z)]
+        if not len(z):
+            return
+        q = np.rint(np.clip(z, -Z_CLIP, Z_CLIP) * SCALE).astype(np.int64)
+        self.n += len(z)
+        self.sum_q += int(q.sum())
+        self.sumsq_q += int((q * q).sum())
+        self.min = min(self.min, float(z.min()))
+        self.max = max(self.max, float(z.max()))
+        bins = np.floor((z + Z_RANGE) / BIN_WIDTH).astype(np.int64) + 1
+        np.clip(bins, 0, N_BINS - 1, out=bins)
+        self.hist += np.bincount(bins, minlength=N_BINS)
+
+    def merge(self, other):
+        self.n += other.n
+        self.sum_q += other.sum_q
+        self.sumsq_q += other.sumsq_q
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.hist += other.hist
+
+    @property
+    def mean(self):
+        return self.sum_q / (SCALE * self.n) if self.n else float("nan")
+
+    @property
+    def sd(self):
+        if self.n < 2:
+            return float("nan")
+        # Tamsayılarla tam hesap; yalnızca son bölme yuvarlanır
+        var_q = (self.n * self.sumsq_q - self.sum_q * self.sum_q) / (self.n * (self.n - 1))
+        return (var_q ** 0.5) / SCALE
+
+    def quantile(self, q):
+        """Approximate quantile (within one histogram bin, clamped to min/max)."""
+        if not self.n:
+            return float("nan")
+        target = q * self.n
+        cumulative = np.cumsum(self.hist)
+        i = int(np.searchsorted(cumulative, target, side="left"))
+        i = min(i, N_BINS - 1)
+        if i == 0:
+            return self.min
+        if i == N_BINS - 1:
+            return self.max
+        before = cumulative[i - 1]
+        inside = self.hist[i]
+        lower = -Z_RANGE + (i - 1) * BIN_WIDTH
+        value = lower + BIN_WIDTH * ((target - before) / inside if inside else 0.0)
+        return min(max(value, self.min), self.max)
+
+
+class GroupStats:
+    __slots__ = ("n", "bodur", "boy_n", "bmi_counts", "bmi_n", "z")
+
+    def __init__(self):
+        self.n = 0
+        self.bodur = 0
+        self.boy_n = 0
+        self.bmi_counts = [0, 0, 0, 0]
+        self.bmi_n = 0
+        self.z = {metric: ZAccumulator() for metric in Z_METRICS}
+
+    def add(self, res, rows):
+        self.n += len(rows)
+        boy_z = res["boy_z"][rows]
+        valid = np.isfinite(boy_z)
+        self.boy_n += int(valid.sum())
+        self.bodur += int((boy_z[valid] < -2).sum())
+        counts = np.bincount(res["bmi_kategori"][rows].astype(np.int64) + 1, minlength=5)
+        for code in range(4):
+            self.bmi_counts[code] += int(counts[code + 1])
+        self.bmi_n += int(counts[1:].sum())
+        for metric in Z_METRICS:
+            self.z[metric].add(res[metric][rows])
+
+    def merge(self, other):
+        self.n += other.n
+        self.bodur += other.bodur
+        self.boy_n += other.boy_n
+        self.bmi_counts = [a + b for a, b in zip(self.bmi_counts, other.bmi_counts)]
+        self.bmi_n += other.bmi_n
+        for metric in Z_METRICS:
+            self.z[metric].merge(other.z[metric])
+
+    def summary(self):
+        def rate(count, total):
+            return 100.0 * count / total if total else float("nan")
+        row = {"n": self.n, "bodur_n": self.bodur, "bodur_yuzde": rate(self.bodur, self.boy_n)}
+        for name, count in zip(BMI_COUNTS, self.bmi_counts):
+            row[f"{name}_n"] = count
+            row[f"{name}_yuzde"] = rate(count, self.bmi_n)
+        for metric in Z_METRICS:
+            acc = self.z[metric]
+            row[f"{metric}_n"] = acc.n
+            row[f"{metric}_ort"] = acc.mean
+            row[f"{metric}_sd"] = acc.sd
+            for q in QUANTILES:
+                row[f"{metric}_p{int(q * 100)}"] = acc.quantile(q)
+        return row
+
+
+def age_bands(yas_ay):
+    """Index into AGE_BAND_LABELS for ages in months."""
+    return np.searchsorted(AGE_BANDS, yas_ay, side="right") - 1
+
+
+class CohortStats:
+    """
+    Online, mergeable aggregator keyed by (cinsiyet, yas_bandi, grup).
+    Memory grows with the number of groups only, not with the rows.
+    """
+
+    def __init__(self):
+        self.groups = {}
+        self.rows = 0
+        self.rejected = 0
+
+    def add_batch(self, res, cinsiyet, grup=None):
+        """
+        Add a BatchResult (BatchAnalysisService) with the matching gender
+        and optional group-label arrays. Rows with gecerli=False are counted
+        as rejected.
+        """
+        total = len(res)
+        codes = gender_codes(cinsiyet)
+        if grup is not None:
+            grup = np.asarray(grup, dtype=object)
+        for start in range(0, total, MAX_ROWS_PER_ADD):
+            stop = min(start + MAX_ROWS_PER_ADD, total)
+            self._add(res, np.arange(start, stop), codes[start:stop],
+                      None if grup is None else grup[start:stop])
+
+    def _add(self, res, rows, codes, grup):
+        valid = res["gecerli"][rows]
+        self.rows += int(valid.sum())
+        self.rejected += int((~valid).sum())
+        rows, codes = rows[valid], codes[valid]
+        bands = age_bands(res["yas_ay_total"][rows])
+        if grup is None:
+            labels, label_idx = np.array([""], dtype=object), np.zeros(len(rows), dtype=np.int64)
+        else:
+            labels, label_idx = np.unique(grup[valid].astype(str), return_inverse=True)
+        key = (label_idx * len(AGE_BAND_LABELS) + bands) * len(GENDERS) + codes
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        splits = np.flatnonzero(np.diff(key)) + 1
+        for part in np.split(np.arange(len(key)), splits):
+            if not len(part):
+                continue
+            k = int(key[part[0]])
+            gender = GENDERS[k % len(GENDERS)]
+            band = AGE_BAND_LABELS[(k // len(GENDERS)) % len(AGE_BAND_LABELS)]
+            label = str(labels[k // (len(GENDERS) * len(AGE_BAND_LABELS))])
+            group = self.groups.get((gender, band, label))
+            if group is None:
+                group = self.groups[(gender, band, label)] = GroupStats()
+            group.add(res, rows[order[part]])
+
+    def merge(self, other):
+        for key, group in other.groups.items():
+            mine = self.groups.get(key)
+            if mine is None:
+                mine = self.groups[key] = GroupStats()
+            mine.merge(group)
+        self.rows += other.rows
+        self.rejected += other.rejected
+        return self
+
+    def summary(self, by=("grup", "cinsiyet", "yas_bandi")):
+        """
+        One row per combination of the `by` dimensions (any subset of
+        grup / cinsiyet / yas_bandi); omitted dimensions are rolled up.
+        """
+        rolled = {}
+        for (gender, band, label), group in self.groups.items():
+            values = {"grup": label, "cinsiyet": gender, "yas_bandi": band}
+            key = tuple(values[d] for d in by)
+            target = rolled.get(key)
+            if target is None:
+                target = rolled[key] = GroupStats()
+            target.merge(group)
+        order = {"cinsiyet": GENDERS, "yas_bandi": AGE_BAND_LABELS}
+        def sort_key(key):
+            return tuple(order[d].index(v) if d in order else v for d, v in zip(by, key))
+        out = []
+        for key in sorted(rolled, key=sort_key):
+            row = dict(zip(by, key))
+            row.update(rolled[key].summary())
+            out.append(row)
+        return out
+
+
+def stats_from_records(records, group_column=None):
+    """Aggregate a list of raw (batch_cli) records into a CohortStats."""
+    stats = CohortStats()
+    (idx, days, genders, boy, kilo), errors = batch_cli.parse_columns(records)
+    stats.rejected += len(errors)
+    if idx:
+        res = BatchAnalysisService.analyze_days(days, genders, boy, kilo)
+        grup = None
+        if group_column:
+            grup = [str(records[i].get(group_column, "")) for i in idx]
+        stats.add_batch(res, genders, grup)
+    return stats
+
+
+def _stats_from_chunk(chunk, group_column):
+    return stats_from_records([record for _, record in chunk], group_column)
+
+
+def aggregate(records, group_column=None, workers=1, chunk_size=10000):
+    """
+    Stream (row_no, record) pairs through the vectorized engine chunk by
+    chunk; with workers > 1 chunks run in a process pool and the partial
+    aggregates are merged.
+    """
+    stats = CohortStats()
+    chunks = batch_cli.chunked(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            stats.merge(_stats_from_chunk(chunk, group_column))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(_stats_from_chunk, chunk, group_column))
+            if len(pending) >= 2 * workers:
+                stats.merge(pending.pop(0).result())
+        for future in pending:
+            stats.merge(future.result())
+    return stats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Kohort yaygınlık ve Z skoru istatistikleri")
+    parser.add_argument("input", nargs="?", default="-", help="Girdi dosyası (varsayılan: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Girdi biçimi (varsayılan: uzantıdan)")
+    parser.add_argument("--group", help="Gruplama sütunu (ör. okul)")
+    parser.add_argument("--by", default="grup,cinsiyet,yas_bandi",
+                        help="Özet boyutları, virgülle (grup, cinsiyet, yas_bandi)")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel işçi süreç sayısı")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Parça boyutu")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    by = tuple(d.strip() for d in args.by.split(",") if d.strip())
+    unknown = set(by) - {"grup", "cinsiyet", "yas_bandi"}
+    if unknown:
+        print(f"Bilinmeyen boyut: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    fmt = batch_cli.detect_format(args.input, args.format)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    try:
+        stats = aggregate(batch_cli.read_records(in_stream, fmt), args.group, args.workers, args.chunk_size)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+    rows = stats.summary(by)
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if args.output.lower().endswith((".jsonl", ".json")):
+            for row in rows:
+                out_stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        elif rows:
+            writer = csv.DictWriter(out_stream, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    print(f"{stats.rows} kayıt özetlendi, {stats.rejected} hatalı.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+# Büyüme eğrisi raporları
+# Her çocuk için boy / kilo / BMI grafiklerini (persentil eğrileri ve
+# çocuğun ziyaret noktaları) ve ziyaret tablosunu içeren bir HTML (veya
+# grafik başına SVG) dosyası üretir. Eğri arka planı (eksenler, ızgara,
+# P3-P97 eğrileri) yalnızca (cinsiyet, metrik, yaş aralığı) değerine
+# bağlıdır; süreç başına bir kez çizilip önbelleğe alınır, her çocuk için
+# yalnızca noktalar eklenir. Raporlar işçi süreçlere paylaştırılır ve
+# dosyaları işçiler yazar.
+#
+# Kullanım:
+#   python growth_report.py sinif.csv -o raporlar/
+#   python growth_report.py il_tarama.csv -o raporlar/ --workers 8 --format svg
+
+import argparse
+import hashlib
+import html
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from statistics import NormalDist
+import batch_cli
+from analysis_service import AnalysisService
+
+try:
+    from batch_engine import BatchAnalysisService
+except ImportError:
+    BatchAnalysisService = None
+
+CENTILES = (3, 15, 50, 85, 97)
+CENTILE_Z = tuple(NormalDist().inv_cdf(c / 100) for c in CENTILES)
+METRICS = (("boy", "Boy (cm)"), ("kilo", "Kilo (kg)"), ("bmi", "BMI (kg/m²)"))
+GENDER_LABELS = {"erkek": "Erkek", "kiz": "Kız"}
+
+# Yaş aralıkları (ay); ziyaretleri kapsayan en dar aralık seçilir
+AGE_RANGES = ((0, 24), (24, 60), (0, 60), (60, 228), (24, 228), (0, 228))
+
+WIDTH, HEIGHT = 640, 400
+LEFT, RIGHT, TOP, BOTTOM = 56, 44, 28, 40
+
+_backgrounds = {}
+
+
+class ChartFrame:
+    """Maps (months, value) to SVG coordinates for one chart background."""
+    __slots__ = ("lo", "hi", "vmin", "vmax")
+
+    def __init__(self, lo, hi, vmin, vmax):
+        self.lo = lo
+        self.hi = hi
+        self.vmin = vmin
+        self.vmax = vmax
+
+    def x(self, months):
+        return LEFT + (months - self.lo) / (self.hi - self.lo) * (WIDTH - LEFT - RIGHT)
+
+    def y(self, value):
+        return HEIGHT - BOTTOM - (value - self.vmin) / (self.vmax - self.vmin) * (HEIGHT - TOP - BOTTOM)
+
+    def contains(self, months, value):
+        return self.lo <= months <= self.hi and self.vmin <= value <= self.vmax
+
+
+def age_range(months):
+    """Narrowest AGE_RANGES entry covering all ages (in months)."""
+    lo, hi = min(months), max(months)
+    for start, end in AGE_RANGES:
+        if start <= lo and hi <= end:
+            return start, end
+    return AGE_RANGES[-1]
+
+
+def _nice_step(span, target=8):
+    raw = span / target
+    for step in (0.5, 1, 2, 5, 10, 20, 25, 50):
+        if step >= raw:
+            return step
+    return 100
+
+
+def _curves(gender, metric, lo, hi):
+    """Monthly grid and one value list per centile (KeyError if unknown)."""
+    if BatchAnalysisService is not None:
+        # Toplu motorun önbelleğe alınmış persentil eğrileri (NumPy)
+        curves = BatchAnalysisService.centile_curves(gender, metric, CENTILES, (lo, hi))
+        return curves["months"].tolist(), [curves[c].tolist() for c in CENTILES]
+    # NumPy yoksa aynı aylık ızgara AnalysisService ile hesaplanır
+    grid = list(range(lo, hi + 1))
+    lms = [AnalysisService.get_lms_params(gender, metric, m) for m in grid]
+    if lms[0] is None:
+        raise KeyError((gender, metric))
+    return grid, [[AnalysisService.calculate_value(z, *p) for p in lms] for z in CENTILE_Z]
+
+
+def background(gender, metric, lo, hi):
+    """
+    Cached (svg_fragment, ChartFrame) for the axes, grid and centile curves
+    of one (gender, metric, age range); raises KeyError if unknown.
+    """
+    key = (gender, metric, lo, hi)
+    cached = _backgrounds.get(key)
+    if cached is not None:
+        return cached
+
+    grid, curves = _curves(gender, metric, lo, hi)
+    vmin, vmax = min(curves[0]), max(curves[-1])
+    pad = (vmax - vmin) * 0.08
+    frame = ChartFrame(lo, hi, vmin - pad, vmax + pad)
+    title = dict(METRICS)[metric]
+
+    parts = [f'<rect x="{LEFT}" y="{TOP}" width="{WIDTH - LEFT - RIGHT}" '
+             f'height="{HEIGHT - TOP - BOTTOM}" fill="#fff" stroke="#999"/>']
+    # Izgara ve eksen etiketleri
+    x_step = 12 if hi - lo > 36 else 3
+    for m in range(lo, hi + 1, x_step):
+        x = frame.x(m)
+        label = f"{m // 12}y" if x_step == 12 else str(m)
+        parts.append(f'<line x1="{x:.1f}" y1="{TOP}" x2="{x:.1f}" y2="{HEIGHT - BOTTOM}" stroke="#eee"/>'
+                     f'<text x="{x:.1f}" y="{HEIGHT - BOTTOM + 14}" class="ax" text-anchor="middle">{label}</text>')
+    v_step = _nice_step(frame.vmax - frame.vmin)
+    v = (int(frame.vmin / v_step) + 1) * v_step
+    while v < frame.vmax:
+        y = frame.y(v)
+        parts.append(f'<line x1="{LEFT}" y1="{y:.1f}" x2="{WIDTH - RIGHT}" y2="{y:.1f}" stroke="#eee"/>'
+                     f'<text x="{LEFT - 6}" y="{y + 4:.1f}" class="ax" text-anchor="end">{v:g}</text>')
+        v += v_step
+    # Persentil eğrileri
+    for centile, curve in zip(CENTILES, curves):
+        points = " ".join(f"{frame.x(m):.1f},{frame.y(val):.1f}" for m, val in zip(grid, curve))
+        width = 1.6 if centile == 50 else 1
+        parts.append(f'<polyline points="{points}" fill="none" stroke="#5b8bd0" stroke-width="{width}"/>'
+                     f'<text x="{WIDTH - RIGHT + 4}" y="{frame.y(curve[-1]) + 4:.1f}" class="ax">P{centile}</text>')
+    axis_label = "Yaş (yıl)" if x_step == 12 else "Yaş (ay)"
+    parts.append(f'<text x="{LEFT}" y="{TOP - 10}" class="tt">{html.escape(title)}</text>'
+                 f'<text x="{WIDTH - RIGHT}" y="{HEIGHT - 6}" class="ax" text-anchor="end">{axis_label}</text>')
+
+    cached = _backgrounds[key] = ("".join(parts), frame)
+    return cached
+
+
+def chart_svg(gender, metric, points):
+    """
+    Full <svg> for one chart: the cached background plus the child's
+    (months, value, z) points. Points outside the chart are drawn on its edge.
+    """
+    lo, hi = age_range([p[0] for p in points])
+    fragment, frame = background(gender, metric, lo, hi)
+    coords, marks = [], []
+    for months, value, z in points:
+        x = frame.x(min(max(months, frame.lo), frame.hi))
+        y = frame.y(min(max(value, frame.vmin), frame.vmax))
+        coords.append(f"{x:.1f},{y:.1f}")
+        css = "pt" if frame.contains(months, value) else "pt out"
+        tip = f"{months:.1f} ay: {value:g}" + (f" (Z {z:.2f})" if z is not None else "")
+        marks.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.5" class="{css}"><title>{tip}</title></circle>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+            f'viewBox="0 0 {WIDTH} {HEIGHT}"><style>{SVG_STYLE}</style>{fragment}'
+            f'<polyline points="{" ".join(coords)}" fill="none" stroke="#c0392b" stroke-width="1.5"/>'
+            f'{"".join(marks)}</svg>')
+
+
+SVG_STYLE = (".ax{font:11px sans-serif;fill:#555}.tt{font:bold 13px sans-serif}"
+             ".pt{fill:#c0392b}.out{fill:#fff;stroke:#c0392b;stroke-width:1.5}")
+
+
+def analyze_child(child):
+    """Per-visit (AnalysisResult, kontrol date) pairs ordered by age."""
+    rows = []
+    for yas_gun, kontrol, boy, kilo in sorted(child["visits"]):
+        rows.append((AnalysisService.analyze_days(yas_gun, boy, kilo, child["cinsiyet"]), kontrol))
+    return rows
+
+
+def child_charts(child, rows=None):
+    """{metric: svg} for a child's analyzed visits."""
+    rows = rows if rows is not None else analyze_child(child)
+    charts = {}
+    for metric, _ in METRICS:
+        points = []
+        for res, _ in rows:
+            m = getattr(res, metric)
+            if res.error is None and m is not None:
+                points.append((res.yas_ay_total, m.val, m.z if m.z == m.z else None))
+        if points:
+            charts[metric] = chart_svg(child["cinsiyet"], metric, points)
+    return charts
+
+
+def _fmt(m, attr):
+    if m is None:
+        return ""
+    value = getattr(m, attr)
+    return "" if value != value else f"{value:.2f}"
+
+
+def child_report(child):
+    """HTML page with a child's charts and visit table."""
+    rows = analyze_child(child)
+    charts = child_charts(child, rows)
+    table = []
+    for res, kontrol in rows:
+        if res.error is not None:
+            table.append(f"<tr><td>{kontrol}</td><td colspan=\"7\">{html.escape(res.error)}</td></tr>")
+            continue
+        cells = (kontrol, res.yas_str, _fmt(res.boy, "val"), _fmt(res.boy, "z"), _fmt(res.kilo, "val"),
+                 _fmt(res.kilo, "z"), _fmt(res.bmi, "val"), _fmt(res.bmi, "z"))
+        table.append("<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in cells) + "</tr>")
+    title = html.escape(f"{child['id']} - {GENDER_LABELS.get(child['cinsiyet'], child['cinsiyet'])}, "
+                        f"doğum {child['dogum']}")
+    return ("<!DOCTYPE html><html lang=\"tr\"><head><meta charset=\"utf-8\">"
+            f"<title>{title}</title><style>{HTML_STYLE}</style></head><body>"
+            f"<h1>{title}</h1>{''.join(charts.values())}"
+            "<table><tr><th>Kontrol</th><th>Yaş</th><th>Boy</th><th>Boy Z</th><th>Kilo</th>"
+            f"<th>Kilo Z</th><th>BMI</th><th>BMI Z</th></tr>{''.join(table)}</table></body></html>")
+
+
+HTML_STYLE = ("body{font-family:sans-serif;margin:16px}svg{display:block;margin:8px 0}"
+              "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:2px 6px}"
+              "@media print{svg{page-break-inside:avoid}}")
+
+
+def group_children(records):
+    """
+    Group (row_no, record) pairs by child id into report inputs. Returns
+    (children, rejects): children keep first-seen order, rejects is a list
+    of (row_no, error). Records without an id are a child of their own.
+    """
+    children = {}
+    rejects = []
+    for row_no, record in records:
+        if not isinstance(record, dict):
+            rejects.append((row_no, batch_cli.NOT_OBJECT))
+            continue
+        if "_hata" in record:
+            rejects.append((row_no, record["_hata"]))
+            continue
+        try:
+            gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet = batch_cli.parse_record(record)
+        except (ValueError, TypeError) as e:
+            rejects.append((row_no, str(e)))
+            continue
+        dogum = date(yil, ay, gun)
+        kontrol = date(k_yil, k_ay, k_gun)
+        child_key = str(record.get("id") or f"satir{row_no}")
+        child = children.get(child_key)
+        if child is None:
+            child = children[child_key] = {"id": child_key, "cinsiyet": cinsiyet,
+                                           "dogum": dogum.isoformat(), "visits": []}
+        elif (child["cinsiyet"], child["dogum"]) != (cinsiyet, dogum.isoformat()):
+            rejects.append((row_no, f"{child_key}: cinsiyet veya doğum tarihi önceki kayıtlarla uyuşmuyor"))
+            continue
+        child["visits"].append(((kontrol - dogum).days, kontrol.isoformat(), boy, kilo))
+    return list(children.values()), rejects
+
+
+def _file_stem(child_id):
+    return re.sub(r"[^\w.-]", "_", child_id) or "_"
+
+
+def assign_file_stems(children):
+    """
+    Set child["dosya"] to a file name stem unique within the run. Ids that
+    sanitize to the same stem (also case-insensitively, for Windows) get
+    a short hash of the raw id appended, so no report overwrites another.
+    """
+    seen = set()
+    for child in children:
+        stem = _file_stem(child["id"])
+        if stem.lower() in seen:
+            digest = hashlib.blake2b(child["id"].encode("utf-8"), digest_size=4).hexdigest()
+            base = f"{stem}-{digest}"
+            stem, n = base, 1
+            while stem.lower() in seen:
+                n += 1
+                stem = f"{base}-{n}"
+        seen.add(stem.lower())
+        child["dosya"] = stem
+    return children
+
+
+def write_report(child, out_dir, fmt="html"):
+    """Write one child's report; returns the written paths."""
+    stem = os.path.join(out_dir, child.get("dosya") or _file_stem(child["id"]))
+    if fmt == "svg":
+        paths = []
+        for metric, svg in child_charts(child).items():
+            path = f"{stem}_{metric}.svg"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(svg)
+            paths.append(path)
+        return paths
+    path = stem + ".html"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(child_report(child))
+    return [path]
+
+
+def _write_chunk(chunk, out_dir, fmt):
+    return [(child["id"], write_report(child, out_dir, fmt)) for child in chunk]
+
+
+def render_reports(children, out_dir, fmt="html", workers=1, chunk_size=50):
+    """
+    Write reports for all children into out_dir; yields (id, paths) in
+    input order. With workers > 1 children are split into chunks over a
+    process pool; each worker caches chart backgrounds for its lifetime.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    children = assign_file_stems(list(children))
+    if workers <= 1:
+        for child in children:
+            yield child["id"], write_report(child, out_dir, fmt)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=batch_cli._init_worker) as executor:
+        futures = [executor.submit(_write_chunk, chunk, out_dir, fmt)
+                   for chunk in batch_cli.chunked(children, chunk_size)]
+        for future in futures:
+            yield from future.result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Çocuk başına büyüme eğrisi raporları (HTML/SVG)")
+    parser.add_argument("input", help="Ziyaret kayıtları (CSV/JSONL; aynı id'li satırlar bir çocuk)")
+    parser.add_argument("-o", "--output", default="raporlar", help="Çıktı dizini")
+    parser.add_argument("--format", choices=("html", "svg"), default="html",
+                        help="html: çocuk başına sayfa, svg: grafik başına dosya")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="Girdi biçimi (varsayılan: uzantıdan)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="İşçi süreç sayısı")
+    parser.add_argument("--chunk-size", type=int, default=50, help="İşçilere gönderilen çocuk sayısı")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    fmt = batch_cli.detect_format(args.input, args.input_format)
+    with open(args.input, encoding="utf-8-sig", newline="") as f:
+        children, rejects = group_children(batch_cli.read_records(f, fmt))
+    for row_no, error in rejects:
+        print(f"Satır {row_no}: {error}", file=sys.stderr)
+    count = sum(1 for _ in render_reports(children, args.output, args.format, args.workers, args.chunk_size))
+    elapsed = time.perf_counter() - start
+    print(f"{count} çocuk için rapor yazıldı ({len(rejects)} hatalı satır), {elapsed:.2f} sn", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Arayüz için arka plan iş yürütücü
+# Analiz işleri Tk ana döngüsünü bloke etmemesi için ayrı bir iş
+# parçacığında çalışır. Sonuç, ilerleme ve hata bildirimleri bir kuyruğa
+# yazılır; arayüz kuyruğu root.after ile periyodik olarak boşaltır, böylece
+# widget'lara yalnızca ana iş parçacığından dokunulur.
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    """Handle passed to the background function for progress and cancellation."""
+
+    def __init__(self, events, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        self._events = events
+        self._cancel = threading.Event()
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Raise TaskCancelled inside the worker if cancel() was requested."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def report(self, done, total):
+        self._events.put(("progress", self, (done, total)))
+
+
+class BackgroundRunner:
+    def __init__(self, max_workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analiz")
+        self.events = queue.Queue()
+
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        """Run func(task, *args) in the background; callbacks run in poll()."""
+        task = Task(self.events, on_done, on_error, on_progress, on_cancel)
+        self.executor.submit(self._run, task, func, args)
+        return task
+
+    def _run(self, task, func, args):
+        try:
+            result = func(task, *args)
+        except TaskCancelled:
+            self.events.put(("cancelled", task, None))
+        except Exception as e:
+            self.events.put(("error", task, e))
+        else:
+            if task.cancelled:
+                self.events.put(("cancelled", task, None))
+            else:
+                self.events.put(("done", task, result))
+
+    def poll(self, max_events=100):
+        """Dispatch pending events on the calling (UI) thread."""
+        for _ in range(max_events):
+            try:
+                kind, task, payload = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "progress":
+                if task.on_progress and not task.cancelled:
+                    task.on_progress(*payload)
+            elif kind == "done":
+                if task.on_done:
+                    task.on_done(payload)
+            elif kind == "error":
+                if task.on_error:
+                    task.on_error(payload)
+            elif kind == "cancelled":
+                if task.on_cancel:
+                    task.on_cancel()
+
+    def attach(self, root, interval_ms=50):
+        """Start polling from the Tk main loop."""
+        def tick():
+            self.poll()
+            root.after(interval_ms, tick)
+        root.after(interval_ms, tick)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,140 @@
+# Çocuk ve ziyaret geçmişi (SQLite)
+# Her ziyaret AnalysisService ile analiz edilip Z değerleriyle birlikte
+# saklanır. child_id + kontrol_tarihi indeksi sayesinde bir çocuğun tüm
+# ziyaretleri milyonlarca kayıt arasında da indeks üzerinden okunur.
+
+import sqlite3
+from datetime import date
+from analysis_service import AnalysisService
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS children (
+    id INTEGER PRIMARY KEY,
+    external_id TEXT UNIQUE,
+    cinsiyet TEXT NOT NULL,
+    dogum_tarihi TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY,
+    child_id INTEGER NOT NULL REFERENCES children(id),
+    kontrol_tarihi TEXT NOT NULL,
+    yas_gun INTEGER NOT NULL,
+    boy REAL NOT NULL,
+    kilo REAL NOT NULL,
+    boy_z REAL,
+    kilo_z REAL,
+    bmi REAL,
+    bmi_z REAL,
+    bmi_p REAL
+);
+CREATE INDEX IF NOT EXISTS idx_visits_child_date ON visits(child_id, kontrol_tarihi);
+CREATE INDEX IF NOT EXISTS idx_visits_date ON visits(kontrol_tarihi);
+"""
+
+VISIT_COLUMNS = ("id", "child_id", "kontrol_tarihi", "yas_gun", "boy", "kilo",
+                 "boy_z", "kilo_z", "bmi", "bmi_z", "bmi_p")
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+class HistoryStore:
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- Yazma ---
+
+    def add_child(self, external_id, cinsiyet, dogum_tarihi):
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO children (external_id, cinsiyet, dogum_tarihi) VALUES (?, ?, ?)",
+                (external_id, cinsiyet, _as_date(dogum_tarihi).isoformat()))
+        return cur.lastrowid
+
+    def add_children(self, rows):
+        """Bulk insert (external_id, cinsiyet, dogum_tarihi) rows in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO children (external_id, cinsiyet, dogum_tarihi) VALUES (?, ?, ?)",
+                ((ext, cinsiyet, _as_date(dt).isoformat()) for ext, cinsiyet, dt in rows))
+
+    def child_id(self, external_id):
+        row = self.conn.execute("SELECT id FROM children WHERE external_id = ?", (external_id,)).fetchone()
+        return row[0] if row else None
+
+    def add_visit(self, child_id, kontrol_tarihi, boy, kilo):
+        self.add_visits([(child_id, kontrol_tarihi, boy, kilo)])
+
+    def add_visits(self, rows):
+        """
+        Analyze and bulk insert (child_id, kontrol_tarihi, boy, kilo) rows in
+        one transaction. Raises ValueError (nothing is written) if any row
+        fails analysis.
+        """
+        children = {}
+        params = []
+        for child_id, kontrol_tarihi, boy, kilo in rows:
+            child = children.get(child_id)
+            if child is None:
+                row = self.conn.execute(
+                    "SELECT cinsiyet, dogum_tarihi FROM children WHERE id = ?", (child_id,)).fetchone()
+                if row is None:
+                    raise ValueError(f"Bilinmeyen çocuk: {child_id}")
+                child = children[child_id] = (row[0], date.fromisoformat(row[1]))
+            cinsiyet, dogum = child
+            kontrol = _as_date(kontrol_tarihi)
+            yas_gun = (kontrol - dogum).days
+            res = AnalysisService.analyze_days(yas_gun, boy, kilo, cinsiyet)
+            if res.error is not None:
+                raise ValueError(f"{child_id} / {kontrol}: {res.error}")
+            params.append((
+                child_id, kontrol.isoformat(), yas_gun, boy, kilo,
+                res.boy.z if res.boy else None, res.kilo.z if res.kilo else None,
+                res.bmi.val if res.bmi else None, res.bmi.z if res.bmi else None,
+                res.bmi.p if res.bmi else None,
+            ))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO visits (child_id, kontrol_tarihi, yas_gun, boy, kilo, boy_z, kilo_z, bmi, bmi_z, bmi_p) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", params)
+
+    # --- Sorgular ---
+
+    def visits(self, child_id):
+        """All visits of one child ordered by date (uses idx_visits_child_date)."""
+        cur = self.conn.execute(
+            f"SELECT {', '.join(VISIT_COLUMNS)} FROM visits WHERE child_id = ? ORDER BY kontrol_tarihi",
+            (child_id,))
+        return [dict(zip(VISIT_COLUMNS, row)) for row in cur]
+
+    def growth_velocity(self, child_id):
+        return AnalysisService.growth_velocity(self.visits(child_id))
+
+    def bmi_crossings(self, threshold=2.0):
+        """
+        Children whose BMI Z-score reached `threshold` at their latest visit
+        while it was below it at the visit before.
+        """
+        cur = self.conn.execute("""
+            WITH ordered AS (
+                SELECT child_id, kontrol_tarihi, bmi_z,
+                       LAG(bmi_z) OVER (PARTITION BY child_id ORDER BY kontrol_tarihi) AS onceki_z,
+                       ROW_NUMBER() OVER (PARTITION BY child_id ORDER BY kontrol_tarihi DESC) AS sira
+                FROM visits
+            )
+            SELECT c.id, c.external_id, o.kontrol_tarihi, o.onceki_z, o.bmi_z
+            FROM ordered o JOIN children c ON c.id = o.child_id
+            WHERE o.sira = 1 AND o.onceki_z < ? AND o.bmi_z >= ?
+            ORDER BY c.id
+        """, (threshold, threshold))
+        keys = ("child_id", "external_id", "kontrol_tarihi", "onceki_bmi_z", "bmi_z")
+        return [dict(zip(keys, row)) for row in cur]
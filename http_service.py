@@ -0,0 +1,334 @@
+# Yerel HTTP/JSON analiz servisi
+# Hastane bilgi sistemi gibi istemcilerin AnalysisService'i yerel ağdan
+# çağırabilmesi için asyncio tabanlı küçük bir HTTP/1.1 sunucusu. Eşzamanlı
+# gelen küçük istekler MicroBatcher ile tek bir toplu işte birleştirilir ve
+# CPU yoğun kısım işçi havuzunda (NumPy varsa vektörel) çalıştırılır.
+#
+# Uç noktalar:
+#   POST /analiz   tek kayıt (JSON nesnesi) veya kayıt dizisi
+#   GET  /metrics  gecikme p50/p99, verim, toplu iş boyutları (JSON)
+#   GET  /health
+#
+# Kullanım:
+#   python http_service.py --port 8080 --workers 4
+#   python load_generator.py --url http://127.0.0.1:8080/analiz
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import batch_cli
+from analysis_result import AGE_WARNING
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+except ImportError:
+    np = None
+
+MAX_BODY = 32 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _row_from_columns(record, res, i):
+    def val(key):
+        v = res[key][i]
+        return "" if v != v else float(v)  # NaN -> boş alan
+    return {
+        "id": record.get("id", ""),
+        "yas_ay_total": float(res.yas_ay_total[i]),
+        "yas_str": res.yas_str(i),
+        "uyari": AGE_WARNING if res.uyari[i] else "",
+        "boy_z": val("boy_z"), "boy_p": val("boy_p"),
+        "kilo_z": val("kilo_z"), "kilo_p": val("kilo_p"),
+        "bmi": val("bmi"), "bmi_z": val("bmi_z"), "bmi_p": val("bmi_p"),
+        "bmi_yorum": res.bmi_yorum(i),
+        "kilo_boy_z": val("kilo_boy_z"), "kilo_boy_p": val("kilo_boy_p"),
+        "bayrak": int(res.bayrak[i]),
+    }
+
+
+def analyze_chunk(records):
+    """
+    Analyze a micro-batch in a worker. Returns one {"sonuc": row} or
+    {"hata": message} per record, in order. Uses the vectorized engine
+    when NumPy is available, perform_analysis otherwise.
+    """
+    out = [None] * len(records)
+    if np is None:
+        for i, record in enumerate(records):
+            row, error = batch_cli.analyze_record(record)
+            out[i] = {"hata": error} if error else {"sonuc": row}
+        return out
+
+    (idx, days, genders, boy, kilo), errors = batch_cli.parse_columns(records)
+    for i, error in errors.items():
+        out[i] = {"hata": error}
+    if idx:
+        res = BatchAnalysisService.analyze_days(days, genders, boy, kilo)
+        for j, i in enumerate(idx):
+            out[i] = {"sonuc": _row_from_columns(records[i], res, j)}
+    return out
+
+
+class MicroBatcher:
+    """Coalesce concurrent requests into batches of up to max_batch records."""
+
+    def __init__(self, executor, max_batch=512, max_wait_ms=2.0):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batch_sizes = deque(maxlen=10000)
+        self._task = None
+        # asyncio görevlere yalnızca zayıf referans tutar; bitene kadar burada
+        self._dispatches = set()
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # Sürmekte olan toplu işler yanıtlarını tamamlasın
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            size = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            # Kısa bir süre daha bekleyip gelen istekleri aynı toplu işe ekle
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                size += len(item[0])
+            task = loop.create_task(self._dispatch(items))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, items):
+        records = [r for recs, _ in items for r in recs]
+        self.batch_sizes.append(len(records))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, analyze_chunk, records)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        pos = 0
+        for recs, future in items:
+            if not future.done():
+                future.set_result(results[pos:pos + len(recs)])
+            pos += len(recs)
+
+
+class Metrics:
+    def __init__(self, window=10000):
+        self.started = time.time()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.records = 0
+        self.errors = 0
+        self.recent = deque(maxlen=60)  # [saniye, kayıt sayısı], son 60 sn
+
+    def observe(self, seconds, records, ok=True):
+        self.requests += 1
+        self.records += records
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+        second = int(time.time())
+        if self.recent and self.recent[-1][0] == second:
+            self.recent[-1][1] += records
+        else:
+            self.recent.append([second, records])
+
+    @staticmethod
+    def _quantile(sorted_values, q):
+        if not sorted_values:
+            return 0.0
+        return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+    def snapshot(self, batch_sizes=()):
+        lat = sorted(self.latencies)
+        now = time.time()
+        last_10s = sum(n for t, n in self.recent if now - t < 10)
+        sizes = list(batch_sizes)
+        uptime = now - self.started
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "records": self.records,
+            "errors": self.errors,
+            "latency_ms": {
+                "p50": self._quantile(lat, 0.50) * 1000,
+                "p99": self._quantile(lat, 0.99) * 1000,
+                "max": (lat[-1] if lat else 0.0) * 1000,
+            },
+            "throughput_rps": self.records / uptime if uptime > 0 else 0.0,
+            "throughput_last_10s_rps": last_10s / 10,
+            "batches": {
+                "count": len(sizes),
+                "mean_size": sum(sizes) / len(sizes) if sizes else 0.0,
+                "max_size": max(sizes) if sizes else 0,
+            },
+        }
+
+
+class AnalysisServer:
+    def __init__(self, executor, max_batch=512, max_wait_ms=2.0):
+        self.batcher = MicroBatcher(executor, max_batch, max_wait_ms)
+        self.metrics = Metrics()
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, path, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = h.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send(writer, 400, {"hata": "Geçersiz Content-Length."}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._send(writer, 413, {"hata": "İstek çok büyük."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version != "HTTP/1.0" and headers.get("connection", "").lower() != "close"
+                status, payload = await self.route(method, path.split("?", 1)[0], body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"durum": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot(self.batcher.batch_sizes)
+        if path != "/analiz":
+            return 404, {"hata": "Bulunamadı."}
+        if method != "POST":
+            return 405, {"hata": "Yalnızca POST desteklenir."}
+
+        start = time.perf_counter()
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            self.metrics.observe(time.perf_counter() - start, 0, ok=False)
+            return 400, {"hata": f"JSON hatası: {e}"}
+        single = not isinstance(data, list)
+        records = [data] if single else data
+        try:
+            results = await self.batcher.submit(records) if records else []
+        except Exception as e:
+            self.metrics.observe(time.perf_counter() - start, len(records), ok=False)
+            return 500, {"hata": str(e)}
+        self.metrics.observe(time.perf_counter() - start, len(records))
+        return 200, results[0] if single else results
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def make_executor(kind, workers):
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Çocuk gelişim HTTP analiz servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="İşçi sayısı")
+    parser.add_argument("--executor", choices=("process", "thread"), default="process", help="İşçi havuzu türü")
+    parser.add_argument("--max-batch", type=int, default=512, help="Bir toplu işteki en fazla kayıt")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Toplu iş birleştirme bekleme süresi")
+    return parser
+
+
+async def serve(args):
+    executor = make_executor(args.executor, args.workers)
+    server = AnalysisServer(executor, args.max_batch, args.max_wait_ms)
+    port = await server.start(args.host, args.port)
+    print(f"http://{args.host}:{port}/analiz dinleniyor ({args.workers} {args.executor} işçi)", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
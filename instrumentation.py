@@ -0,0 +1,144 @@
+# Sıcak yol ölçümleri
+# AnalysisService.enable_instrumentation() ile açılır; kapalıyken analiz
+# kodunda yalnızca "instr is not None" kontrolleri kalır. Aşama başına süre
+# histogramları, çağrı sayaçları ve tür bazında hata sayıları tutulur;
+# snapshot() / write_snapshot() izleme sisteminin okuyacağı JSON veya metin
+# (Prometheus biçimi) çıktı üretir. profile() bir toplu iş için cProfile
+# veya enable()/disable() arayüzlü başka bir profiler bağlamayı sağlar.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram kova üst sınırları (saniye): 1 µs .. ~1 sn, 2'nin katları
+BUCKETS = tuple(1e-6 * 2 ** i for i in range(21))
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Upper bucket bound containing quantile q (0-1)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for i, c in enumerate(self.counts):
+            running += c
+            if running >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([f"{b:g}" for b in BUCKETS] + ["+Inf"], self.counts)),
+        }
+
+
+class Instrumentation:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.calls = {}
+        self.errors = {}
+
+    def lap(self, stage, since):
+        """Record time since `since` for stage and return the new timestamp."""
+        now = time.perf_counter()
+        with self._lock:
+            hist = self.stages.get(stage)
+            if hist is None:
+                hist = self.stages[stage] = Histogram()
+            hist.observe(now - since)
+        return now
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + n
+
+    def error(self, kind):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.calls.clear()
+            self.errors.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "time": time.time(),
+                "stages": {name: h.snapshot() for name, h in self.stages.items()},
+                "calls": dict(self.calls),
+                "errors": dict(self.errors),
+            }
+
+    def to_text(self):
+        """Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = ["# TYPE analysis_stage_seconds histogram"]
+        for stage, h in sorted(snap["stages"].items()):
+            running = 0
+            for bound, c in h["buckets"].items():
+                running += c
+                lines.append(f'analysis_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {running}')
+            lines.append(f'analysis_stage_seconds_sum{{stage="{stage}"}} {h["sum"]:.9f}')
+            lines.append(f'analysis_stage_seconds_count{{stage="{stage}"}} {h["count"]}')
+        lines.append("# TYPE analysis_calls_total counter")
+        for name, n in sorted(snap["calls"].items()):
+            lines.append(f'analysis_calls_total{{name="{name}"}} {n}')
+        lines.append("# TYPE analysis_errors_total counter")
+        for kind, n in sorted(snap["errors"].items()):
+            lines.append(f'analysis_errors_total{{type="{kind}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path, fmt="json"):
+        """Atomically write the counters so a scraper never sees a partial file."""
+        import json  # yalnızca dışa aktarımda gerekir; açılışta yüklenmez
+        text = self.to_text() if fmt == "text" else json.dumps(self.snapshot(), indent=2)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+@contextmanager
+def profile(profiler=None, output=None):
+    """
+    Profile a block (e.g. one batch). Uses cProfile unless another profiler
+    object with enable()/disable() is given (adapter for a sampling profiler).
+    With cProfile and `output`, stats are dumped there for pstats/snakeviz.
+    """
+    import cProfile  # ölçüm kapalıyken import süresine eklenmesin
+    profiler = profiler or cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output and isinstance(profiler, cProfile.Profile):
+            profiler.dump_stats(output)
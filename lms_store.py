@@ -0,0 +1,137 @@
+# Paketlenmiş LMS referans verisi
+# growth_data.py / growth_data_extended.py sözlük literalleri her import'ta
+# derlenip Python nesnelerine çevrilir. Bu modül aynı verileri küçük bir
+# ikili dosyada (lms_data.bin) tutar; dosya mmap ile açılır ve her
+# (kaynak, cinsiyet, metrik) tablosu ancak istendiğinde okunur.
+#
+# Dosya düzeni (little-endian):
+#   başlık : magic 'LMSB', sürüm (H), tablo sayısı (H)
+#   indeks : tablo başına ad (32s, "kaynak/cinsiyet/metrik"), kayıt sayısı (I),
+#            düzenli aylık ızgara bayrağı (I), veri ofseti (Q)
+#   veri   : tablo başına n adet float64 ay, L, M, S dizisi
+#
+# Yeniden oluşturmak için: python lms_store.py
+
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"LMSB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+ENTRY = struct.Struct("<32sIIQ")
+
+# PyInstaller paketinde veri dosyaları açılış dizinine (sys._MEIPASS) çıkarılır
+DATA_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(DATA_DIR, "lms_data.bin")
+DAILY_PATH = os.path.join(DATA_DIR, "lms_daily.bin")
+WFH_PATH = os.path.join(DATA_DIR, "lms_wfh.bin")
+
+# Kaynak adları: WHO 0-228 ay, CPEG/CDC 121-228 ay genişletilmiş kilo ve
+# gün indeksli WHO 0-5 yaş tabloları (lms_daily.bin)
+SOURCE_WHO = "who"
+SOURCE_EXTENDED = "ext"
+SOURCE_DAILY = "day"
+
+# Boya göre ağırlık (lms_wfh.bin): anahtarlar ay değil milimetre (0.1 cm)
+# cinsinden boydur; yatarak ölçülen boy (wfl, 45-110 cm, < 2 yaş) ve
+# ayakta ölçülen boy (wfh, 65-120 cm, 2-5 yaş) ayrı tablolardır.
+SOURCE_WFL = "wfl"
+SOURCE_WFH = "wfh"
+
+
+def table_name(source, gender, metric):
+    return f"{source}/{gender}/{metric}"
+
+
+def write_store(path, tables):
+    """
+    Write tables to a packed file.
+    tables: {(source, gender, metric): {month: (L, M, S)}}
+    """
+    from array import array  # yalnızca yazarken; okuma yolu açılışta yüklemez
+    entries = []
+    blobs = []
+    offset = HEADER.size + ENTRY.size * len(tables)
+    for (source, gender, metric), data in tables.items():
+        keys = sorted(data.keys())
+        uniform = keys == list(range(keys[0], keys[-1] + 1)) if all(
+            isinstance(k, int) for k in keys) else False
+        columns = [array("d", [float(k) for k in keys])]
+        for idx in range(3):
+            columns.append(array("d", [float(data[k][idx]) for k in keys]))
+        blob = b"".join(_le_bytes(col) for col in columns)
+        name = table_name(source, gender, metric).encode("utf-8")
+        entries.append(ENTRY.pack(name, len(keys), int(uniform), offset))
+        blobs.append(blob)
+        offset += len(blob)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+        for entry in entries:
+            f.write(entry)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def _le_bytes(col):
+    if sys.byteorder != "little":
+        from array import array
+        col = array("d", col)
+        col.byteswap()
+    return col.tobytes()
+
+
+class LmsStore:
+    """Read-only, memory-mapped view of a packed LMS file."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Geçersiz LMS veri dosyası: {path}")
+        self.index = {}
+        for i in range(count):
+            raw_name, n, uniform, offset = ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)
+            name = raw_name.rstrip(b"\0").decode("utf-8")
+            self.index[name] = (n, bool(uniform), offset)
+
+    def __contains__(self, key):
+        return table_name(*key) in self.index
+
+    def load(self, source, gender, metric):
+        """Return (months, L, M, S, uniform) for one table; KeyError if absent."""
+        n, uniform, offset = self.index[table_name(source, gender, metric)]
+        cols = [self._doubles(offset + 8 * n * i, n) for i in range(4)]
+        return cols[0], cols[1], cols[2], cols[3], uniform
+
+    def _doubles(self, offset, n):
+        view = memoryview(self._mm)[offset:offset + 8 * n]
+        if sys.byteorder == "little":
+            return view.cast("d")
+        from array import array
+        col = array("d", view.tobytes())
+        col.byteswap()
+        return col
+
+
+def tables_from_modules():
+    """Collect the dict literals from growth_data / growth_data_extended."""
+    import growth_data
+    import growth_data_extended
+    tables = {}
+    for source, lms in ((SOURCE_WHO, growth_data.LMS_DATA),
+                        (SOURCE_EXTENDED, growth_data_extended.LMS_DATA_EXTENDED)):
+        for gender, metrics in lms.items():
+            for metric, data in metrics.items():
+                tables[(source, gender, metric)] = data
+    return tables
+
+
+if __name__ == "__main__":
+    write_store(DEFAULT_PATH, tables_from_modules())
+    print(f"{DEFAULT_PATH} oluşturuldu.")
@@ -0,0 +1,374 @@
+# LMS referans tabloları
+# Her (cinsiyet, metrik) tablosu ilk kullanımda bir kez sıralı paralel
+# dizilere (ay, L, M, S) dönüştürülür. Böylece her sorguda sorted() +
+# doğrusal tarama yapılmaz; aylık düzenli tablolarda doğrudan indeksleme,
+# diğerlerinde bisect kullanılır.
+#
+# Veriler öncelikle paketlenmiş lms_data.bin dosyasından (lms_store) okunur;
+# dosya yoksa growth_data / growth_data_extended modüllerine dönülür.
+#
+# Kilo tablosu WHO (0-120 ay) ve genişletilmiş (121-228 ay) kaynaklardan
+# yüklenirken tek bir sürekli 0-228 ay tablosuna birleştirilir; 120-121 ay
+# arası da diğer aylar gibi interpole edilir.
+#
+# İsteğe bağlı monoton kübik interpolasyon (set_interpolation('cubic')):
+# her tablo için Fritsch-Carlson eğimleriyle aralık başına kübik polinom
+# katsayıları ilk kullanımda bir kez hesaplanır; sorgu, doğrusal moddaki
+# aralık seçimi + üç polinom değerlendirmesidir.
+
+from bisect import bisect_left
+import lms_store
+
+INTERPOLATION_MODES = ("linear", "cubic")
+
+
+class LmsTable:
+    __slots__ = ("keys", "l", "m", "s", "first", "last", "uniform", "cubic")
+
+    def __init__(self, keys, l, m, s, uniform=None):
+        self.keys = keys
+        self.l = l
+        self.m = m
+        self.s = s
+        self.first = keys[0]
+        self.last = keys[-1]
+        if uniform is None:
+            # Ardışık tamsayı ay anahtarları -> O(1) indeksleme
+            uniform = list(keys) == list(range(int(self.first), int(self.last) + 1))
+        self.uniform = uniform
+        self.cubic = None
+
+    @classmethod
+    def from_dict(cls, data):
+        keys = sorted(data.keys())
+        return cls(keys,
+                   [data[k][0] for k in keys],
+                   [data[k][1] for k in keys],
+                   [data[k][2] for k in keys])
+
+    def segment(self, months):
+        """Return index i of the interval [keys[i], keys[i+1]] used for months.
+
+        Mirrors the original linear scan: the first interval whose upper
+        bound reaches `months` wins, so an exact key k > first is reached
+        from the left interval with ratio 1.
+        """
+        if self.uniform:
+            offset = months - self.first
+            i = int(offset)
+            if i == offset and i > 0:
+                i -= 1
+        else:
+            i = bisect_left(self.keys, months) - 1
+        if i < 0:
+            i = 0
+        elif i > len(self.keys) - 2:
+            i = len(self.keys) - 2
+        return i
+
+    def lookup(self, months):
+        # Clamp
+        if months <= self.first: months = self.first
+        if months >= self.last: months = self.last
+
+        keys = self.keys
+        if len(keys) == 1:
+            return self.l[0], self.m[0], self.s[0]
+
+        i = self.segment(months)
+        t1, t2 = keys[i], keys[i + 1]
+        ratio = (months - t1) / (t2 - t1)
+        l1, m1, s1 = self.l[i], self.m[i], self.s[i]
+        l = l1 + (self.l[i + 1] - l1) * ratio
+        m = m1 + (self.m[i + 1] - m1) * ratio
+        s = s1 + (self.s[i + 1] - s1) * ratio
+        return l, m, s
+
+    def cubic_coefficients(self):
+        """
+        Per-segment (b, c, d) lists for L, M and S, computed once:
+        y = y[i] + t * (b[i] + t * (c[i] + t * d[i])), t = months - keys[i].
+        """
+        if self.cubic is None:
+            self.cubic = tuple(monotone_cubic(self.keys, col) for col in (self.l, self.m, self.s))
+        return self.cubic
+
+    def lookup_cubic(self, months):
+        """Like lookup() but with monotone cubic interpolation between keys."""
+        if months <= self.first: months = self.first
+        if months >= self.last: months = self.last
+
+        if len(self.keys) == 1:
+            return self.l[0], self.m[0], self.s[0]
+
+        i = self.segment(months)
+        t = months - self.keys[i]
+        result = []
+        for y, (b, c, d) in zip((self.l, self.m, self.s), self.cubic_coefficients()):
+            result.append(y[i] + t * (b[i] + t * (c[i] + t * d[i])))
+        return tuple(result)
+
+
+def monotone_cubic(keys, values):
+    """
+    Fritsch-Carlson (PCHIP) coefficients (b, c, d) for each interval.
+    The curve passes through every point and does not overshoot: it is
+    monotone wherever the data is.
+    """
+    n = len(keys)
+    h = [keys[i + 1] - keys[i] for i in range(n - 1)]
+    delta = [(values[i + 1] - values[i]) / h[i] for i in range(n - 1)]
+    if n == 2:
+        slopes = [delta[0], delta[0]]
+    else:
+        slopes = [0.0] * n
+        for i in range(1, n - 1):
+            if delta[i - 1] * delta[i] > 0:
+                # Ağırlıklı harmonik ortalama
+                w1 = 2 * h[i] + h[i - 1]
+                w2 = h[i] + 2 * h[i - 1]
+                slopes[i] = (w1 + w2) / (w1 / delta[i - 1] + w2 / delta[i])
+        slopes[0] = _end_slope(h[0], h[1], delta[0], delta[1])
+        slopes[-1] = _end_slope(h[-1], h[-2], delta[-1], delta[-2])
+    b, c, d = [], [], []
+    for i in range(n - 1):
+        b.append(slopes[i])
+        c.append((3 * delta[i] - 2 * slopes[i] - slopes[i + 1]) / h[i])
+        d.append((slopes[i] + slopes[i + 1] - 2 * delta[i]) / (h[i] * h[i]))
+    return b, c, d
+
+
+def _end_slope(h0, h1, d0, d1):
+    # Üç noktalı uç eğimi, monotonluğu bozmayacak şekilde sınırlanır
+    slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+    if slope * d0 <= 0:
+        return 0.0
+    if d0 * d1 < 0 and abs(slope) > 3 * abs(d0):
+        return 3 * d0
+    return slope
+
+
+class _ModuleSource:
+    """Fallback source backed by the growth_data dict literals."""
+
+    def __init__(self):
+        self.tables = lms_store.tables_from_modules()
+
+    def __contains__(self, key):
+        return key in self.tables
+
+    def load(self, source, gender, metric):
+        data = self.tables[(source, gender, metric)]
+        table = LmsTable.from_dict(data)
+        return table.keys, table.l, table.m, table.s, table.uniform
+
+
+_source = None
+_tables = {}
+_stitched = {}
+_interpolation = "linear"
+
+
+def _get_source():
+    global _source
+    if _source is None:
+        try:
+            _source = lms_store.LmsStore()
+        except (OSError, ValueError):
+            _source = _ModuleSource()
+    return _source
+
+
+def load_table(source, gender, metric):
+    """Return the cached LmsTable for one table, loading it on first use."""
+    key = (source, gender, metric)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = LmsTable(*_get_source().load(source, gender, metric))
+    return table
+
+
+def has_table(source, gender, metric):
+    return (source, gender, metric) in _get_source()
+
+
+def get_table(gender, metric, months=None):
+    """
+    The table get_lms_params uses for any age; raises KeyError if unknown.
+    `months` is ignored: weight is a single stitched 0-228 month table.
+    """
+    if metric != 'kilo':
+        return load_table(lms_store.SOURCE_WHO, gender, metric)
+    table = _stitched.get(gender)
+    if table is None:
+        table = load_table(lms_store.SOURCE_WHO, gender, metric)
+        # 10-19 yaş kilo verisi genişletilmiş tablodan gelir
+        if has_table(lms_store.SOURCE_EXTENDED, gender, metric):
+            table = stitch(table, load_table(lms_store.SOURCE_EXTENDED, gender, metric))
+        _stitched[gender] = table
+    return table
+
+
+def stitch(base, extension):
+    """One table: base rows before extension.first, then all extension rows."""
+    n = bisect_left(base.keys, extension.first)
+    return LmsTable(list(base.keys[:n]) + list(extension.keys),
+                    list(base.l[:n]) + list(extension.l),
+                    list(base.m[:n]) + list(extension.m),
+                    list(base.s[:n]) + list(extension.s))
+
+
+def set_interpolation(mode):
+    """Select 'linear' (default) or 'cubic' interpolation for age tables."""
+    global _interpolation
+    if mode not in INTERPOLATION_MODES:
+        raise ValueError(f"Bilinmeyen interpolasyon modu: {mode}")
+    _interpolation = mode
+
+
+def get_interpolation():
+    return _interpolation
+
+
+def lookup(gender, metric, months):
+    """(L, M, S) from the age table in the current interpolation mode."""
+    table = get_table(gender, metric)
+    if _interpolation == "cubic":
+        return table.lookup_cubic(months)
+    return table.lookup(months)
+
+
+# --- Günlük çözünürlüklü tablolar (0-5 yaş, isteğe bağlı) ---
+# setup_lms_data.py --daily ile üretilen lms_daily.bin, gün 0'dan başlayan
+# yoğun (her gün bir satır) tablolar içerir; sorgu doğrudan yas_gun
+# indeksidir, interpolasyon veya arama yapılmaz.
+
+_daily_store = None
+_daily_path = None
+_daily_tables = {}
+
+
+def enable_daily(path=None):
+    """Open the daily table file; raises OSError/ValueError if unusable."""
+    global _daily_store, _daily_path
+    path = path or lms_store.DAILY_PATH
+    _daily_store = lms_store.LmsStore(path)
+    _daily_path = path
+    _daily_tables.clear()
+
+
+def disable_daily():
+    global _daily_store, _daily_path
+    _daily_store = None
+    _daily_path = None
+    _daily_tables.clear()
+
+
+def daily_enabled():
+    return _daily_store is not None
+
+
+def daily_path():
+    """Path of the enabled daily table file, or None."""
+    return _daily_path
+
+
+def get_daily_table(gender, metric):
+    """Day-indexed LmsTable (keys 0..last) or None if not available."""
+    key = (gender, metric)
+    table = _daily_tables.get(key)
+    if table is None:
+        if _daily_store is None or (lms_store.SOURCE_DAILY, gender, metric) not in _daily_store:
+            return None
+        table = _daily_tables[key] = LmsTable(*_daily_store.load(lms_store.SOURCE_DAILY, gender, metric))
+    if not table.uniform or table.first != 0:
+        return None
+    return table
+
+
+def get_daily_params(gender, metric, days):
+    """Return (L, M, S) for an integer age in days, or None if not covered."""
+    table = get_daily_table(gender, metric)
+    if table is None or not 0 <= days <= table.last:
+        return None
+    return table.l[days], table.m[days], table.s[days]
+
+
+# --- Boya göre ağırlık tabloları (0-5 yaş, isteğe bağlı) ---
+# setup_lms_data.py --wfh ile üretilen lms_wfh.bin varsa ilk kullanımda
+# açılır. Anahtarlar 0.1 cm (mm) adımlı düzenli bir ızgaradır; sorgu boyun
+# mm değeriyle doğrudan indekslemedir. Tablo aralığı dışındaki boylar için
+# sonuç verilmez (yaş tablolarındaki gibi sınıra sabitlenmez).
+
+WFL_MAX_MONTHS = 24   # bu yaşın altında yatarak ölçülen boy tablosu (wfl)
+WFH_MAX_MONTHS = 60   # 24-60 ay: ayakta ölçülen boy tablosu (wfh)
+
+_wfh_path = None
+_wfh_store = None     # False: dosya yok veya okunamadı
+_wfh_tables = {}
+
+
+def set_wfh_path(path=None):
+    """Use another weight-for-length/height file (None: lms_wfh.bin)."""
+    global _wfh_path, _wfh_store
+    _wfh_path = path
+    _wfh_store = None
+    _wfh_tables.clear()
+
+
+def wfh_path():
+    """Path of the weight-for-length/height file in use."""
+    return _wfh_path or lms_store.WFH_PATH
+
+
+def wfh_source(months):
+    """Table source for an age: wfl under 24 months, wfh up to 60, else None."""
+    if months < 0 or months > WFH_MAX_MONTHS:
+        return None
+    return lms_store.SOURCE_WFL if months < WFL_MAX_MONTHS else lms_store.SOURCE_WFH
+
+
+def get_wfh_table(source, gender):
+    """Cached height-indexed LmsTable, or None when the data is not installed."""
+    global _wfh_store
+    key = (source, gender)
+    table = _wfh_tables.get(key)
+    if table is None:
+        if _wfh_store is None:
+            try:
+                _wfh_store = lms_store.LmsStore(wfh_path())
+            except (OSError, ValueError):
+                _wfh_store = False
+        if _wfh_store is False or (source, gender, 'kilo') not in _wfh_store:
+            return None
+        table = _wfh_tables[key] = LmsTable(*_wfh_store.load(source, gender, 'kilo'))
+    return table
+
+
+def wfh_available(gender, months):
+    """True if the weight-for-length/height table for this age is installed."""
+    source = wfh_source(months)
+    return source is not None and get_wfh_table(source, gender) is not None
+
+
+def get_wfh_params(gender, months, boy):
+    """(L, M, S) for weight at this length/height in cm, or None if not covered."""
+    source = wfh_source(months)
+    if source is None:
+        return None
+    table = get_wfh_table(source, gender)
+    if table is None:
+        return None
+    mm = boy * 10
+    if not table.first <= mm <= table.last:
+        return None
+    return table.lookup(mm)
+
+
+def preload():
+    """Open every age table and the weight-for-length/height tables once."""
+    for gender in ('erkek', 'kiz'):
+        for metric in ('boy', 'kilo', 'bmi'):
+            get_table(gender, metric)
+        for source in (lms_store.SOURCE_WFL, lms_store.SOURCE_WFH):
+            get_wfh_table(source, gender)
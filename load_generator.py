@@ -0,0 +1,102 @@
+# http_service için yük üreteci
+# Belirtilen sayıda eşzamanlı bağlantı açar ve süre boyunca her bağlantıdan
+# art arda POST /analiz istekleri gönderir (keep-alive). Sonunda istemci
+# tarafı p50/p99 gecikme ve saniyedeki kayıt sayısı yazdırılır.
+#
+# Kullanım:
+#   python load_generator.py --url http://127.0.0.1:8080/analiz --concurrency 64 --duration 10
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+def make_records(n, rng):
+    records = []
+    for _ in range(n):
+        yil = rng.randint(2006, 2024)
+        records.append({
+            "dogum_tarihi": f"{yil}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "kontrol_tarihi": "2025-01-15",
+            "boy": round(rng.uniform(50, 180), 1),
+            "kilo": round(rng.uniform(3, 80), 1),
+            "cinsiyet": rng.choice(("erkek", "kiz")),
+        })
+    return records
+
+
+async def client(host, port, path, body, deadline, latencies, counts):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            counts["ok" if b" 200 " in status else "error"] += 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    rng = random.Random(args.seed)
+    payload = make_records(args.records, rng)
+    body = json.dumps(payload if args.records > 1 else payload[0]).encode("utf-8")
+    latencies = []
+    counts = {"ok": 0, "error": 0}
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        client(url.hostname, url.port or 80, url.path or "/analiz", body, deadline, latencies, counts)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def q(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    report = {
+        "requests": counts["ok"] + counts["error"],
+        "errors": counts["error"],
+        "records_per_s": counts["ok"] * args.records / elapsed,
+        "requests_per_s": (counts["ok"] + counts["error"]) / elapsed,
+        "latency_ms": {"p50": q(0.50), "p99": q(0.99), "max": q(1.0)},
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="HTTP analiz servisi yük üreteci")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/analiz")
+    parser.add_argument("--concurrency", type=int, default=32, help="Eşzamanlı bağlantı sayısı")
+    parser.add_argument("--duration", type=float, default=10.0, help="Süre (sn)")
+    parser.add_argument("--records", type=int, default=1, help="İstek başına kayıt sayısı")
+    parser.add_argument("--seed", type=int, default=1)
+    return parser
+
+
+def main(argv=None):
+    asyncio.run(run(build_parser().parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,35 @@
+import time
+_T0 = time.perf_counter()  # Açılış süresi ölçümü için (--startup-time)
+
+import json
+import os
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 import calendar
-from analysis_service import AnalysisService
+from gui_worker import BackgroundRunner
+
+# analysis_service ve bulk_import pencere açıldıktan sonra arka planda
+# yüklenir (preload_reference_data); ilk hesaplama beklemek zorunda kalmaz.
+
+
+def load_reference_data(task=None):
+    """Import the analysis modules and open every LMS table once."""
+    import lms_tables
+    import analysis_service
+    import bulk_import
+    lms_tables.preload()
+
+
+def perform_analysis(task, args):
+    from analysis_service import AnalysisService
+    return AnalysisService.perform_analysis(*args)
+
+
+def load_bulk(task, path):
+    from bulk_import import BulkResults
+    return BulkResults.load(path, task)
 
 
 class Colors:
@@ -62,45 +89,47 @@ class CalendarPopup(tk.Toplevel):
         self.cal_frame = tk.Frame(self, bg=Colors.WHITE)
         self.cal_frame.pack(fill="both", expand=True, padx=5, pady=5)
         
-        self.update_calendar()
-
-    def update_calendar(self):
-        self.header_label.config(text=f"{calendar.month_name[self.month]} {self.year}")
-        
-        for widget in self.cal_frame.winfo_children():
-            widget.destroy()
-
         # Weekdays header
-        days = ["M", "T", "W", "T", "F", "S", "S"]
         days_tr = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
-        
         for i, d in enumerate(days_tr):
             tk.Label(self.cal_frame, text=d, bg=Colors.WHITE, font=("Segoe UI", 9, "bold")).grid(row=0, column=i, sticky="nsew")
 
-        # Days
-        month_days = calendar.monthrange(self.year, self.month)[1]
-        first_weekday = calendar.monthrange(self.year, self.month)[0]
-        
-        row = 1
-        col = first_weekday
-        
-        for day in range(1, month_days + 1):
-            btn = tk.Button(self.cal_frame, text=str(day), command=lambda d=day: self.select_date(d),
+        # 6 hafta x 7 gün hücre bir kez oluşturulur; ay değişince yalnızca metinleri güncellenir
+        self.cell_days = [None] * 42
+        self.day_buttons = []
+        for idx in range(42):
+            btn = tk.Button(self.cal_frame, text="", command=lambda i=idx: self.select_cell(i),
                             bg=Colors.WHITE, relief="flat", font=("Segoe UI", 10))
-            btn.grid(row=row, column=col, sticky="nsew")
+            btn.grid(row=1 + idx // 7, column=idx % 7, sticky="nsew")
             
             # Hover effect
-            btn.bind("<Enter>", lambda e, b=btn: b.config(bg=Colors.HOVER))
-            btn.bind("<Leave>", lambda e, b=btn: b.config(bg=Colors.WHITE))
-
-            col += 1
-            if col > 6:
-                col = 0
-                row += 1
+            btn.bind("<Enter>", lambda e, i=idx: self.cell_days[i] and self.day_buttons[i].config(bg=Colors.HOVER))
+            btn.bind("<Leave>", lambda e, i=idx: self.day_buttons[i].config(bg=Colors.WHITE))
+            self.day_buttons.append(btn)
         
         # Grid weights
         for i in range(7): self.cal_frame.columnconfigure(i, weight=1)
         
+        self.update_calendar()
+
+    def update_calendar(self):
+        self.header_label.config(text=f"{calendar.month_name[self.month]} {self.year}")
+
+        first_weekday, month_days = calendar.monthrange(self.year, self.month)
+        for idx, btn in enumerate(self.day_buttons):
+            day = idx - first_weekday + 1
+            if 1 <= day <= month_days:
+                self.cell_days[idx] = day
+                btn.config(text=str(day), state="normal", bg=Colors.WHITE)
+            else:
+                self.cell_days[idx] = None
+                btn.config(text="", state="disabled", bg=Colors.WHITE)
+
+    def select_cell(self, idx):
+        day = self.cell_days[idx]
+        if day is not None:
+            self.select_date(day)
+        
     def prev_month(self):
         self.month -= 1
         if self.month < 1:
@@ -128,6 +157,80 @@ class CalendarPopup(tk.Toplevel):
         self.destroy()
 
 
+class BulkResultsWindow(tk.Toplevel):
+    """Virtualized result table: a fixed set of Treeview rows is reused while scrolling."""
+    VISIBLE_ROWS = 25
+
+    def __init__(self, parent, results, title):
+        from bulk_import import COLUMNS, SORTABLE
+        super().__init__(parent)
+        self.results = results
+        self.offset = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self.title(f"Toplu Analiz - {title}")
+        self.geometry("1100x640")
+        self.configure(bg=Colors.WHITE)
+
+        ttk.Label(self, text=f"{len(results)} kayıt, {results.errors} hatalı", font=("Segoe UI", 12)).pack(anchor="w", padx=10, pady=5)
+
+        frame = ttk.Frame(self, style="Card.TFrame")
+        frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        self.tree = ttk.Treeview(frame, columns=[c for c, _, _ in COLUMNS], show="headings", height=self.VISIBLE_ROWS)
+        for key, label, numeric in COLUMNS:
+            if key in SORTABLE:
+                self.tree.heading(key, text=label, command=lambda k=key: self.sort_by(k))
+            else:
+                self.tree.heading(key, text=label)
+            self.tree.column(key, width=70 if numeric else 120, anchor="e" if numeric else "w")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Yalnızca görünen satır sayısı kadar öğe oluşturulur
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(self.VISIBLE_ROWS)]
+
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - (3 if e.delta > 0 else -3)))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self.refresh()
+
+    def max_offset(self):
+        return max(0, len(self.results) - self.VISIBLE_ROWS)
+
+    def scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self.max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.results))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def sort_by(self, column):
+        self.sort_reverse = not self.sort_reverse if column == self.sort_column else False
+        self.sort_column = column
+        self.results.sort(column, self.sort_reverse)
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        page = self.results.page(self.offset, self.VISIBLE_ROWS)
+        for i, item in enumerate(self.items):
+            self.tree.item(item, values=page[i] if i < len(page) else ())
+        total = len(self.results)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+
 class CocukGelisimApp:
     def __init__(self, root):
         self.root = root
@@ -143,9 +246,28 @@ class CocukGelisimApp:
         
         self.root.configure(bg=Colors.BG_LIGHT)
         
+        # Analiz işleri arka planda çalışır, sonuçlar root.after ile alınır
+        self.runner = BackgroundRunner()
+        self.runner.attach(self.root)
+        self.current_task = None
+        
         self.setup_styles()
         self.create_layout()
 
+        # Pencere çizildikten sonra referans verisini arka planda yükle.
+        # Runner tek işçili olduğu için sonraki hesaplamalar bunun arkasında sıralanır.
+        self.data_ready = None
+        self.on_data_ready = None
+        self.root.after_idle(self.preload_reference_data)
+
+    def preload_reference_data(self):
+        def done(_):
+            self.data_ready = time.perf_counter()
+            if self.on_data_ready:
+                self.on_data_ready()
+        # Hata olursa ilk hesaplamada modüller yeniden denenir
+        self.runner.submit(load_reference_data, on_done=done, on_error=done)
+
     def setup_styles(self):
         style = ttk.Style()
         style.theme_use('clam')
@@ -255,11 +377,24 @@ class CocukGelisimApp:
         # Hesapla Butonu
         ttk.Button(card, text="ANALİZ ET", command=self.hesapla).pack(fill="x", pady=(30, 0), ipady=5)
 
+        # Toplu içe aktarma (sınıf listesi)
+        ttk.Button(card, text="TOPLU İÇE AKTAR", command=self.toplu_ice_aktar).pack(fill="x", pady=(10, 0), ipady=3)
+
     def create_result_panel(self, parent):
         card = ttk.Frame(parent, style="Card.TFrame", padding="20")
         card.pack(fill="both", expand=True)
 
-        ttk.Label(card, text="Gelişim Raporu", font=("Segoe UI", 14, "bold"), foreground=Colors.PRIMARY).pack(anchor="w", pady=(0, 15))
+        title_frame = ttk.Frame(card, style="Card.TFrame")
+        title_frame.pack(fill="x", pady=(0, 15))
+        ttk.Label(title_frame, text="Gelişim Raporu", font=("Segoe UI", 14, "bold"), foreground=Colors.PRIMARY).pack(side="left")
+
+        # İlerleme göstergesi ve iptal (yalnızca iş sürerken görünür)
+        self.busy_frame = ttk.Frame(title_frame, style="Card.TFrame")
+        self.progress = ttk.Progressbar(self.busy_frame, mode="indeterminate", length=160)
+        self.progress.pack(side="left", padx=5)
+        self.progress_label = ttk.Label(self.busy_frame, text="", font=("Segoe UI", 10))
+        self.progress_label.pack(side="left", padx=5)
+        tk.Button(self.busy_frame, text="İptal", command=self.cancel_task, bg=Colors.DANGER, fg="white", bd=0, padx=8).pack(side="left")
 
         self.scroll_frame = tk.Canvas(card, bg=Colors.WHITE, highlightthickness=0)
         self.scrollbar = ttk.Scrollbar(card, orient="vertical", command=self.scroll_frame.yview)
@@ -282,10 +417,19 @@ class CocukGelisimApp:
         self.lbl_placeholder = ttk.Label(self.results_content, text="Sonuçları görmek için verileri girip 'ANALİZ ET' butonuna basınız.", foreground="#95a5a6", wraplength=400, font=("Segoe UI", 14, "italic"))
         self.lbl_placeholder.pack(pady=50)
 
+        # Sonuç tabloları bir kez kurulur; her analizde yalnızca StringVar'lar güncellenir
+        self.sections_frame = ttk.Frame(self.results_content, style="Card.TFrame")
+        self.sections = {
+            "bmi": self.create_result_section(self.sections_frame, "Çocuk BMI Hesapla", "BMI", "BMI verisi bulunamadı.", with_status=True),
+            "kilo": self.create_result_section(self.sections_frame, "Çocuk Kilosu Hesapla", "Kilo", "Kilo verisi bulunamadı."),
+            "boy": self.create_result_section(self.sections_frame, "Çocuk Boyu Hesapla", "Boy", "Boy verisi bulunamadı."),
+            "kilo_boy": self.create_result_section(self.sections_frame, "Boya Göre Kilo (0-5 Yaş)", "Kilo", "Boy, boya göre kilo tablosunun aralığı dışında."),
+        }
 
-    def create_detail_table(self, parent, title, rows):
+
+    def create_detail_table(self, parent, title, labels):
+        """Build a result table once and return (frame, {label: StringVar})."""
         frame = ttk.LabelFrame(parent, text=title, padding="10")
-        frame.pack(fill="x", pady=10)
         
         # Header
         h_frame = ttk.Frame(frame)
@@ -293,24 +437,109 @@ class CocukGelisimApp:
         ttk.Label(h_frame, text="Tanım", font=("Segoe UI", 11, "bold"), width=20, background=Colors.BG_LIGHT).pack(side="left", padx=5)
         ttk.Label(h_frame, text="Sonuç", font=("Segoe UI", 11, "bold"), background=Colors.BG_LIGHT).pack(side="left", padx=5)
         
-        for k, v in rows:
+        values = {}
+        for k in labels:
             r_frame = ttk.Frame(frame)
             r_frame.pack(fill="x", pady=2)
             ttk.Label(r_frame, text=k, font=("Segoe UI", 12), width=20).pack(side="left", padx=5)
             
             # Use Entry for copyable text
-            val_entry = tk.Entry(r_frame, font=("Segoe UI", 12, "bold"), width=30, bd=0, relief="flat", bg=Colors.WHITE, fg=Colors.TEXT_DARK, readonlybackground=Colors.WHITE)
+            var = tk.StringVar()
+            val_entry = tk.Entry(r_frame, textvariable=var, font=("Segoe UI", 12, "bold"), width=30, bd=0, relief="flat", bg=Colors.WHITE, fg=Colors.TEXT_DARK, readonlybackground=Colors.WHITE, state="readonly")
             val_entry.pack(side="left", padx=5)
-            val_entry.insert(0, v)
-            val_entry.config(state="readonly")
+            values[k] = var
+        return frame, values
+
+    def create_result_section(self, parent, title, value_label, missing_text, with_status=False):
+        container = ttk.Frame(parent, style="Card.TFrame")
+        container.pack(fill="x")
+        table, values = self.create_detail_table(container, title, ("Yaş", value_label, "Z-Score", "Persentil"))
+        section = {
+            "container": container,
+            "table": table,
+            "values": values,
+            "value_label": value_label,
+            "missing": ttk.Label(container, text=missing_text, foreground="red"),
+            "status_var": None,
+            "status": None,
+        }
+        if with_status:
+            section["status_var"] = tk.StringVar()
+            section["status"] = ttk.Label(container, textvariable=section["status_var"], font=("Segoe UI", 10, "italic"), foreground="#7f8c8d")
+        return section
+
+    def update_section(self, section, data, yas_str, value_text):
+        if data:
+            values = section["values"]
+            values["Yaş"].set(yas_str)
+            values[section["value_label"]].set(value_text)
+            values["Z-Score"].set(f"{data['z']:.2f}")
+            values["Persentil"].set(f"% {data['p']:.2f}")
+            section["missing"].pack_forget()
+            section["table"].pack(fill="x", pady=10)
+            if section["status"] is not None:
+                section["status_var"].set(f"BMI Durumu: {data['yorum']}")
+                section["status"].pack(anchor="w", padx=10, after=section["table"])
+        else:
+            section["table"].pack_forget()
+            if section["status"] is not None:
+                section["status"].pack_forget()
+            section["missing"].pack(pady=10)
+
+    def clear_results(self):
+        self.sections_frame.pack_forget()
+        self.lbl_placeholder.pack(pady=50)
 
+    def set_busy(self, busy, total=None):
+        if busy:
+            if total:
+                self.progress.config(mode="determinate", maximum=total, value=0)
+            else:
+                self.progress.config(mode="indeterminate")
+                self.progress.start(15)
+            self.progress_label.config(text="")
+            self.busy_frame.pack(side="right")
+        else:
+            self.progress.stop()
+            self.busy_frame.pack_forget()
+
+    def update_progress(self, done, total):
+        if str(self.progress.cget("mode")) != "determinate":
+            self.progress.stop()
+            self.progress.config(mode="determinate", maximum=max(total, 1))
+        self.progress.config(value=done)
+        self.progress_label.config(text=f"{done}/{total}")
+
+    def cancel_task(self):
+        if self.current_task is not None:
+            self.current_task.cancel()
+            self.current_task = None
+        self.set_busy(False)
+
+    def start_task(self, func, *args, on_done, total=None):
+        """Run func(task, *args) off the Tk thread; only the latest task reports back."""
+        if self.current_task is not None:
+            self.current_task.cancel()
+        task = self.runner.submit(func, *args)
+
+        def finished(callback):
+            def handler(*payload):
+                if task is not self.current_task:
+                    return  # İptal edilmiş veya yerine yenisi başlatılmış iş
+                self.current_task = None
+                self.set_busy(False)
+                callback(*payload)
+            return handler
+
+        task.on_done = finished(on_done)
+        task.on_error = finished(lambda e: messagebox.showerror("Hata", f"Bir hata oluştu: {str(e)}"))
+        task.on_progress = self.update_progress
+        self.current_task = task
+        self.set_busy(True, total)
+        return task
 
     def hesapla(self):
         try:
-            # Temizle
-            for widget in self.results_content.winfo_children():
-                widget.destroy()
-
             # Verileri Al
             gun = int(self.gun_var.get())
             ay = int(self.ay_var.get())
@@ -323,60 +552,91 @@ class CocukGelisimApp:
             boy = self.boy_var.get()
             kilo = self.kilo_var.get()
             cinsiyet = self.cinsiyet_var.get()
-
-            results = AnalysisService.perform_analysis(gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet)
-            
-            if "error" in results:
-                 messagebox.showerror("Hata", f"Girdi Hatası: {results['error']}")
-                 return
-
-            if results.get("warning"):
-                 messagebox.showwarning("Uyarı", results["warning"])
-
-            yas_str = results["yas_str"]
-
-            # 1. BMI Alanı
-            if "bmi" in results and results["bmi"]:
-                bmi_data = results["bmi"]
-                self.create_detail_table(self.results_content, "Çocuk BMI Hesapla", [
-                    ("Yaş", yas_str),
-                    ("BMI", f"{bmi_data['val']:.2f}"),
-                    ("Z-Score", f"{bmi_data['z']:.2f}"),
-                    ("Persentil", f"% {bmi_data['p']:.2f}")
-                ])
-                ttk.Label(self.results_content, text=f"BMI Durumu: {bmi_data['yorum']}", font=("Segoe UI", 10, "italic"), foreground="#7f8c8d").pack(anchor="w", padx=10)
-            else:
-                ttk.Label(self.results_content, text="BMI verisi bulunamadı.", foreground="red").pack()
-
-            # 2. Kilo Alanı
-            if "kilo" in results and results["kilo"]:
-                kilo_data = results["kilo"]
-                self.create_detail_table(self.results_content, "Çocuk Kilosu Hesapla", [
-                     ("Yaş", yas_str),
-                     ("Kilo", f"{kilo_data['val']} kg"),
-                     ("Z-Score", f"{kilo_data['z']:.2f}"),
-                     ("Persentil", f"% {kilo_data['p']:.2f}")
-                ])
-            else:
-                 msg = "Kilo verisi bulunamadı."
-                 ttk.Label(self.results_content, text=msg, foreground="red").pack(pady=10)
-
-            # 3. Boy Alanı
-            if "boy" in results and results["boy"]:
-                boy_data = results["boy"]
-                self.create_detail_table(self.results_content, "Çocuk Boyu Hesapla", [
-                    ("Yaş", yas_str),
-                    ("Boy", f"{boy_data['val']} cm"),
-                    ("Z-Score", f"{boy_data['z']:.2f}"),
-                    ("Persentil", f"% {boy_data['p']:.2f}")
-                ])
-            else:
-                ttk.Label(self.results_content, text="Boy verisi bulunamadı.", foreground="red").pack()
-
         except ValueError as ve:
              messagebox.showerror("Hata", f"Girdi Hatası: {str(ve)}")
+             return
         except Exception as e:
             messagebox.showerror("Hata", f"Bir hata oluştu: {str(e)}")
+            return
+
+        args = (gun, ay, yil, k_gun, k_ay, k_yil, boy, kilo, cinsiyet)
+        self.start_task(perform_analysis, args, on_done=lambda results: self.show_results(results, cinsiyet))
+
+    def toplu_ice_aktar(self):
+        path = filedialog.askopenfilename(
+            title="Toplu analiz dosyası",
+            filetypes=[("CSV", "*.csv"), ("JSONL", "*.jsonl"), ("Tüm dosyalar", "*.*")])
+        if not path:
+            return
+        name = os.path.basename(path)
+        self.start_task(load_bulk, path,
+                        on_done=lambda results: BulkResultsWindow(self.root, results, name))
+
+    def show_results(self, results, cinsiyet=None):
+        if "error" in results:
+             self.clear_results()
+             messagebox.showerror("Hata", f"Girdi Hatası: {results['error']}")
+             return
+
+        if results.get("warning"):
+             messagebox.showwarning("Uyarı", results["warning"])
+
+        yas_str = results["yas_str"]
+        bmi_data = results.get("bmi")
+        kilo_data = results.get("kilo")
+        boy_data = results.get("boy")
+
+        # 1. BMI, 2. Kilo, 3. Boy
+        self.update_section(self.sections["bmi"], bmi_data, yas_str, f"{bmi_data['val']:.2f}" if bmi_data else "")
+        self.update_section(self.sections["kilo"], kilo_data, yas_str, f"{kilo_data['val']} kg" if kilo_data else "")
+        self.update_section(self.sections["boy"], boy_data, yas_str, f"{boy_data['val']} cm" if boy_data else "")
+        import lms_tables
+        # Boya göre kilo yalnızca 0-60 ay ve referans tablosu kuruluysa gösterilir;
+        # hata etiketi tablo varken boyun aralık dışı olduğu durumlar içindir
+        kilo_boy = self.sections["kilo_boy"]
+        if lms_tables.wfh_available(cinsiyet, results["yas_ay_total"]):
+            kilo_boy_data = results.get("kilo_boy")
+            self.update_section(kilo_boy, kilo_boy_data, yas_str, f"{kilo_boy_data['val']} kg" if kilo_boy_data else "")
+            kilo_boy["container"].pack(fill="x")
+        else:
+            kilo_boy["container"].pack_forget()
+
+        self.lbl_placeholder.pack_forget()
+        self.sections_frame.pack(fill="x")
+
+def measure_startup(root, app, output):
+    """
+    --startup-time [dosya]: time until the window is drawn and until the
+    reference data is loaded, written as JSON (stdout if no file), then exit.
+    Times are from the first line of main.py; wall-clock stamps let
+    benchmarks/bench_startup.py include interpreter / onefile unpack time.
+    """
+    marks = {}
+
+    def report():
+        result = {
+            "pencere_s": marks["pencere"] - _T0,
+            "veri_s": app.data_ready - _T0,
+            "pencere_wall": time.time() - (time.perf_counter() - marks["pencere"]),
+            "veri_wall": time.time() - (time.perf_counter() - app.data_ready),
+        }
+        text = json.dumps(result)
+        if output:
+            with open(output[0], "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text)
+        root.destroy()
+
+    def window_shown():
+        marks["pencere"] = time.perf_counter()
+        if app.data_ready is not None:
+            report()
+        else:
+            app.on_data_ready = report
+
+    root.after_idle(window_shown)
+
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -386,4 +646,7 @@ if __name__ == "__main__":
     except:
         pass
     app = CocukGelisimApp(root)
-    root.mainloop()
\ No newline at end of file
+    if "--startup-time" in sys.argv:
+        measure_startup(root, app, sys.argv[sys.argv.index("--startup-time") + 1:][:1])
+    root.mainloop()
+    app.runner.shutdown()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# Biyolojik olarak olanaksız değer (BIV) bayrakları
+# Tarama dosyalarındaki yazım hataları (1500 kg, boy alanına 10 cm gibi)
+# Z hesabından önce giriş değerleriyle, sonra WHO bayrak kurallarıyla
+# (|HAZ| > 6, WAZ < -6 veya > 5, |BMIZ| > 5, |WHZ| > 5) işaretlenir.
+# Her satır için sonuç bir bit maskesidir (0: sorun yok).
+#
+# Fonksiyonlar yalnızca karşılaştırma ve bit işlemleri kullanır; tek
+# değerlerle de NumPy dizileriyle de çalışır (NaN hiçbir kurala takılmaz).
+# Bayraklar satırı geçersiz kılmaz; Z değerleri hesaplanmaya devam eder.
+
+# Giriş kontrolleri (boy cm, kilo kg)
+FLAG_HEIGHT_RANGE = 1 << 0   # boy mutlak aralık dışında
+FLAG_WEIGHT_RANGE = 1 << 1   # kilo mutlak aralık dışında
+FLAG_SWAPPED = 1 << 2        # boy ve kilo alanları yer değiştirmiş görünüyor
+FLAG_HEIGHT_METRES = 1 << 3  # boy metre olarak girilmiş görünüyor
+FLAG_HEIGHT_MM = 1 << 4      # boy milimetre olarak girilmiş görünüyor
+FLAG_WEIGHT_GRAMS = 1 << 5   # kilo gram olarak girilmiş görünüyor
+# WHO Z-skor kuralları
+FLAG_HAZ = 1 << 6
+FLAG_WAZ = 1 << 7
+FLAG_BMIZ = 1 << 8
+FLAG_WHZ = 1 << 9
+
+INPUT_FLAGS = (FLAG_HEIGHT_RANGE | FLAG_WEIGHT_RANGE | FLAG_SWAPPED
+               | FLAG_HEIGHT_METRES | FLAG_HEIGHT_MM | FLAG_WEIGHT_GRAMS)
+ZSCORE_FLAGS = FLAG_HAZ | FLAG_WAZ | FLAG_BMIZ | FLAG_WHZ
+
+FLAG_LABELS = {
+    FLAG_HEIGHT_RANGE: "Boy aralık dışı",
+    FLAG_WEIGHT_RANGE: "Kilo aralık dışı",
+    FLAG_SWAPPED: "Boy/kilo yer değiştirmiş olabilir",
+    FLAG_HEIGHT_METRES: "Boy metre girilmiş olabilir",
+    FLAG_HEIGHT_MM: "Boy mm girilmiş olabilir",
+    FLAG_WEIGHT_GRAMS: "Kilo gram girilmiş olabilir",
+    FLAG_HAZ: "|Boy Z| > 6",
+    FLAG_WAZ: "Kilo Z < -6 veya > 5",
+    FLAG_BMIZ: "|BMI Z| > 5",
+    FLAG_WHZ: "|Kilo/Boy Z| > 5",
+}
+
+# 0-19 yaş için mutlak sınırlar
+BOY_MIN, BOY_MAX = 35.0, 230.0
+KILO_MIN, KILO_MAX = 0.5, 250.0
+
+HAZ_LIMIT = 6.0
+WAZ_LOW, WAZ_HIGH = -6.0, 5.0
+BMIZ_LIMIT = 5.0
+WHZ_LIMIT = 5.0
+
+
+def _between(x, low, high):
+    return (x >= low) & (x <= high)
+
+
+def _outside(x, low, high):
+    return (x < low) | (x > high)
+
+
+def input_flags(boy, kilo):
+    """Flags from the raw height (cm) and weight (kg), before Z computation."""
+    boy_out = _outside(boy, BOY_MIN, BOY_MAX)
+    kilo_out = _outside(kilo, KILO_MIN, KILO_MAX)
+    flags = FLAG_HEIGHT_RANGE * boy_out
+    flags = flags | FLAG_WEIGHT_RANGE * kilo_out
+    # Çocuklarda kg cinsinden kilo her zaman cm cinsinden boydan küçüktür
+    flags = flags | FLAG_SWAPPED * ((kilo > boy) & _between(kilo, BOY_MIN, BOY_MAX)
+                                    & _between(boy, KILO_MIN, KILO_MAX))
+    flags = flags | FLAG_HEIGHT_METRES * (boy_out & _between(boy * 100, BOY_MIN, BOY_MAX))
+    flags = flags | FLAG_HEIGHT_MM * (boy_out & _between(boy / 10, BOY_MIN, BOY_MAX))
+    flags = flags | FLAG_WEIGHT_GRAMS * (kilo_out & _between(kilo / 1000, KILO_MIN, KILO_MAX))
+    return flags
+
+
+def zscore_flags(boy_z, kilo_z, bmi_z, kilo_boy_z=None):
+    """WHO implausible Z-score flags; NaN (not computed) never flags."""
+    flags = FLAG_HAZ * (abs(boy_z) > HAZ_LIMIT)
+    flags = flags | FLAG_WAZ * _outside(kilo_z, WAZ_LOW, WAZ_HIGH)
+    flags = flags | FLAG_BMIZ * (abs(bmi_z) > BMIZ_LIMIT)
+    if kilo_boy_z is not None:
+        flags = flags | FLAG_WHZ * (abs(kilo_boy_z) > WHZ_LIMIT)
+    return flags
+
+
+def describe(flags):
+    """Labels of the bits set in one flag mask."""
+    flags = int(flags)
+    return [label for bit, label in FLAG_LABELS.items() if flags & bit]
@@ -0,0 +1,155 @@
+# Kalıcı (disk üzerinde) analiz sonucu önbelleği
+# Her ay yeniden çalıştırılan dışa aktarma dosyalarının büyük kısmı
+# değişmez. Sonuçlar, normalleştirilmiş girdinin (yaş günü, boy, kilo,
+# cinsiyet) özetiyle anahtarlanarak SQLite'ta saklanır; yeniden çalıştırmada
+# yalnızca yeni veya değişen satırlar AnalysisService'ten geçer.
+#
+# Referans verisi sürümü (LMS dosyaları, growth_data modülleri,
+# interpolasyon modu, çıktı alanları) önbellekte kayıtlıdır; değiştiğinde
+# önbellek açılışta otomatik olarak boşaltılır. Kayıt sayısı max_entries
+# ile sınırlıdır; kapanışta en uzun süredir kullanılmayan kayıtlar silinir.
+#
+# Her açılış bir "kuşak"tır. İsabet alan kaydın kullanım kuşağı her
+# çalıştırmada değil, REFRESH_GENERATIONS kuşaktan eskiyse güncellenir;
+# böylece neredeyse tamamı isabet olan gece çalıştırmaları her satır için
+# bir yazma yapmaz (çıkarma sırası yaklaşık LRU'dur). Değerler marshal ile
+# saklanır (JSON'dan çok daha hızlı okunur).
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sqlite3
+import lms_store
+import lms_tables
+
+CACHE_FORMAT = 2
+DEFAULT_MAX_ENTRIES = 2_000_000
+REFRESH_GENERATIONS = 8
+SQL_BATCH = 500  # tek sorgudaki en fazla parametre
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_used ON results(used);
+"""
+
+
+def row_key(yas_gun, boy, kilo, cinsiyet):
+    """16-byte digest of one normalized analysis input."""
+    text = f"{int(yas_gun)}|{float(boy)!r}|{float(kilo)!r}|{cinsiyet}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _module_file(name):
+    spec = importlib.util.find_spec(name)
+    return spec.origin if spec is not None else None
+
+
+def reference_version(extra=""):
+    """
+    Digest of everything analysis results depend on: the packed LMS files,
+    the growth_data sources, the interpolation / daily table settings and
+    `extra` (e.g. the output field list).
+    """
+    h = hashlib.sha256(f"{CACHE_FORMAT}|{extra}|{lms_tables.get_interpolation()}|"
+                       f"{lms_tables.daily_enabled()}".encode("utf-8"))
+    paths = [lms_store.DEFAULT_PATH, lms_tables.wfh_path(),
+             _module_file("growth_data"), _module_file("growth_data_extended")]
+    if lms_tables.daily_enabled():
+        paths.append(lms_tables.daily_path())
+    for path in paths:
+        if path and os.path.isfile(path):
+            h.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, version=None):
+        if max_entries <= 0:
+            raise ValueError("max_entries pozitif olmalı.")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = False
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        version = version or reference_version()
+        meta = dict(self.conn.execute("SELECT name, value FROM meta"))
+        with self.conn:
+            if meta.get("version") != version:
+                # Referans verisi değişti: eski sonuçlar geçersiz
+                self.invalidated = "version" in meta
+                self.conn.execute("DELETE FROM results")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+            # Her açılış yeni bir kullanım kuşağıdır (LRU çıkarma sırası)
+            self.generation = int(meta.get("generation", 0)) + 1
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(self.generation),))
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get_many(self, keys):
+        """{key: value} for the keys present; marks stale ones as used."""
+        found = {}
+        stale = []
+        keys = list(keys)
+        refresh_below = self.generation - REFRESH_GENERATIONS
+        for start in range(0, len(keys), SQL_BATCH):
+            part = keys[start:start + SQL_BATCH]
+            cur = self.conn.execute(
+                f"SELECT key, value, used FROM results WHERE key IN ({','.join('?' * len(part))})", part)
+            for key, value, used in cur:
+                found[key] = marshal.loads(value)
+                if used <= refresh_below:
+                    stale.append(key)
+        if stale:
+            with self.conn:
+                self.conn.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                      ((self.generation, key) for key in stale))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, value) pairs; values are marshal-able (tuples, numbers, str)."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value, used) VALUES (?, ?, ?)",
+                ((key, marshal.dumps(value), self.generation) for key, value in items))
+
+    def evict(self):
+        """Drop least recently used entries beyond max_entries; returns the count."""
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used LIMIT ?)", (excess,))
+        self.evictions += excess
+        return excess
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM results")
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self), "max_entries": self.max_entries}
+
+    def close(self):
+        self.evict()
+        self.conn.close()
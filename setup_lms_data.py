@@ -1,7 +1,24 @@
+# WHO LMS referans verisi oluşturucu
+# Altı WHO CSV dosyasını paralel indirir, yerel önbellekte (sha256
+# sağlamalı) tutar ve growth_data.py ile paketlenmiş lms_data.bin dosyasını
+# üretir. Önbellekteki dosyalar geçerliyse ağa çıkılmaz; kaynak olarak
+# yerel bir dizin veya ayna adres de verilebilir (ağsız kurulumlar için).
+#
+# Kullanım:
+#   python setup_lms_data.py                       # varsayılan kaynak + önbellek
+#   python setup_lms_data.py --source /mnt/who     # yerel dizinden
+#   python setup_lms_data.py --offline             # yalnızca önbellekten
+#   python setup_lms_data.py --daily               # + 0-5 yaş günlük tablolar
+#   python setup_lms_data.py --wfh --wfh-source /mnt/who_wfh   # + boya göre kilo
+
+import argparse
+import hashlib
+import json
+import os
+import sys
 import urllib.request
-import csv
-import io
-import math
+from concurrent.futures import ThreadPoolExecutor
+import lms_store
 
 base_url = "https://raw.githubusercontent.com/MalgorzataOles/GrowthCharts/master/data/"
 files = {
@@ -13,19 +30,34 @@ files = {
     "WHO.Female.Weight.csv": ("kiz", "kilo"),
 }
 
-GROWTH_LMS_DATA = {
-    'erkek': {'bmi': {}, 'boy': {}, 'kilo': {}},
-    'kiz': {'bmi': {}, 'boy': {}, 'kilo': {}}
+# Boya göre ağırlık (0-5 yaş): WHO genişletilmiş tabloları, 0.1 cm adımlı
+# (Length/Height, L, M, S, ... sütunları; sekme ile ayrılmış)
+wfh_base_url = "https://www.who.int/childgrowth/standards/"
+wfh_files = {
+    "wfl_boys_z_exp.txt": (lms_store.SOURCE_WFL, "erkek"),
+    "wfl_girls_z_exp.txt": (lms_store.SOURCE_WFL, "kiz"),
+    "wfh_boys_z_exp.txt": (lms_store.SOURCE_WFH, "erkek"),
+    "wfh_girls_z_exp.txt": (lms_store.SOURCE_WFH, "kiz"),
 }
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".lms_cache")
+MANIFEST_NAME = "manifest.json"
+
+# Günlük çözünürlük: WHO 0-5 yaş standartları gün bazında yayımlanır
+DAYS_PER_MONTH = 30.4375
+DAILY_MAX_DAYS = 1856
+
+
 def parse_row(row, type_name):
     # Detect delimiter
     parts = row.split(';')
     if len(parts) < 4:
         parts = row.split(',')
-        
+    if len(parts) < 4:
+        parts = row.split()  # WHO .txt tabloları sekme ile ayrılmıştır
+
     if len(parts) < 4: return None, None, None, None # Header or invalid
-    
+
     try:
         # Age column is usually index 0
         age_val = float(parts[0])
@@ -36,42 +68,261 @@ def parse_row(row, type_name):
     except ValueError:
         return None, None, None, None
 
-def process_file(filename, gender, metric):
-    url = base_url + filename
-    print(f"Downloading {filename}...")
-    try:
-        with urllib.request.urlopen(url) as response:
-            data = response.read().decode('utf-8')
-            
-        lines = data.strip().split('\n')
-        
-        # WHO Data Handling:
-        # The 'Age' column in these specific CSV files (from MalgorzataOles repo) 
-        # is consistently in MONTHS (e.g. 0.0328 months ~ 1 day, 12.0 ~ 1 year).
-        # We store them indexed by the nearest integer month.
-        
-        for line in lines[1:]: # Skip header
-            age, l, m, s = parse_row(line, metric)
-            if age is None: continue
-            
-            # Round age to nearest month index
-            month_idx = int(round(age))
-            
-            # Store (overwrite is fine as we want the latest/most precise for that month point if multiple exist)
-            GROWTH_LMS_DATA[gender][metric][month_idx] = (l, m, s)
-                    
-    except Exception as e:
-        print(f"Failed to process {filename}: {e}")
-
-print("Starting Data Fetch...")
-for fname, (gender, metric) in files.items():
-    process_file(fname, gender, metric)
-
-print("Writing growth_data.py...")
-with open("growth_data.py", "w", encoding="utf-8") as f:
-    f.write("# WHO Child Growth Standards & Reference 2007 (LMS Data)\n")
-    f.write("# Generated automatically on user request\n")
-    f.write("# Structure: month_index: (L, M, S)\n\n")
-    f.write("LMS_DATA = " + str(GROWTH_LMS_DATA))
-
-print("Done! growth_data.py created.")
+
+def process_text(data, metric):
+    """Parse one CSV into {month_index: (L, M, S)}."""
+    # WHO Data Handling:
+    # The 'Age' column in these specific CSV files (from MalgorzataOles repo)
+    # is consistently in MONTHS (e.g. 0.0328 months ~ 1 day, 12.0 ~ 1 year).
+    # We store them indexed by the nearest integer month.
+    table = {}
+    for line in data.strip().split('\n')[1:]: # Skip header
+        age, l, m, s = parse_row(line.strip(), metric)
+        if age is None: continue
+
+        # Round age to nearest month index
+        month_idx = int(round(age))
+
+        # Store (overwrite is fine as we want the latest/most precise for that month point if multiple exist)
+        table[month_idx] = (l, m, s)
+    return table
+
+
+def process_text_daily(data, metric, max_days=DAILY_MAX_DAYS):
+    """Parse one CSV into a dense {day: (L, M, S)} table for days 0..last.
+
+    Ages are kept at full resolution (no month rounding); days without a
+    source point are filled by linear interpolation at build time so the
+    table can be indexed directly by age in days.
+    """
+    points = {}
+    for line in data.strip().split('\n')[1:]:
+        age, l, m, s = parse_row(line.strip(), metric)
+        if age is None: continue
+        day = int(round(age * DAYS_PER_MONTH))
+        if 0 <= day <= max_days:
+            points[day] = (l, m, s)
+    return densify(points)
+
+
+def densify(points, fill_from=0):
+    days = sorted(points)
+    if not days:
+        return {}
+    table = {}
+    for d1, d2 in zip(days, days[1:]):
+        v1, v2 = points[d1], points[d2]
+        for day in range(d1, d2):
+            ratio = (day - d1) / (d2 - d1)
+            table[day] = tuple(a + (b - a) * ratio for a, b in zip(v1, v2))
+    table[days[-1]] = points[days[-1]]
+    # İlk noktadan önceki günler ilk değere sabitlenir
+    if fill_from is not None:
+        for day in range(fill_from, days[0]):
+            table[day] = points[days[0]]
+    return table
+
+
+def process_text_wfh(data):
+    """Parse a WHO weight-for-length/height table into {length_mm: (L, M, S)}.
+
+    Keys are lengths in 0.1 cm units so the table forms a regular integer
+    grid that lms_tables indexes directly; gaps are interpolated.
+    """
+    points = {}
+    for line in data.strip().split('\n')[1:]:
+        length, l, m, s = parse_row(line.strip(), 'kilo')
+        if length is None: continue
+        points[int(round(length * 10))] = (l, m, s)
+    return densify(points, fill_from=None)
+
+
+class SourceCache:
+    """On-disk cache of downloaded CSVs with a sha256 manifest."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def get(self, filename):
+        """Return cached bytes if present and the checksum matches, else None."""
+        entry = self.manifest.get(filename)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, filename), "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(raw).hexdigest() != entry["sha256"]:
+            return None
+        return raw
+
+    def put(self, filename, raw, origin):
+        with open(os.path.join(self.cache_dir, filename), "wb") as f:
+            f.write(raw)
+        self.manifest[filename] = {
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "size": len(raw),
+            "source": origin,
+        }
+
+    def save(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+
+def fetch(filename, source, cache, refresh=False, offline=False):
+    """Return (raw bytes, origin) for one CSV from a local dir, cache or URL."""
+    if os.path.isdir(source):
+        with open(os.path.join(source, filename), "rb") as f:
+            return f.read(), "local"
+    if cache is not None and not refresh:
+        raw = cache.get(filename)
+        if raw is not None:
+            return raw, "cache"
+    if offline:
+        raise FileNotFoundError(f"{filename} önbellekte yok (--offline)")
+    url = source.rstrip("/") + "/" + filename
+    with urllib.request.urlopen(url, timeout=60) as response:
+        raw = response.read()
+    if cache is not None:
+        cache.put(filename, raw, url)
+    return raw, "download"
+
+
+def fetch_all(source, cache, workers=6, refresh=False, offline=False, names=None):
+    """Fetch every CSV (or the given names) concurrently; returns {filename: (raw, origin)}."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            fname: executor.submit(fetch, fname, source, cache, refresh, offline)
+            for fname in (names or files)
+        }
+        results = {}
+        errors = {}
+        for fname, future in futures.items():
+            try:
+                results[fname] = future.result()
+            except Exception as e:
+                errors[fname] = e
+    if cache is not None:
+        cache.save()
+    return results, errors
+
+
+def build_tables(raw_files):
+    growth_lms_data = {
+        'erkek': {'bmi': {}, 'boy': {}, 'kilo': {}},
+        'kiz': {'bmi': {}, 'boy': {}, 'kilo': {}}
+    }
+    for fname, raw in raw_files.items():
+        gender, metric = files[fname]
+        growth_lms_data[gender][metric] = process_text(raw.decode('utf-8'), metric)
+    return growth_lms_data
+
+
+def write_module(path, growth_lms_data):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# WHO Child Growth Standards & Reference 2007 (LMS Data)\n")
+        f.write("# Generated automatically on user request\n")
+        f.write("# Structure: month_index: (L, M, S)\n\n")
+        f.write("LMS_DATA = " + str(growth_lms_data))
+
+
+def write_binary(path, growth_lms_data):
+    """Write lms_data.bin: the fetched WHO tables plus the extended weight data."""
+    import growth_data_extended
+    tables = {}
+    for gender, metrics in growth_lms_data.items():
+        for metric, data in metrics.items():
+            tables[(lms_store.SOURCE_WHO, gender, metric)] = data
+    for gender, metrics in growth_data_extended.LMS_DATA_EXTENDED.items():
+        for metric, data in metrics.items():
+            tables[(lms_store.SOURCE_EXTENDED, gender, metric)] = data
+    lms_store.write_store(path, tables)
+
+
+def write_daily_binary(path, raw_files):
+    tables = {}
+    for fname, raw in raw_files.items():
+        gender, metric = files[fname]
+        tables[(lms_store.SOURCE_DAILY, gender, metric)] = process_text_daily(raw.decode('utf-8'), metric)
+    lms_store.write_store(path, tables)
+
+
+def write_wfh_binary(path, raw_files):
+    tables = {}
+    for fname, raw in raw_files.items():
+        source, gender = wfh_files[fname]
+        tables[(source, gender, 'kilo')] = process_text_wfh(raw.decode('utf-8'))
+    lms_store.write_store(path, tables)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="WHO LMS referans verisi oluşturucu")
+    parser.add_argument("--source", default=base_url, help="Kaynak adres veya yerel dizin")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="İndirme önbelleği dizini")
+    parser.add_argument("--no-cache", action="store_true", help="Önbelleği kullanma")
+    parser.add_argument("--refresh", action="store_true", help="Önbellekteki dosyaları yeniden indir")
+    parser.add_argument("--offline", action="store_true", help="Ağa çıkma, yalnızca önbelleği kullan")
+    parser.add_argument("--workers", type=int, default=len(files), help="Paralel indirme sayısı")
+    parser.add_argument("--output-py", default="growth_data.py", help="Python modülü çıktısı ('' ile kapatılır)")
+    parser.add_argument("--output-bin", default=lms_store.DEFAULT_PATH, help="İkili tablo çıktısı ('' ile kapatılır)")
+    parser.add_argument("--daily", action="store_true", help="0-5 yaş günlük çözünürlüklü tabloları da üret")
+    parser.add_argument("--output-daily", default=lms_store.DAILY_PATH, help="Günlük tablo çıktısı")
+    parser.add_argument("--wfh", action="store_true", help="0-5 yaş boya göre kilo tablolarını da üret")
+    parser.add_argument("--wfh-source", default=wfh_base_url, help="Boya göre kilo tabloları için adres veya yerel dizin")
+    parser.add_argument("--output-wfh", default=lms_store.WFH_PATH, help="Boya göre kilo tablo çıktısı")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cache = None if args.no_cache else SourceCache(args.cache_dir)
+
+    print("Starting Data Fetch...")
+    results, errors = fetch_all(args.source, cache, args.workers, args.refresh, args.offline)
+    for fname, (raw, origin) in results.items():
+        print(f"{fname}: {origin} ({len(raw)} bytes)")
+    if args.wfh:
+        wfh_results, wfh_errors = fetch_all(args.wfh_source, cache, args.workers, args.refresh,
+                                            args.offline, names=wfh_files)
+        for fname, (raw, origin) in wfh_results.items():
+            print(f"{fname}: {origin} ({len(raw)} bytes)")
+        errors.update(wfh_errors)
+    if errors:
+        # Eksik tabloyla yazmak mevcut veriyi bozar; hiçbir çıktıya dokunma
+        for fname, e in errors.items():
+            print(f"Failed to process {fname}: {e}", file=sys.stderr)
+        return 1
+
+    raw_files = {fname: raw for fname, (raw, origin) in results.items()}
+    growth_lms_data = build_tables(raw_files)
+
+    if args.output_py:
+        print(f"Writing {args.output_py}...")
+        write_module(args.output_py, growth_lms_data)
+    if args.output_bin:
+        print(f"Writing {args.output_bin}...")
+        write_binary(args.output_bin, growth_lms_data)
+    if args.daily:
+        print(f"Writing {args.output_daily}...")
+        write_daily_binary(args.output_daily, raw_files)
+    if args.wfh:
+        print(f"Writing {args.output_wfh}...")
+        write_wfh_binary(args.output_wfh, {fname: raw for fname, (raw, origin) in wfh_results.items()})
+
+    print("Done!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ import os
 # Ana dizindeki modülleri bulabilmek için sys.path ayarı
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from analysis_service import AnalysisService
+from analysis_result import BMI_CATEGORIES
 
 class TestAnalysisService(unittest.TestCase):
     def test_format_yas(self):
@@ -16,6 +17,12 @@ class TestAnalysisService(unittest.TestCase):
         self.assertAlmostEqual(z, 0)
         self.assertAlmostEqual(p, 50)
 
+    def test_calculate_value_inverse(self):
+        for l in (1, 0, -0.5):
+            x = AnalysisService.calculate_value(1.88, l, 100, 0.1)
+            z, p = AnalysisService.calculate_lms(x, l, 100, 0.1)
+            self.assertAlmostEqual(z, 1.88)
+
     def test_perform_analysis_valid(self):
         # Random valid input
         # Boy: 100cm, Kilo: 15kg, 3 Years old roughly
@@ -30,6 +37,27 @@ class TestAnalysisService(unittest.TestCase):
         self.assertIn("bmi", res)
         self.assertEqual(res["yas_str"], "3 Yıl 0 Ay")
 
+    def test_perform_analysis_days(self):
+        by_date = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        by_days = AnalysisService.perform_analysis_days(1096, 100, 15, 'erkek')
+        self.assertEqual(by_days, by_date)
+        self.assertIsNone(AnalysisService.perform_analysis_days(6939, 170, 60, 'kiz')["warning"])
+        self.assertIsNotNone(AnalysisService.perform_analysis_days(6940, 170, 60, 'kiz')["warning"])
+        self.assertIn("error", AnalysisService.perform_analysis_days(-1, 100, 15, 'erkek'))
+
+    def test_analyze_result_object(self):
+        res = AnalysisService.analyze(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        self.assertIsNone(res.error)
+        self.assertEqual(res.yas_gun, 1096)
+        self.assertEqual(res.yas_str, "3 Yıl 0 Ay")
+        self.assertEqual(res.boy.val, 100)
+        self.assertEqual(res.bmi_yorum, BMI_CATEGORIES[res.bmi_kategori])
+        self.assertEqual(res.to_dict(), AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek'))
+        self.assertFalse(hasattr(res, "__dict__"))
+        with self.assertRaises(AttributeError):
+            res.yas_gun = 5
+        self.assertEqual(AnalysisService.analyze(1, 1, 2020, 1, 1, 2023, 0, 15, 'erkek').to_dict(), {"error": "Boy ve kilo pozitif olmalı."})
+
     def test_perform_analysis_invalid_date(self):
         res = AnalysisService.perform_analysis(
             gun=1, ay=1, yil=2023, 
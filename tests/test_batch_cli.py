@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import io
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import batch_cli
+
+CSV_INPUT = (
+    "id;dogum_tarihi;kontrol_tarihi;boy;kilo;cinsiyet\n"
+    "1;2020-01-01;2023-01-01;100;15;erkek\n"
+    "2;01/01/2020;01/01/2023;100,5;15;kiz\n"
+    "3;2023-01-01;2020-01-01;100;15;erkek\n"
+    "4;2020-01-01;2023-01-01;100;15;?\n"
+)
+
+class TestBatchCli(unittest.TestCase):
+    def test_parse_date_formats(self):
+        self.assertEqual(batch_cli.parse_date("2020-03-04"), (4, 3, 2020))
+        self.assertEqual(batch_cli.parse_date("04.03.2020"), (4, 3, 2020))
+        with self.assertRaises(ValueError):
+            batch_cli.parse_date("2020-02-30")
+
+    def test_stream_with_rejects(self):
+        out, rejects = io.StringIO(), io.StringIO()
+        results = batch_cli.analyze_records(batch_cli.read_records(io.StringIO(CSV_INPUT), "csv"))
+        ok, rejected = batch_cli.run(results, batch_cli.ResultWriter(out, "jsonl"), rejects)
+        self.assertEqual((ok, rejected), (2, 2))
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["id"] for r in rows], ["1", "2"])
+        self.assertEqual(rows[0]["yas_str"], "3 Yıl 0 Ay")
+        bad = [json.loads(line) for line in rejects.getvalue().splitlines()]
+        self.assertEqual([b["satir"] for b in bad], [3, 4])
+
+    def test_jsonl_input_bad_json(self):
+        text = '{"dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01", "boy": 100, "kilo": 15, "cinsiyet": "erkek"}\n{bozuk\n'
+        rows = list(batch_cli.analyze_records(batch_cli.read_records(io.StringIO(text), "jsonl")))
+        self.assertIsNone(rows[0][3])
+        self.assertIn("JSON", rows[1][3])
+
+    def test_jsonl_non_object_rows_rejected(self):
+        text = '42\nnull\n[1, 2]\n'
+        out, rejects = io.StringIO(), io.StringIO()
+        results = batch_cli.analyze_records(batch_cli.read_records(io.StringIO(text), "jsonl"))
+        ok, rejected = batch_cli.run(results, batch_cli.ResultWriter(out, "jsonl"), rejects)
+        self.assertEqual((ok, rejected), (0, 3))
+        for line in rejects.getvalue().splitlines():
+            self.assertEqual(json.loads(line)["hata"], batch_cli.NOT_OBJECT)
+
+    def test_non_finite_measurements_rejected(self):
+        for boy, kilo in (("nan", "15"), ("100", "inf"), ("-Infinity", "15")):
+            record = {"dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01",
+                      "boy": boy, "kilo": kilo, "cinsiyet": "erkek"}
+            row, error = batch_cli.analyze_record(record)
+            self.assertIsNone(row)
+            self.assertIn("Geçersiz sayı", error)
+    def test_parallel_preserves_order(self):
+        lines = ["id,dogum_tarihi,kontrol_tarihi,boy,kilo,cinsiyet"]
+        for i in range(50):
+            lines.append(f"{i},2020-01-01,2023-01-01,{90 + i % 20},{12 + i % 7},{'erkek' if i % 2 else 'kiz'}")
+        lines.append("50,2020-01-01,2023-01-01,-5,15,kiz")
+        text = "\n".join(lines) + "\n"
+        serial = list(batch_cli.analyze_records(batch_cli.read_records(io.StringIO(text), "csv")))
+        parallel = list(batch_cli.analyze_records_parallel(
+            batch_cli.read_records(io.StringIO(text), "csv"), workers=2, chunk_size=7))
+        self.assertEqual(serial, parallel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis_service import AnalysisService
+import lms_store
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService, BMI_CATEGORIES, date_ordinals
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "numpy gerekli")
+class TestBatchAnalysisService(unittest.TestCase):
+    def test_matches_scalar_analysis(self):
+        ages = [0, 5.5, 36.2, 119.9, 120.5, 150, 228]
+        genders = ['erkek', 'kiz', 'erkek', 'kiz', 'erkek', 'kiz', 'erkek']
+        boy = [50, 65, 100, 135, 140, 155, 175]
+        kilo = [3.4, 7, 15, 30, 33, 45, 65]
+        res = BatchAnalysisService.analyze(ages, genders, boy, kilo)
+        for i, age in enumerate(ages):
+            for metric, value in (('boy', boy[i]), ('kilo', kilo[i])):
+                z, p = AnalysisService.calculate_lms(value, *AnalysisService.get_lms_params(genders[i], metric, age))
+                self.assertAlmostEqual(res[metric + "_z"][i], z, places=9)
+                self.assertAlmostEqual(res[metric + "_p"][i], p, places=4)
+            bmi = kilo[i] / ((boy[i] / 100) ** 2)
+            z, p = AnalysisService.calculate_lms(bmi, *AnalysisService.get_lms_params(genders[i], 'bmi', age))
+            self.assertAlmostEqual(res["bmi_z"][i], z, places=9)
+
+    def test_cubic_matches_scalar(self):
+        ages = np.array([0, 0.3, 36.7, 119.9, 120.5, 150.25, 228, 300])
+        AnalysisService.set_interpolation('cubic')
+        try:
+            l, m, s = BatchAnalysisService.get_lms_params(['kiz'] * len(ages), 'kilo', ages)
+            for i, age in enumerate(ages):
+                expected = AnalysisService.get_lms_params('kiz', 'kilo', float(age))
+                for a, b in zip((l[i], m[i], s[i]), expected):
+                    self.assertAlmostEqual(a, b, places=12)
+        finally:
+            AnalysisService.set_interpolation('linear')
+
+    def test_l_zero_branch(self):
+        z, p = BatchAnalysisService.calculate_lms(np.array([100.0]), np.array([0.0]), np.array([100.0]), np.array([0.1]))
+        self.assertAlmostEqual(z[0], 0)
+        self.assertAlmostEqual(p[0], 50)
+
+    def test_invalid_rows_and_categories(self):
+        res = BatchAnalysisService.analyze([36, 36, 36], ['erkek', 'x', 'kiz'], [100, 100, -1], [15, 15, 15])
+        self.assertEqual(res["gecerli"].tolist(), [True, False, False])
+        self.assertTrue(np.isnan(res["boy_z"][1]))
+        self.assertEqual(res["bmi_kategori"][1], -1)
+        single = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        self.assertEqual(BMI_CATEGORIES[res["bmi_kategori"][0]], single["bmi"]["yorum"])
+    def test_date_ordinals(self):
+        ordinals, valid = date_ordinals(["2020-02-29", "29.02.2021", "01/03/2021", "2021-13-01", "abc", "2020-1-1"])
+        self.assertEqual(valid.tolist(), [True, False, True, False, False, False])
+        self.assertEqual(ordinals[0], date(2020, 2, 29).toordinal())
+        self.assertEqual(ordinals[2], date(2021, 3, 1).toordinal())
+        days = np.array(["2019-06-15", "1999-12-31"], dtype="datetime64[D]")
+        self.assertEqual(date_ordinals(days)[0].tolist(), [date(2019, 6, 15).toordinal(), date(1999, 12, 31).toordinal()])
+
+    def test_analyze_dates_matches_scalar(self):
+        dogum = ["2020-01-01", "2004-03-10", "2020-05-05", "2021-02-30"]
+        kontrol = ["2023-01-01", "2023-03-11", "2020-01-01", "2022-01-01"]
+        res = BatchAnalysisService.analyze_dates(dogum, kontrol, ['erkek', 'kiz', 'erkek', 'kiz'], [100, 160, 60, 80], [15, 55, 6, 10])
+        self.assertEqual(res["tarih_gecerli"].tolist(), [True, True, False, False])
+        self.assertEqual(res["gecerli"].tolist(), [True, True, False, False])
+        self.assertEqual(res["uyari"].tolist()[:2], [False, True])
+        single = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        self.assertAlmostEqual(res["yas_ay_total"][0], single["yas_ay_total"])
+        self.assertAlmostEqual(res["bmi_z"][0], single["bmi"]["z"], places=9)
+
+    def test_daily_tables_match_scalar(self):
+        days = {d: (1.0, 50.0 + d, 0.04) for d in range(0, 200)}
+        bmi = {d: (-1.5, 15.0 + d / 100, 0.08) for d in range(0, 200)}
+        ages = [0, 120, 199, 200, 500, 10]
+        genders = ['kiz', 'kiz', 'kiz', 'kiz', 'kiz', 'erkek']
+        boy = [50, 170, 100, 70, 75, 55]
+        kilo = [3.2, 6, 7, 8, 9, 4]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'daily.bin')
+            lms_store.write_store(path, {('day', 'kiz', 'boy'): days, ('day', 'kiz', 'bmi'): bmi})
+            AnalysisService.enable_daily_tables(path)
+            try:
+                res = BatchAnalysisService.analyze_days(ages, genders, boy, kilo)
+                self.assertAlmostEqual(res["boy_z"][1], 0)
+                for i, age in enumerate(ages):
+                    kontrol = date(2020, 1, 1) + timedelta(days=age)
+                    single = AnalysisService.perform_analysis(
+                        1, 1, 2020, kontrol.day, kontrol.month, kontrol.year, boy[i], kilo[i], genders[i])
+                    for metric in ('boy', 'kilo', 'bmi'):
+                        self.assertAlmostEqual(res[metric + "_z"][i], single[metric]["z"], places=9)
+            finally:
+                AnalysisService.disable_daily_tables()
+        # Kapatılınca aylık tablolara dönülür
+        monthly = BatchAnalysisService.analyze_days([120], ['kiz'], [170], [6])
+        self.assertGreater(monthly["boy_z"][0], 5)
+
+    def test_batch_result_columns(self):
+        res = BatchAnalysisService.analyze_days([1096, 1096], ['erkek', 'x'], [100, 100], [15, 15])
+        self.assertEqual(len(res), 2)
+        self.assertIn("uyari", res)
+        self.assertNotIn("tarih_gecerli", res)
+        self.assertEqual(set(res.to_dict()), set(res.keys()))
+        self.assertIs(res["boy_z"], res.boy_z)
+        single = AnalysisService.perform_analysis_days(1096, 100, 15, 'erkek')
+        self.assertEqual(res.yas_str(0), single["yas_str"])
+        self.assertEqual(res.bmi_yorum(0), single["bmi"]["yorum"])
+        self.assertEqual(res.bmi_yorum(1), "")
+        with self.assertRaises(KeyError):
+            res["yok"]
+
+    def test_centile_curves(self):
+        curves = BatchAnalysisService.centile_curves('erkek', 'kilo')
+        self.assertEqual(len(curves["months"]), 229)
+        self.assertIs(curves, BatchAnalysisService.centile_curves('erkek', 'kilo'))
+        self.assertTrue((curves[3] < curves[50]).all() and (curves[50] < curves[97]).all())
+        self.assertFalse(curves[50].flags.writeable)
+        for month in (12, 150):
+            lms = AnalysisService.get_lms_params('erkek', 'kilo', month)
+            self.assertAlmostEqual(curves[50][month], lms[1])
+            z, p = AnalysisService.calculate_lms(curves[97][month], *lms)
+            self.assertAlmostEqual(p, 97, places=6)
+
+    def test_sd_curves(self):
+        curves = BatchAnalysisService.sd_curves('kiz', 'bmi', months=(0, 24))
+        lms = AnalysisService.get_lms_params('kiz', 'bmi', 6)
+        self.assertAlmostEqual(curves[2][6], AnalysisService.calculate_value(2, *lms))
+        with self.assertRaises(KeyError):
+            BatchAnalysisService.sd_curves('x', 'bmi')
+
+if __name__ == '__main__':
+    unittest.main()
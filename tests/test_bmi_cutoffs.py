@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis_service import AnalysisService
+import bmi_cutoffs
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+except ImportError:
+    np = None
+
+class TestBmiCutoffs(unittest.TestCase):
+    def test_cutoff_z_constants(self):
+        from statistics import NormalDist
+        for z, centile in zip(bmi_cutoffs.CUTOFF_Z, bmi_cutoffs.CUTOFF_CENTILES):
+            self.assertAlmostEqual(z, NormalDist().inv_cdf(centile / 100), places=12)
+
+    def test_cutoffs_invert_lms(self):
+        # Tablo anahtarlarında tam, aralarda interpolasyon farkı kadar yakın
+        for months, places in ((0, 6), (24, 6), (150, 6), (60.5, 2)):
+            lms = AnalysisService.get_lms_params('kiz', 'bmi', months)
+            for cutoff, centile in zip(bmi_cutoffs.bmi_cutoffs('kiz', months), bmi_cutoffs.CUTOFF_CENTILES):
+                z, p = AnalysisService.calculate_lms(cutoff, *lms)
+                self.assertAlmostEqual(p, centile, places=places)
+
+    def test_classify_matches_full_analysis(self):
+        for yas_gun in (10, 400, 1500, 4000, 6800):
+            for boy, kilo in ((60, 4), (100, 15), (120, 30), (150, 70), (170, 55)):
+                for cinsiyet in ('erkek', 'kiz'):
+                    full = AnalysisService.analyze_days(yas_gun, boy, kilo, cinsiyet)
+                    self.assertEqual(AnalysisService.classify_bmi(yas_gun, boy, kilo, cinsiyet), full.bmi_kategori)
+        self.assertEqual(AnalysisService.classify_bmi(400, 0, 10, 'erkek'), -1)
+        self.assertEqual(AnalysisService.classify_bmi(400, 80, 10, 'x'), -1)
+
+    @unittest.skipIf(np is None, "numpy gerekli")
+    def test_batch_category_only(self):
+        rng = np.random.default_rng(3)
+        n = 5000
+        ages = rng.uniform(0, 228, n)
+        genders = rng.choice(['erkek', 'kiz'], n)
+        boy = rng.uniform(50, 190, n)
+        kilo = rng.uniform(3, 100, n)
+        boy[0] = -1
+        genders[1] = 'x'
+        fast = BatchAnalysisService.bmi_category_only(ages, genders, boy, kilo)
+        full = BatchAnalysisService.analyze(ages, genders, boy, kilo)
+        self.assertTrue((fast == full["bmi_kategori"]).all())
+        self.assertEqual(fast[:2].tolist(), [-1, -1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import io
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import batch_cli
+from bulk_import import BulkResults, COLUMNS
+
+CSV_INPUT = (
+    "id,dogum_tarihi,kontrol_tarihi,boy,kilo,cinsiyet\n"
+    "a,2020-01-01,2023-01-01,100,15,erkek\n"
+    "b,2020-01-01,2023-01-01,90,12,kiz\n"
+    "c,2023-01-01,2020-01-01,100,15,erkek\n"
+    "d,2020-01-01,2023-01-01,105,20,kiz\n"
+)
+
+
+class FakeTask:
+    def __init__(self):
+        self.reports = []
+
+    def check(self):
+        pass
+
+    def report(self, done, total):
+        self.reports.append((done, total))
+
+
+class TestBulkResults(unittest.TestCase):
+    def setUp(self):
+        self.task = FakeTask()
+        self.results = BulkResults.from_records(batch_cli.read_records(io.StringIO(CSV_INPUT), "csv"), self.task)
+
+    def test_rows_and_errors(self):
+        self.assertEqual(len(self.results), 4)
+        self.assertEqual(self.results.errors, 1)
+        self.assertEqual(self.task.reports[-1], (4, 4))
+
+    def test_jsonl_non_object_rows(self):
+        text = 'null\n{"id": "x", "dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01", "boy": 100, "kilo": 15, "cinsiyet": "e"}\n42\n'
+        results = BulkResults.from_records(batch_cli.read_records(io.StringIO(text), "jsonl"))
+        self.assertEqual((len(results), results.errors), (3, 2))
+        self.assertEqual(results.rows[0]["hata"], batch_cli.NOT_OBJECT)
+        self.assertEqual(results.rows[0]["id"], "")
+        self.assertEqual(results.rows[1]["id"], "x")
+
+    def test_sort_missing_last(self):
+        self.results.sort("bmi_z", reverse=True)
+        page = self.results.page(0, 10)
+        col = [c for c, _, _ in COLUMNS].index("bmi_z")
+        self.assertEqual(page[-1][1], "c")
+        values = [float(row[col]) for row in page[:-1]]
+        self.assertEqual(values, sorted(values, reverse=True))
+        with self.assertRaises(KeyError):
+            self.results.sort("yas_str")
+
+    def test_page_formatting(self):
+        page = self.results.page(1, 2)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(len(page[0]), len(COLUMNS))
+        bmi_p = page[0][[c for c, _, _ in COLUMNS].index("bmi_p")]
+        self.assertRegex(bmi_p, r"^\d+\.\d\d$")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import math
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+    import batch_cli
+    import cohort_stats
+except ImportError:
+    np = None
+
+
+def make_records(n, seed=7):
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(n):
+        yil = int(rng.integers(2006, 2024))
+        records.append({
+            "dogum_tarihi": f"{yil}-{int(rng.integers(1, 13)):02d}-{int(rng.integers(1, 29)):02d}",
+            "kontrol_tarihi": "2025-01-15",
+            "boy": round(float(rng.uniform(60, 180)), 1),
+            "kilo": round(float(rng.uniform(6, 80)), 1),
+            "cinsiyet": "erkek" if i % 2 else "kiz",
+            "okul": "ABC"[i % 3],
+        })
+    return list(enumerate(records, 1))
+
+
+@unittest.skipIf(np is None, "numpy gerekli")
+class TestCohortStats(unittest.TestCase):
+    def same(self, a, b):
+        self.assertEqual(len(a), len(b))
+        for x, y in zip(a, b):
+            for key in x:
+                if isinstance(x[key], float) and math.isnan(x[key]):
+                    self.assertTrue(math.isnan(y[key]))
+                else:
+                    self.assertEqual(x[key], y[key], key)
+
+    def test_merge_is_exact_and_order_independent(self):
+        records = make_records(3000)
+        whole = cohort_stats.aggregate(records, "okul", chunk_size=5000)
+        parts = cohort_stats.aggregate(records[::-1], "okul", chunk_size=337)
+        self.same(whole.summary(), parts.summary())
+        manual = cohort_stats.CohortStats()
+        for start in range(0, len(records), 1000):
+            manual.merge(cohort_stats._stats_from_chunk(records[start:start + 1000], "okul"))
+        self.same(whole.summary(), manual.summary())
+
+    def test_prevalence_and_moments(self):
+        records = make_records(2000)
+        records.append((9999, {"dogum_tarihi": "2020-01-01"}))
+        stats = cohort_stats.aggregate(records)
+        self.assertEqual(stats.rejected, 1)
+        total = stats.summary(by=())[0]
+        self.assertEqual(total["n"], 2000)
+
+        (idx, days, genders, boy, kilo), _ = batch_cli.parse_columns([r for _, r in records])
+        res = BatchAnalysisService.analyze_days(days, genders, boy, kilo)
+        boy_z = res.boy_z[np.isfinite(res.boy_z)]
+        self.assertEqual(total["bodur_n"], int((boy_z < -2).sum()))
+        self.assertEqual(total["obez_n"], int((res.bmi_kategori == 3).sum()))
+        bmi_z = np.clip(res.bmi_z[np.isfinite(res.bmi_z)], -cohort_stats.Z_CLIP, cohort_stats.Z_CLIP)
+        self.assertAlmostEqual(total["bmi_z_ort"], bmi_z.mean(), places=4)
+        self.assertAlmostEqual(total["bmi_z_sd"], bmi_z.std(ddof=1), places=4)
+
+    def test_quantiles_and_rollup(self):
+        rng = np.random.default_rng(2)
+        acc = cohort_stats.ZAccumulator()
+        z = rng.normal(0, 1, 50000)
+        acc.add(z)
+        for q in cohort_stats.QUANTILES:
+            self.assertAlmostEqual(acc.quantile(q), np.quantile(z, q), delta=cohort_stats.BIN_WIDTH)
+        stats = cohort_stats.aggregate(make_records(900), "okul")
+        by_school = stats.summary(by=("grup",))
+        self.assertEqual([r["grup"] for r in by_school], ["A", "B", "C"])
+        self.assertEqual(sum(r["n"] for r in by_school), 900)
+        self.assertEqual(sum(r["n"] for r in stats.summary()), 900)
+
+if __name__ == '__main__':
+    unittest.main()
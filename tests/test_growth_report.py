@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import growth_report
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def visit(child_id, kontrol, boy, kilo, cinsiyet="kiz", dogum="2019-04-10"):
+    return {"id": child_id, "dogum_tarihi": dogum, "kontrol_tarihi": kontrol,
+            "boy": boy, "kilo": kilo, "cinsiyet": cinsiyet}
+
+
+RECORDS = [
+    (1, visit("A1", "2020-04-10", 75, 9)),
+    (2, visit("B2", "2021-01-01", 80, 11, "erkek", "2019-06-01")),
+    (3, visit("A1", "2021-04-10", 86, 12)),
+    (4, visit("A1", "2022-04-10", 95, 14)),
+    (5, visit("A1", "2022-05-01", 96, 14, "erkek")),
+    (6, {"id": "C3", "kontrol_tarihi": "2022-01-01"}),
+    (7, None),
+    (8, [1, 2]),
+]
+
+
+class TestGrowthReport(unittest.TestCase):
+    def test_group_children(self):
+        children, rejects = growth_report.group_children(RECORDS)
+        self.assertEqual([c["id"] for c in children], ["A1", "B2"])
+        self.assertEqual(len(children[0]["visits"]), 3)
+        self.assertEqual([r[0] for r in rejects], [5, 6, 7, 8])
+        self.assertEqual(rejects[-1][1], "Kayıt bir JSON nesnesi olmalı.")
+
+    def test_colliding_ids_get_distinct_files(self):
+        children = [{"id": i, "cinsiyet": "kiz", "dogum": "2019-04-10",
+                     "visits": [(400, "2020-05-14", 75, 9)]} for i in ("a/b", "a_b", "A_B", "a?b")]
+        with tempfile.TemporaryDirectory() as tmp:
+            out = list(growth_report.render_reports(children, tmp))
+            paths = [ps[0] for _, ps in out]
+            self.assertEqual(len({p.lower() for p in paths}), 4)
+            self.assertEqual(os.path.basename(paths[0]), "a_b.html")
+            self.assertEqual(len(os.listdir(tmp)), 4)
+
+    def test_age_range(self):
+        self.assertEqual(growth_report.age_range([12, 23]), (0, 24))
+        self.assertEqual(growth_report.age_range([12, 36]), (0, 60))
+        self.assertEqual(growth_report.age_range([100, 150]), (60, 228))
+        self.assertEqual(growth_report.age_range([10, 300]), (0, 228))
+
+    def test_background_is_cached(self):
+        first = growth_report.background("kiz", "boy", 0, 60)
+        self.assertIs(growth_report.background("kiz", "boy", 0, 60), first)
+        with self.assertRaises(KeyError):
+            growth_report.background("x", "boy", 0, 60)
+
+    def test_curves_without_numpy_match(self):
+        if growth_report.BatchAnalysisService is None:
+            self.skipTest("numpy gerekli")
+        grid, curves = growth_report._curves("erkek", "bmi", 24, 60)
+        engine = growth_report.BatchAnalysisService
+        growth_report.BatchAnalysisService = None
+        try:
+            scalar_grid, scalar_curves = growth_report._curves("erkek", "bmi", 24, 60)
+        finally:
+            growth_report.BatchAnalysisService = engine
+        self.assertEqual(grid, scalar_grid)
+        for curve, scalar in zip(curves, scalar_curves):
+            for a, b in zip(curve, scalar):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_chart_svg(self):
+        svg = growth_report.chart_svg("kiz", "kilo", [(12.0, 9.0, 0.1), (24.0, 60.0, 9.0)])
+        root = ET.fromstring(svg)
+        circles = root.findall(f"{SVG}circle")
+        self.assertEqual(len(circles), 2)
+        self.assertEqual(circles[0].get("class"), "pt")
+        # Grafik dışındaki değer kenara çizilir
+        self.assertEqual(circles[1].get("class"), "pt out")
+        self.assertGreaterEqual(float(circles[1].get("cy")), growth_report.TOP)
+        self.assertEqual(len(root.findall(f"{SVG}polyline")), len(growth_report.CENTILES) + 1)
+
+    def test_child_report(self):
+        children, _ = growth_report.group_children(RECORDS)
+        page = growth_report.child_report(children[0])
+        self.assertIn("<title>A1 - Kız", page)
+        self.assertEqual(page.count("<svg"), 3)
+        self.assertEqual(page.count("<tr>"), 4)
+
+    def test_render_reports(self):
+        children, _ = growth_report.group_children(RECORDS)
+        for fmt, workers in (("html", 1), ("svg", 2)):
+            with tempfile.TemporaryDirectory() as tmp:
+                out = list(growth_report.render_reports(children, tmp, fmt, workers, chunk_size=1))
+                self.assertEqual([child_id for child_id, _ in out], ["A1", "B2"])
+                paths = [p for _, ps in out for p in ps]
+                self.assertEqual(len(paths), 2 if fmt == "html" else 6)
+                for path in paths:
+                    self.assertTrue(os.path.getsize(path) > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
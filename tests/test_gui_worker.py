@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from gui_worker import BackgroundRunner
+from analysis_service import AnalysisService
+
+
+def wait_for(runner, predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        runner.poll()
+        time.sleep(0.01)
+
+
+class TestBackgroundRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = BackgroundRunner()
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_result_delivered_on_polling_thread(self):
+        seen = []
+        task = self.runner.submit(lambda t: AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'kiz'))
+        task.on_done = lambda res: seen.append((threading.current_thread(), res))
+        wait_for(self.runner, lambda: seen)
+        self.assertIs(seen[0][0], threading.current_thread())
+        self.assertEqual(seen[0][1]["yas_str"], "3 Yıl 0 Ay")
+
+    def test_progress_and_cancel(self):
+        started = threading.Event()
+        progress, cancelled, done = [], [], []
+
+        def work(task):
+            for i in range(1000):
+                task.report(i, 1000)
+                started.set()
+                task.check()
+                time.sleep(0.001)
+            return "bitti"
+
+        task = self.runner.submit(work, on_progress=lambda d, t: progress.append(d),
+                                  on_cancel=lambda: cancelled.append(True), on_done=done.append)
+        started.wait(5)
+        wait_for(self.runner, lambda: progress)
+        task.cancel()
+        wait_for(self.runner, lambda: cancelled)
+        self.assertTrue(cancelled)
+        self.assertFalse(done)
+
+    def test_error_reported(self):
+        errors = []
+        self.runner.submit(lambda t: 1 / 0, on_error=errors.append)
+        wait_for(self.runner, lambda: errors)
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+if __name__ == '__main__':
+    unittest.main()
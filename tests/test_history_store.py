@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from history_store import HistoryStore
+from analysis_service import AnalysisService
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.store = HistoryStore()
+        self.store.add_children([("A1", "erkek", "2018-01-01"), ("B2", "kiz", "2018-06-15")])
+        self.a = self.store.child_id("A1")
+        self.b = self.store.child_id("B2")
+        self.store.add_visits([
+            (self.a, "2022-01-01", 105, 17),
+            (self.a, "2021-01-01", 98, 15),
+            (self.b, "2021-06-15", 95, 14),
+            (self.b, "2022-06-15", 102, 24),  # BMI Z +2'yi aşar
+        ])
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_visits_ordered_with_scores(self):
+        visits = self.store.visits(self.a)
+        self.assertEqual([v["kontrol_tarihi"] for v in visits], ["2021-01-01", "2022-01-01"])
+        expected = AnalysisService.perform_analysis(1, 1, 2018, 1, 1, 2021, 98, 15, 'erkek')
+        self.assertAlmostEqual(visits[0]["boy_z"], expected["boy"]["z"])
+
+    def test_growth_velocity(self):
+        vel = self.store.growth_velocity(self.a)
+        self.assertEqual(len(vel), 1)
+        self.assertEqual(vel[0]["gun"], 365)
+        self.assertAlmostEqual(vel[0]["boy_hiz"], 7 * 365.25 / 365)
+        self.assertIsNotNone(vel[0]["bmi_z_delta"])
+
+    def test_bmi_crossings(self):
+        crossed = self.store.bmi_crossings(2.0)
+        self.assertEqual([c["external_id"] for c in crossed], ["B2"])
+        self.assertLess(crossed[0]["onceki_bmi_z"], 2.0)
+
+    def test_failed_batch_is_not_written(self):
+        with self.assertRaises(ValueError):
+            self.store.add_visits([(self.a, "2023-01-01", 110, 19), (self.a, "2017-01-01", 50, 3)])
+        self.assertEqual(len(self.store.visits(self.a)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import batch_cli
+import http_service
+
+RECORD = {"dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01", "boy": 100, "kilo": 15, "cinsiyet": "erkek", "id": "x"}
+
+
+class TestHttpService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ThreadPoolExecutor(max_workers=2)
+        cls.loop = asyncio.new_event_loop()
+        cls.server = http_service.AnalysisServer(cls.executor, max_batch=64, max_wait_ms=20)
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(cls.loop)
+            cls.port = cls.loop.run_until_complete(cls.server.start("127.0.0.1", 0))
+            ready.set()
+            cls.loop.run_forever()
+
+        cls.thread = threading.Thread(target=run, daemon=True)
+        cls.thread.start()
+        ready.wait(5)
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.server.stop(), cls.loop).result(5)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(5)
+        cls.loop.close()
+        cls.executor.shutdown()
+
+    def request(self, method, path, payload=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        body = json.dumps(payload) if payload is not None else None
+        conn.request(method, path, body=body)
+        resp = conn.getresponse()
+        data = json.loads(resp.read())
+        conn.close()
+        return resp.status, data
+
+    def test_single_record_matches_batch_cli(self):
+        status, data = self.request("POST", "/analiz", RECORD)
+        self.assertEqual(status, 200)
+        expected, _ = batch_cli.analyze_record(RECORD)
+        self.assertEqual(data["sonuc"]["yas_str"], expected["yas_str"])
+        self.assertAlmostEqual(data["sonuc"]["bmi_z"], expected["bmi_z"], places=9)
+        self.assertEqual(data["sonuc"]["bmi_yorum"], expected["bmi_yorum"])
+
+    def test_array_with_errors(self):
+        bad = dict(RECORD, kontrol_tarihi="2019-01-01")
+        status, data = self.request("POST", "/analiz", [RECORD, bad, "x"])
+        self.assertEqual(status, 200)
+        self.assertIn("sonuc", data[0])
+        self.assertIn("önce", data[1]["hata"])
+        self.assertIn("hata", data[2])
+
+    def test_concurrent_requests_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: self.request("POST", "/analiz", RECORD), range(32)))
+        self.assertTrue(all(status == 200 for status, _ in results))
+        status, metrics = self.request("GET", "/metrics")
+        self.assertGreater(metrics["batches"]["max_size"], 1)
+        self.assertIn("p99", metrics["latency_ms"])
+
+    def test_bad_requests(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        conn.request("POST", "/analiz", body="{bozuk")
+        self.assertEqual(conn.getresponse().status, 400)
+        conn.close()
+        self.assertEqual(self.request("GET", "/yok")[0], 404)
+        self.assertEqual(self.request("GET", "/analiz")[0], 405)
+
+    def test_stop_waits_for_dispatches(self):
+        async def run():
+            batcher = http_service.MicroBatcher(self.executor, max_batch=64, max_wait_ms=1)
+            batcher.start()
+            pending = asyncio.ensure_future(batcher.submit([RECORD]))
+            while not batcher._dispatches:
+                await asyncio.sleep(0.001)
+            await batcher.stop()
+            self.assertEqual(batcher._dispatches, set())
+            self.assertIn("sonuc", (await pending)[0])
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_invalid_content_length(self):
+        for value in ("abc", "-5"):
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+            conn.putrequest("POST", "/analiz")
+            conn.putheader("Content-Length", value)
+            conn.endheaders()
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 400)
+            self.assertIn("hata", json.loads(resp.read()))
+            conn.close()
+        self.assertEqual(self.request("POST", "/analiz", RECORD)[0], 200)
+
+if __name__ == '__main__':
+    unittest.main()
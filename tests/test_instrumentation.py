@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis_service import AnalysisService
+from instrumentation import Histogram, profile
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        AnalysisService.disable_instrumentation()
+
+    def test_stages_calls_and_errors(self):
+        instr = AnalysisService.enable_instrumentation()
+        AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        AnalysisService.perform_analysis(1, 1, 2023, 1, 1, 2020, 100, 15, 'erkek')
+        AnalysisService.perform_analysis(31, 2, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        snap = instr.snapshot()
+        self.assertEqual(snap["calls"]["perform_analysis"], 3)
+        self.assertEqual(snap["errors"], {"TarihSirasi": 1, "ValueError": 1})
+        for stage in ("tarih", "lms_boy", "z_boy", "lms_kilo", "z_kilo", "lms_bmi", "z_bmi", "siniflama", "toplam"):
+            self.assertEqual(snap["stages"][stage]["count"], 1, stage)
+
+    def test_exports(self):
+        instr = AnalysisService.enable_instrumentation()
+        AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'kiz')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            instr.write_snapshot(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("toplam", json.load(f)["stages"])
+        text = instr.to_text()
+        self.assertIn('analysis_stage_seconds_count{stage="toplam"} 1', text)
+        self.assertIn('analysis_calls_total{name="perform_analysis"} 1', text)
+
+    def test_histogram_quantile(self):
+        h = Histogram()
+        for _ in range(99):
+            h.observe(3e-6)
+        h.observe(0.5)
+        self.assertEqual(h.quantile(0.5), 4e-6)
+        self.assertGreaterEqual(h.quantile(1.0), 0.5)
+
+    def test_profile_hook(self):
+        with profile() as prof:
+            AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'kiz')
+        self.assertTrue(prof.getstats())
+
+if __name__ == '__main__':
+    unittest.main()
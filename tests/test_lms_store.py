@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import lms_store
+
+class TestLmsStore(unittest.TestCase):
+    def test_round_trip(self):
+        tables = {
+            ('who', 'kiz', 'boy'): {0: (1.0, 49.1, 0.0379), 1: (1.0, 53.7, 0.0364)},
+            ('ext', 'kiz', 'kilo'): {121: (-1.2, 32.4, 0.18), 123: (-1.1, 33.0, 0.182)},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lms.bin')
+            lms_store.write_store(path, tables)
+            store = lms_store.LmsStore(path)
+            keys, l, m, s, uniform = store.load('who', 'kiz', 'boy')
+            self.assertTrue(uniform)
+            self.assertEqual(list(m), [49.1, 53.7])
+            keys, l, m, s, uniform = store.load('ext', 'kiz', 'kilo')
+            self.assertFalse(uniform)
+            self.assertEqual(list(keys), [121, 123])
+            self.assertNotIn(('who', 'erkek', 'boy'), store)
+            with self.assertRaises(KeyError):
+                store.load('who', 'erkek', 'boy')
+            del keys, l, m, s
+            store._mm.close()
+
+    def test_shipped_file_matches_modules(self):
+        # lms_data.bin, growth_data değiştiğinde yeniden üretilmelidir
+        store = lms_store.LmsStore()
+        tables = lms_store.tables_from_modules()
+        self.assertEqual(len(store.index), len(tables))
+        for (source, gender, metric), data in tables.items():
+            keys, l, m, s, uniform = store.load(source, gender, metric)
+            self.assertEqual(list(keys), sorted(data))
+            self.assertEqual(list(zip(l, m, s)), [data[k] for k in sorted(data)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import growth_data
+import growth_data_extended
+import tempfile
+import lms_store
+import lms_tables
+from analysis_service import AnalysisService
+
+class TestLmsTables(unittest.TestCase):
+    def test_exact_month_matches_data(self):
+        for month in (0, 1, 60, 228):
+            l, m, s = AnalysisService.get_lms_params('kiz', 'boy', month)
+            expected = growth_data.LMS_DATA['kiz']['boy'][month]
+            for a, b in zip((l, m, s), expected):
+                self.assertAlmostEqual(a, b, places=12)
+
+    def test_interpolation_midpoint(self):
+        v1 = growth_data.LMS_DATA['erkek']['bmi'][10]
+        v2 = growth_data.LMS_DATA['erkek']['bmi'][11]
+        l, m, s = AnalysisService.get_lms_params('erkek', 'bmi', 10.5)
+        self.assertAlmostEqual(m, (v1[1] + v2[1]) / 2)
+
+    def test_extended_weight_table(self):
+        table = lms_tables.get_table('erkek', 'kilo', 150)
+        self.assertEqual((table.first, table.last), (0, 228))
+        self.assertTrue(table.uniform)
+        l, m, s = AnalysisService.get_lms_params('erkek', 'kilo', 150)
+        self.assertAlmostEqual(m, growth_data_extended.LMS_DATA_EXTENDED['erkek']['kilo'][150][1])
+
+    def test_weight_interpolated_across_sources(self):
+        # 120 (WHO) ile 121 (genişletilmiş) arası artık 121'e sabitlenmez
+        m120 = growth_data.LMS_DATA['kiz']['kilo'][120][1]
+        m121 = growth_data_extended.LMS_DATA_EXTENDED['kiz']['kilo'][121][1]
+        self.assertAlmostEqual(AnalysisService.get_lms_params('kiz', 'kilo', 120)[1], m120, places=12)
+        self.assertAlmostEqual(AnalysisService.get_lms_params('kiz', 'kilo', 120.5)[1], (m120 + m121) / 2)
+        self.assertAlmostEqual(AnalysisService.get_lms_params('kiz', 'kilo', 121)[1], m121, places=12)
+
+    def test_cubic_passes_through_keys(self):
+        AnalysisService.set_interpolation('cubic')
+        try:
+            for month in (0, 1, 59, 120, 121, 228):
+                expected = AnalysisService.get_lms_params('erkek', 'kilo', month)
+                lms_tables.set_interpolation('linear')
+                linear = AnalysisService.get_lms_params('erkek', 'kilo', month)
+                lms_tables.set_interpolation('cubic')
+                for a, b in zip(expected, linear):
+                    self.assertAlmostEqual(a, b, places=9)
+            # Ara değerler doğrusal moddan yalnızca çok az farklıdır
+            cubic = AnalysisService.get_lms_params('erkek', 'boy', 30.5)
+        finally:
+            AnalysisService.set_interpolation('linear')
+        linear = AnalysisService.get_lms_params('erkek', 'boy', 30.5)
+        self.assertNotEqual(cubic, linear)
+        self.assertAlmostEqual(cubic[1], linear[1], places=1)
+
+    def test_cubic_is_monotone(self):
+        keys = [0, 1, 2, 3, 4, 5]
+        values = [0.0, 0.0, 1.0, 1.0, 5.0, 5.1]
+        table = lms_tables.LmsTable(keys, values, values, values)
+        previous = None
+        for i in range(0, 501):
+            v = table.lookup_cubic(i / 100)[1]
+            if previous is not None:
+                self.assertGreaterEqual(v, previous - 1e-12)
+            self.assertTrue(0.0 <= v <= 5.1)
+            previous = v
+        # Düz bölümde taşma yok
+        self.assertEqual(table.lookup_cubic(0.5)[1], 0.0)
+
+    def test_unknown_interpolation_mode(self):
+        with self.assertRaises(ValueError):
+            AnalysisService.set_interpolation('quadratic')
+
+    def test_clamp_and_unknown(self):
+        self.assertEqual(AnalysisService.get_lms_params('kiz', 'boy', -3),
+                         AnalysisService.get_lms_params('kiz', 'boy', 0))
+        self.assertIsNone(AnalysisService.get_lms_params('x', 'boy', 3))
+
+    def test_non_uniform_table_uses_bisect(self):
+        table = lms_tables.LmsTable.from_dict({0: (1, 10, 0.1), 2: (1, 20, 0.1), 5: (1, 50, 0.1)})
+        self.assertFalse(table.uniform)
+        self.assertAlmostEqual(table.lookup(1)[1], 15)
+        self.assertAlmostEqual(table.lookup(3.5)[1], 35)
+        self.assertAlmostEqual(table.lookup(9)[1], 50)
+    def test_preload_opens_all_tables(self):
+        lms_tables.preload()
+        self.assertEqual(set(lms_tables._stitched), {'erkek', 'kiz'})
+        for gender in ('erkek', 'kiz'):
+            for metric in ('boy', 'bmi'):
+                self.assertIn((lms_store.SOURCE_WHO, gender, metric), lms_tables._tables)
+
+    def test_daily_tables_direct_index(self):
+        days = {d: (1.0, 50.0 + d, 0.04) for d in range(0, 200)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'daily.bin')
+            lms_store.write_store(path, {('day', 'kiz', 'boy'): days})
+            AnalysisService.enable_daily_tables(path)
+            try:
+                self.assertEqual(lms_tables.get_daily_params('kiz', 'boy', 120), (1.0, 170.0, 0.04))
+                self.assertIsNone(lms_tables.get_daily_params('kiz', 'boy', 500))
+                self.assertIsNone(lms_tables.get_daily_params('erkek', 'boy', 10))
+                # 1.1.2020 -> 30.4.2020 = 120 gün; M = 170 -> Z = 0
+                res = AnalysisService.perform_analysis(1, 1, 2020, 30, 4, 2020, 170, 6, 'kiz')
+                self.assertAlmostEqual(res["boy"]["z"], 0)
+                # Günlük tablo olmayan metrikler aylık tabloya döner
+                self.assertIn("z", res["kilo"])
+            finally:
+                AnalysisService.disable_daily_tables()
+                lms_tables._daily_tables.clear()
+
+if __name__ == '__main__':
+    unittest.main()
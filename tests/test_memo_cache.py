@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from memo_cache import LRUCache
+from analysis_service import AnalysisService
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_order_and_stats(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'a' en son kullanılan
+        cache.put('c', 3)                    # 'b' çıkarılır
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["size"]), (2, 1, 1, 2))
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        AnalysisService.enable_cache(maxsize=100, lms_maxsize=100)
+
+    def tearDown(self):
+        AnalysisService.disable_cache()
+
+    def test_cached_results_match_uncached(self):
+        first = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        first["boy"]["z"] = 99  # çağıranın değişikliği önbelleği bozmamalı
+        second = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        AnalysisService.disable_cache()
+        uncached = AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        self.assertEqual(second, uncached)
+
+    def test_stats_and_shared_lms(self):
+        AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 100, 15, 'erkek')
+        # Aynı yaş, farklı ölçüm: sonuç ıskası, LMS isabeti
+        AnalysisService.perform_analysis(1, 1, 2020, 1, 1, 2023, 101, 16, 'erkek')
+        stats = AnalysisService.cache_stats()
+        self.assertEqual((stats["results"]["hits"], stats["results"]["misses"]), (1, 2))
+        self.assertEqual((stats["lms"]["hits"], stats["lms"]["misses"]), (3, 3))
+
+if __name__ == '__main__':
+    unittest.main()
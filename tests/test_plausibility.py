@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import batch_cli
+import plausibility as pl
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+except ImportError:
+    np = None
+
+NAN = float("nan")
+
+
+class TestPlausibility(unittest.TestCase):
+    def test_input_flags(self):
+        self.assertEqual(pl.input_flags(110, 18), 0)
+        self.assertEqual(pl.input_flags(18, 110), pl.FLAG_HEIGHT_RANGE | pl.FLAG_SWAPPED)
+        self.assertEqual(pl.input_flags(1.1, 18), pl.FLAG_HEIGHT_RANGE | pl.FLAG_HEIGHT_METRES)
+        self.assertEqual(pl.input_flags(1100, 18), pl.FLAG_HEIGHT_RANGE | pl.FLAG_HEIGHT_MM)
+        self.assertEqual(pl.input_flags(110, 1500), pl.FLAG_WEIGHT_RANGE | pl.FLAG_WEIGHT_GRAMS)
+        self.assertEqual(pl.input_flags(110, 900000), pl.FLAG_WEIGHT_RANGE)
+        self.assertEqual(pl.input_flags(NAN, NAN), 0)
+
+    def test_zscore_flags(self):
+        self.assertEqual(pl.zscore_flags(0, 0, 0, 0), 0)
+        self.assertEqual(pl.zscore_flags(-6.5, 0, 0), pl.FLAG_HAZ)
+        self.assertEqual(pl.zscore_flags(0, 5.5, 0), pl.FLAG_WAZ)
+        self.assertEqual(pl.zscore_flags(0, -5.5, 0), 0)
+        self.assertEqual(pl.zscore_flags(0, -6.5, 5.1, -5.1), pl.FLAG_WAZ | pl.FLAG_BMIZ | pl.FLAG_WHZ)
+        self.assertEqual(pl.zscore_flags(NAN, NAN, NAN, NAN), 0)
+
+    def test_describe(self):
+        self.assertEqual(pl.describe(0), [])
+        self.assertEqual(pl.describe(pl.FLAG_SWAPPED | pl.FLAG_HAZ),
+                         [pl.FLAG_LABELS[pl.FLAG_SWAPPED], pl.FLAG_LABELS[pl.FLAG_HAZ]])
+
+    def test_cli_row(self):
+        record = {"dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01",
+                  "boy": "14", "kilo": "95", "cinsiyet": "e"}
+        row, error = batch_cli.analyze_record(record)
+        self.assertIsNone(error)
+        self.assertTrue(row["bayrak"] & pl.FLAG_SWAPPED)
+        self.assertTrue(row["bayrak"] & pl.FLAG_HAZ)
+        record.update(boy="95", kilo="14")
+        self.assertEqual(batch_cli.analyze_record(record)[0]["bayrak"], 0)
+
+
+@unittest.skipIf(np is None, "numpy gerekli")
+class TestBatchPlausibility(unittest.TestCase):
+    def test_vector_matches_scalar(self):
+        rng = np.random.default_rng(3)
+        boy = np.concatenate([rng.uniform(0.2, 3000, 500), [NAN, 35, 230, 34.9]])
+        kilo = np.concatenate([rng.uniform(0.1, 300000, 500), [NAN, 0.5, 250, 250.1]])
+        flags = BatchAnalysisService.input_flags(boy, kilo)
+        self.assertEqual(flags.dtype, np.uint16)
+        for i in range(len(boy)):
+            self.assertEqual(int(flags[i]), pl.input_flags(float(boy[i]), float(kilo[i])))
+
+    def test_analyze_sets_flags(self):
+        ages = [36, 36, 36, 36, 36]
+        boy = [95, 60, 95, 1.0, -5]
+        kilo = [14, 14, 40, 14, 14]
+        res = BatchAnalysisService.analyze(ages, ['erkek'] * 5, boy, kilo)
+        self.assertEqual(res.bayrak[0], 0)
+        self.assertTrue(res.bayrak[1] & pl.FLAG_HAZ)
+        self.assertTrue(res.bayrak[2] & pl.FLAG_WAZ)
+        self.assertTrue(res.bayrak[3] & pl.FLAG_HEIGHT_METRES)
+        # Geçersiz satırlar da işaretlenir; Z değerleri yine NaN kalır
+        self.assertFalse(res.gecerli[4])
+        self.assertTrue(res.bayrak[4] & pl.FLAG_HEIGHT_RANGE)
+        for i in range(4):
+            record = {"dogum_tarihi": "2020-01-01", "kontrol_tarihi": "2023-01-01",
+                      "boy": boy[i], "kilo": kilo[i], "cinsiyet": "erkek"}
+            # 2020-01-01 -> 2023-01-01 = 1096 gün = 36.008 ay; kurallar aynı sonucu verir
+            self.assertEqual(batch_cli.analyze_record(record)[0]["bayrak"], int(res.bayrak[i]))
+
+    def test_adult_age_cli_matches_vector(self):
+        # 229 aydan büyükte kilo Z'si yok; girdi bayrakları yine ham değerlerden
+        boy = [170, 60]
+        kilo = [1500, 170]
+        res = BatchAnalysisService.analyze_dates(["2003-01-01"] * 2, ["2023-01-01"] * 2, ['erkek'] * 2, boy, kilo)
+        self.assertTrue(res.bayrak[0] & pl.FLAG_WEIGHT_GRAMS)
+        for i in range(2):
+            record = {"dogum_tarihi": "2003-01-01", "kontrol_tarihi": "2023-01-01",
+                      "boy": boy[i], "kilo": kilo[i], "cinsiyet": "erkek"}
+            self.assertEqual(batch_cli.analyze_record(record)[0]["bayrak"], int(res.bayrak[i]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import batch_cli
+import result_cache
+from result_cache import ResultCache, row_key
+
+
+def records(boy_a=110):
+    return [
+        (1, {"id": "a", "dogum_tarihi": "2018-01-01", "kontrol_tarihi": "2023-01-01",
+             "boy": boy_a, "kilo": 19, "cinsiyet": "e"}),
+        # Aynı normalleştirilmiş girdi, farklı id ve tarih yazımı
+        (2, {"id": "b", "dogum_tarihi": "01.01.2018", "kontrol_tarihi": "01.01.2023",
+             "boy": "110,0", "kilo": "19", "cinsiyet": "erkek"}),
+        (3, {"id": "c", "dogum_tarihi": "2018-01-01", "kontrol_tarihi": "2023-01-01",
+             "boy": "-4", "kilo": 19, "cinsiyet": "k"}),
+        (4, {"id": "d", "dogum_tarihi": "2018-02-30", "kontrol_tarihi": "2023-01-01",
+             "boy": 110, "kilo": 19, "cinsiyet": "k"}),
+    ]
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_row_key_normalizes(self):
+        self.assertEqual(row_key(100, 110, 19, "kiz"), row_key(100.0, "110.0", 19.0, "kiz"))
+        self.assertNotEqual(row_key(100, 110, 19, "kiz"), row_key(101, 110, 19, "kiz"))
+
+    def test_roundtrip_and_version_invalidation(self):
+        cache = ResultCache(self.path, version="v1")
+        cache.put_many([(b"k1", (1.5, "x", 3)), (b"k2", "hata")])
+        self.assertEqual(cache.get_many([b"k1", b"k2", b"k3"]), {b"k1": (1.5, "x", 3), b"k2": "hata"})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.close()
+
+        cache = ResultCache(self.path, version="v1")
+        self.assertFalse(cache.invalidated)
+        self.assertEqual(len(cache), 2)
+        cache.close()
+
+        cache = ResultCache(self.path, version="v2")
+        self.assertTrue(cache.invalidated)
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_reference_version_tracks_settings(self):
+        import lms_tables
+        base = result_cache.reference_version()
+        self.assertEqual(base, result_cache.reference_version())
+        self.assertNotEqual(base, result_cache.reference_version("alanlar"))
+        lms_tables.set_interpolation("cubic")
+        try:
+            self.assertNotEqual(base, result_cache.reference_version())
+        finally:
+            lms_tables.set_interpolation("linear")
+        import lms_store
+        versions = []
+        for m in (50.0, 51.0):
+            path = os.path.join(self.tmp.name, f"daily{m}.bin")
+            lms_store.write_store(path, {("day", "kiz", "boy"): {d: (1.0, m, 0.04) for d in range(10)}})
+            lms_tables.enable_daily(path)
+            try:
+                versions.append(result_cache.reference_version())
+            finally:
+                lms_tables.disable_daily()
+        # Özel yoldaki günlük tablo dosyasının içeriği de sürüme girer
+        self.assertNotIn(base, versions)
+        self.assertNotEqual(versions[0], versions[1])
+
+        wfh_versions = []
+        for m in (10.0, 11.0):
+            path = os.path.join(self.tmp.name, f"wfh{m}.bin")
+            lms_store.write_store(path, {(lms_store.SOURCE_WFH, "kiz", "kilo"): {870: (1.0, m, 0.08)}})
+            lms_tables.set_wfh_path(path)
+            try:
+                wfh_versions.append(result_cache.reference_version())
+            finally:
+                lms_tables.set_wfh_path(None)
+        # set_wfh_path ile seçilen boya göre kilo dosyası sürüme girer
+        self.assertNotEqual(wfh_versions[0], wfh_versions[1])
+        self.assertEqual(base, result_cache.reference_version())
+
+    def test_eviction_keeps_recently_used(self):
+        cache = ResultCache(self.path, max_entries=2, version="v")
+        cache.put_many([(b"old", 1), (b"hot", 2)])
+        cache.close()  # 2 kayıt, sınırın içinde
+        for _ in range(result_cache.REFRESH_GENERATIONS):
+            cache = ResultCache(self.path, max_entries=2, version="v")
+            cache.close()
+        cache = ResultCache(self.path, max_entries=2, version="v")
+        self.assertEqual(cache.get_many([b"hot"]), {b"hot": 2})  # eski kuşak: yenilenir
+        cache.put_many([(b"new", 3)])
+        self.assertEqual(cache.evict(), 1)
+        self.assertEqual(set(cache.get_many([b"old", b"hot", b"new"])), {b"hot", b"new"})
+        cache.close()
+
+    def test_cli_cached_output_matches(self):
+        expected = list(batch_cli.analyze_records(records()))
+        cache = ResultCache(self.path, version="v")
+        first = list(batch_cli.analyze_records_cached(records(), cache))
+        # a ve b aynı girdi: yalnızca bir kez hesaplanır
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        second = list(batch_cli.analyze_records_cached(records(), cache))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        changed = list(batch_cli.analyze_records_cached(records(boy_a=111), cache))
+        self.assertEqual(cache.misses, 3)
+        cache.close()
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(list(first[0][2]), list(batch_cli.OUTPUT_FIELDS))
+        self.assertEqual(changed[1], expected[1])
+        self.assertNotEqual(changed[0][2]["boy_z"], expected[0][2]["boy_z"])
+
+    def test_parallel_misses_share_one_pool(self):
+        created = []
+
+        class CountingPool(batch_cli.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                created.append(1)
+                super().__init__(*args, **kwargs)
+
+        rows = [(i, {"id": str(i), "dogum_tarihi": "2018-01-01", "kontrol_tarihi": "2023-01-01",
+                     "boy": 100 + i / 10, "kilo": 19, "cinsiyet": "k"}) for i in range(40)]
+        rows.append((40, None))
+        expected = list(batch_cli.analyze_records(rows))
+        original = batch_cli.ProcessPoolExecutor
+        batch_cli.ProcessPoolExecutor = CountingPool
+        try:
+            cache = ResultCache(self.path, version="v")
+            out = list(batch_cli.analyze_records_cached(rows, cache, workers=2, chunk_size=3))
+            cache.close()
+        finally:
+            batch_cli.ProcessPoolExecutor = original
+        self.assertEqual(len(created), 1)
+        self.assertEqual(out, expected)
+        self.assertEqual(out[-1][3], batch_cli.NOT_OBJECT)
+
+    def test_cli_main(self):
+        src = os.path.join(self.tmp.name, "in.csv")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write("id,dogum_tarihi,kontrol_tarihi,boy,kilo,cinsiyet\n1,2018-01-01,2023-01-01,110,19,e\n")
+        outputs = []
+        for i in range(2):
+            out = os.path.join(self.tmp.name, f"out{i}.csv")
+            batch_cli.main([src, "-o", out, "--rejects", "", "--cache", self.path])
+            with open(out, encoding="utf-8") as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import growth_data
+import lms_store
+import setup_lms_data
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def write_source_dir(path):
+    # growth_data içeriğinden WHO biçiminde (Age;L;M;S) CSV dosyaları üret
+    for fname, (gender, metric) in setup_lms_data.files.items():
+        data = growth_data.LMS_DATA[gender][metric]
+        lines = ["Month;L;M;S"] + [f"{k};{l!r};{m!r};{s!r}" for k, (l, m, s) in sorted(data.items())]
+        with open(os.path.join(path, fname), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class TestSetupLmsData(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "src")
+        os.makedirs(self.src)
+        write_source_dir(self.src)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_from_local_dir(self):
+        out_py = os.path.join(self.tmp.name, "growth_data.py")
+        out_bin = os.path.join(self.tmp.name, "lms.bin")
+        rc = setup_lms_data.main(["--source", self.src, "--no-cache",
+                                  "--output-py", out_py, "--output-bin", out_bin])
+        self.assertEqual(rc, 0)
+        with open(out_py, encoding="utf-8") as f, open(os.path.join(ROOT, "growth_data.py"), encoding="utf-8") as g:
+            self.assertEqual(f.read(), g.read())
+        store = lms_store.LmsStore(out_bin)
+        self.assertIn(("ext", "kiz", "kilo"), store)
+        del store
+
+    def test_cache_allows_offline_rebuild(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        url = "file://" + self.src.replace(os.sep, "/")
+        cache = setup_lms_data.SourceCache(cache_dir)
+        results, errors = setup_lms_data.fetch_all(url, cache)
+        self.assertFalse(errors)
+        self.assertEqual({origin for raw, origin in results.values()}, {"download"})
+
+        cache = setup_lms_data.SourceCache(cache_dir)
+        results, errors = setup_lms_data.fetch_all("http://invalid.invalid/", cache, offline=True)
+        self.assertFalse(errors)
+        self.assertEqual({origin for raw, origin in results.values()}, {"cache"})
+
+        # Bozulmuş önbellek dosyası sağlama toplamıyla yakalanır
+        with open(os.path.join(cache_dir, "WHO.Male.BMI.csv"), "ab") as f:
+            f.write(b"x")
+        results, errors = setup_lms_data.fetch_all("http://invalid.invalid/", cache, offline=True)
+        self.assertEqual(list(errors), ["WHO.Male.BMI.csv"])
+
+    def test_failed_fetch_writes_nothing(self):
+        os.remove(os.path.join(self.src, "WHO.Female.BMI.csv"))
+        out_py = os.path.join(self.tmp.name, "growth_data.py")
+        rc = setup_lms_data.main(["--source", self.src, "--no-cache", "--output-py", out_py, "--output-bin", ""])
+        self.assertEqual(rc, 1)
+        self.assertFalse(os.path.exists(out_py))
+    def test_daily_tables(self):
+        # Günlük noktalar (ay cinsinden yaş) ay yuvarlamasıyla kaybolmamalı
+        text = "Age;L;M;S\n" + "\n".join(
+            f"{day / setup_lms_data.DAYS_PER_MONTH!r};1;{50 + day * 0.1!r};0.04" for day in range(0, 100, 2))
+        table = setup_lms_data.process_text_daily(text, "boy")
+        self.assertEqual(sorted(table), list(range(99)))
+        self.assertAlmostEqual(table[10][1], 51.0)
+        self.assertAlmostEqual(table[11][1], 51.1)
+
+        out_daily = os.path.join(self.tmp.name, "daily.bin")
+        rc = setup_lms_data.main(["--source", self.src, "--no-cache", "--output-py", "", "--output-bin", "",
+                                  "--daily", "--output-daily", out_daily])
+        self.assertEqual(rc, 0)
+        store = lms_store.LmsStore(out_daily)
+        keys, l, m, s, uniform = store.load("day", "kiz", "boy")
+        self.assertTrue(uniform)
+        self.assertEqual(keys[0], 0)
+        self.assertLessEqual(keys[-1], setup_lms_data.DAILY_MAX_DAYS)
+        del keys, l, m, s, store
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from analysis_service import AnalysisService
+import growth_data
+import lms_store
+import lms_tables
+import setup_lms_data
+
+try:
+    import numpy as np
+    from batch_engine import BatchAnalysisService
+except ImportError:
+    np = None
+
+
+def write_age_sources(path):
+    # setup_lms_data'nın yaş tabloları için WHO biçiminde (Month;L;M;S) CSV
+    for fname, (gender, metric) in setup_lms_data.files.items():
+        data = growth_data.LMS_DATA[gender][metric]
+        lines = ["Month;L;M;S"] + [f"{k};{l!r};{m!r};{s!r}" for k, (l, m, s) in sorted(data.items())]
+        with open(os.path.join(path, fname), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def write_wfh_sources(path):
+    # WHO genişletilmiş tablo biçiminde (sekmeli) sentetik veri: M boyla artar
+    ranges = {"wfl": (450, 1100), "wfh": (650, 1200)}
+    for fname, (source, gender) in setup_lms_data.wfh_files.items():
+        first, last = ranges[source]
+        offset = 0.2 if gender == "kiz" else 0.0
+        lines = ["Length\tL\tM\tS\tSD3neg"]
+        for mm in range(first, last + 1):
+            m = 2.0 + (mm - first) * 0.03 + offset
+            lines.append(f"{mm / 10:.1f}\t-0.35\t{m:.4f}\t0.08\t0")
+        with open(os.path.join(path, fname), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class TestWeightForHeight(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        src = os.path.join(cls.tmp.name, "src")
+        os.makedirs(src)
+        write_wfh_sources(src)
+        cls.path = os.path.join(cls.tmp.name, "wfh.bin")
+        raw = {fname: open(os.path.join(src, fname), "rb").read() for fname in setup_lms_data.wfh_files}
+        setup_lms_data.write_wfh_binary(cls.path, raw)
+        AnalysisService.set_wfh_tables(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        AnalysisService.set_wfh_tables(None)
+        cls.tmp.cleanup()
+
+    def test_table_is_indexed_by_millimetre(self):
+        table = lms_tables.get_wfh_table(lms_store.SOURCE_WFL, "erkek")
+        self.assertTrue(table.uniform)
+        self.assertEqual((table.first, table.last), (450, 1100))
+        l, m, s = lms_tables.get_wfh_params("erkek", 12, 60.0)
+        self.assertAlmostEqual(m, 2.0 + 150 * 0.03, places=6)
+        self.assertIsNone(lms_tables.get_wfh_params("erkek", 12, 40.0))
+        self.assertIsNone(lms_tables.get_wfh_params("erkek", 70, 100.0))
+        # 24 ay ve üstü ayakta ölçülen boy tablosu
+        self.assertAlmostEqual(lms_tables.get_wfh_params("kiz", 30, 65.0)[1], 2.2, places=6)
+
+    def test_wfh_available(self):
+        self.assertTrue(lms_tables.wfh_available("kiz", 30))
+        self.assertFalse(lms_tables.wfh_available("kiz", 61))
+        self.assertFalse(lms_tables.wfh_available("x", 30))
+        lms_tables.set_wfh_path(os.path.join(self.tmp.name, "yok.bin"))
+        try:
+            self.assertFalse(lms_tables.wfh_available("kiz", 30))
+        finally:
+            AnalysisService.set_wfh_tables(self.path)
+
+    def test_single_analysis(self):
+        res = AnalysisService.analyze_days(365, 60.0, 6.5, "erkek")
+        self.assertAlmostEqual(res.kilo_boy.z, 0, places=6)
+        self.assertAlmostEqual(res.to_dict()["kilo_boy"]["p"], 50, places=4)
+        self.assertIsNone(AnalysisService.analyze_days(365 * 7, 120.0, 22, "erkek").kilo_boy)
+
+    @unittest.skipIf(np is None, "numpy gerekli")
+    def test_batch_matches_single(self):
+        days = [10, 365, 700, 800, 1500, 1900, 365]
+        boy = [50.0, 75.3, 80.05, 90.0, 110.2, 115.0, 30.0]
+        kilo = [3.3, 9.5, 10.8, 12.0, 18.0, 20.0, 2.0]
+        genders = ["kiz", "erkek", "kiz", "erkek", "kiz", "erkek", "kiz"]
+        res = BatchAnalysisService.analyze_days(days, genders, boy, kilo)
+        for i in range(len(days)):
+            single = AnalysisService.analyze_days(days[i], boy[i], kilo[i], genders[i]).kilo_boy
+            if single is None:
+                self.assertTrue(np.isnan(res.kilo_boy_z[i]))
+            else:
+                self.assertAlmostEqual(res.kilo_boy_z[i], single.z, places=9)
+
+    def test_build_writes_wfh_file(self):
+        src = os.path.join(self.tmp.name, "src")
+        out = os.path.join(self.tmp.name, "built.bin")
+        setup_src = os.path.join(self.tmp.name, "who")
+        os.makedirs(setup_src, exist_ok=True)
+        write_age_sources(setup_src)
+        rc = setup_lms_data.main(["--source", setup_src, "--no-cache", "--output-py", "", "--output-bin", "",
+                                  "--wfh", "--wfh-source", src, "--output-wfh", out])
+        self.assertEqual(rc, 0)
+        store = lms_store.LmsStore(out)
+        self.assertIn((lms_store.SOURCE_WFH, "kiz", "kilo"), store)
+        del store
+
+if __name__ == '__main__':
+    unittest.main()